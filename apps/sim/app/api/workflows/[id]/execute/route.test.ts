@@ -603,4 +603,126 @@ describe('Workflow Execution API Route', () => {
       })
     )
   })
+
+  /**
+   * Test that POST streams block output as server-sent events when asked to
+   */
+  it('should stream block output as server-sent events', async () => {
+    const executorConstructorMock = vi.fn().mockImplementation((options: any) => ({
+      execute: vi.fn().mockImplementation(async () => {
+        const encoder = new TextEncoder()
+        await options.contextExtensions.onStream({
+          stream: new ReadableStream({
+            start(controller) {
+              controller.enqueue(encoder.encode('Hel'))
+              controller.enqueue(encoder.encode('lo'))
+              controller.close()
+            },
+          }),
+          execution: { blockId: 'agent-id' },
+        })
+        return {
+          success: true,
+          output: { content: 'Hello' },
+          logs: [{ blockId: 'agent-id' }],
+          metadata: { duration: 100 },
+        }
+      }),
+    }))
+
+    vi.doMock('@/executor', () => ({
+      Executor: executorConstructorMock,
+    }))
+
+    const req = createMockRequest(
+      'POST',
+      { message: 'hi' },
+      { Accept: 'text/event-stream', 'Content-Type': 'application/json' }
+    )
+
+    const params = Promise.resolve({ id: 'workflow-id' })
+
+    const { POST } = await import('@/app/api/workflows/[id]/execute/route')
+
+    const response = await POST(req, { params })
+
+    expect(response.status).toBe(200)
+    expect(response.headers.get('Content-Type')).toBe('text/event-stream')
+
+    const events = (await response.text())
+      .split('\n\n')
+      .filter(Boolean)
+      .map((event) => JSON.parse(event.replace(/^data: /, '')))
+
+    expect(events).toEqual([
+      { blockId: 'agent-id', chunk: 'Hel' },
+      { blockId: 'agent-id', chunk: 'lo' },
+      { blockId: 'agent-id', event: 'end' },
+      {
+        event: 'final',
+        data: { success: true, output: { content: 'Hello' }, metadata: { duration: 100 } },
+      },
+    ])
+
+    expect(executorConstructorMock.mock.calls[0][0].contextExtensions).toEqual(
+      expect.objectContaining({
+        stream: true,
+        selectedOutputIds: expect.any(Array),
+        onStream: expect.any(Function),
+      })
+    )
+  })
+
+  /**
+   * Test that a workflow with a Response block answers with that block's response, not SSE
+   */
+  it('should answer streaming requests with the Response block of such workflows', async () => {
+    const loadDeployedWorkflowStateMock = vi.fn().mockResolvedValue({
+      blocks: {
+        'starter-id': { id: 'starter-id', type: 'starter', subBlocks: {} },
+        'response-id': { id: 'response-id', type: 'response', subBlocks: {} },
+      },
+      edges: [{ id: 'edge-1', source: 'starter-id', target: 'response-id' }],
+      loops: {},
+      parallels: {},
+      isFromNormalizedTables: false,
+    })
+    vi.doMock('@/lib/workflows/db-helpers', () => ({
+      loadDeployedWorkflowState: loadDeployedWorkflowStateMock,
+    }))
+
+    const executorConstructorMock = vi.fn().mockImplementation(() => ({
+      execute: executeMock,
+    }))
+    vi.doMock('@/executor', () => ({
+      Executor: executorConstructorMock,
+    }))
+
+    const blockResponse = new Response(JSON.stringify({ custom: true }), {
+      status: 201,
+      headers: { 'Content-Type': 'application/json' },
+    })
+    vi.doMock('@/lib/workflows/utils', () => ({
+      updateWorkflowRunCounts: vi.fn().mockResolvedValue(undefined),
+      workflowHasResponseBlock: vi.fn().mockReturnValue(true),
+      createHttpResponseFromBlock: vi.fn().mockReturnValue(blockResponse),
+    }))
+
+    const req = createMockRequest(
+      'POST',
+      { message: 'hi' },
+      { Accept: 'text/event-stream', 'Content-Type': 'application/json' }
+    )
+
+    const params = Promise.resolve({ id: 'workflow-id' })
+
+    const { POST } = await import('@/app/api/workflows/[id]/execute/route')
+
+    const response = await POST(req, { params })
+
+    expect(response).toBe(blockResponse)
+    expect(response.status).toBe(201)
+    expect(await response.json()).toEqual({ custom: true })
+    expect(executorConstructorMock.mock.calls[0][0].contextExtensions.stream).toBeUndefined()
+  })
 })
@@ -55,6 +55,19 @@ function createFilteredResult(result: any) {
   }
 }
 
+// Block IDs whose output is streamed to clients that ask for server-sent events: the blocks at
+// the end of the workflow, i.e. those without outgoing connections
+function getTerminalBlockIds(blocks: Record<string, any>, edges: any[]): string[] {
+  const sources = new Set(edges.map((edge: any) => edge.source))
+  return Object.keys(blocks).filter((blockId) => !sources.has(blockId))
+}
+
+// Whether the workflow contains a Response block. Its output replaces the whole HTTP response
+// (status, headers and body), so such workflows are answered without server-sent events
+function containsResponseBlock(blocks: Record<string, any>): boolean {
+  return Object.values(blocks).some((block: any) => block?.type === 'response')
+}
+
 // Custom error class for usage limit exceeded
 class UsageLimitError extends Error {
   statusCode: number
@@ -64,7 +77,12 @@ class UsageLimitError extends Error {
   }
 }
 
-async function executeWorkflow(workflow: any, requestId: string, input?: any): Promise<any> {
+async function executeWorkflow(
+  workflow: any,
+  requestId: string,
+  input?: any,
+  onStream?: (streamingExecution: any) => Promise<void>
+): Promise<any> {
   const workflowId = workflow.id
   const executionId = uuidv4()
 
@@ -287,6 +305,16 @@ async function executeWorkflow(workflow: any, requestId: string, input?: any): P
       contextExtensions: {
         executionId,
         workspaceId: workflow.workspaceId,
+        // Stream the output of the final blocks when the caller asked for server-sent events
+        ...(onStream && {
+          stream: true,
+          selectedOutputIds: getTerminalBlockIds(mergedStates, edges || []),
+          edges: (edges || []).map((edge: any) => ({
+            source: edge.source,
+            target: edge.target,
+          })),
+          onStream,
+        }),
       },
     })
 
@@ -296,7 +324,8 @@ async function executeWorkflow(workflow: any, requestId: string, input?: any): P
     const result = await executor.execute(workflowId)
 
     // Check if we got a StreamingExecution result (with stream + execution properties)
-    // For API routes, we only care about the ExecutionResult part, not the stream
+    // Streamed output has already been forwarded through onStream, so only the
+    // ExecutionResult part is needed here
     const executionResult = 'stream' in result && 'execution' in result ? result.execution : result
 
     logger.info(`[${requestId}] Workflow execution completed: ${workflowId}`, {
@@ -347,6 +376,59 @@ async function executeWorkflow(workflow: any, requestId: string, input?: any): P
   }
 }
 
+// Execute the workflow and send its progress as server-sent events, in the same format as the
+// chat route: { blockId, chunk } for each piece of streamed output, { blockId, event: 'end' }
+// when a block's stream ends, then { event: 'final', data } or { event: 'error', error, code }
+function createStreamingResponse(workflow: any, requestId: string, input: any): Response {
+  const stream = new ReadableStream({
+    async start(controller) {
+      const encoder = new TextEncoder()
+      const send = (data: any) => {
+        controller.enqueue(encoder.encode(`data: ${JSON.stringify(data)}\n\n`))
+      }
+
+      const onStream = async (streamingExecution: any): Promise<void> => {
+        if (!streamingExecution.stream) return
+
+        const blockId = streamingExecution.execution?.blockId
+        const reader = streamingExecution.stream.getReader()
+        const decoder = new TextDecoder()
+        while (true) {
+          const { done, value } = await reader.read()
+          if (done) {
+            send({ blockId, event: 'end' })
+            break
+          }
+          send({ blockId, chunk: decoder.decode(value, { stream: true }) })
+        }
+      }
+
+      try {
+        const result = await executeWorkflow(workflow, requestId, input, onStream)
+        send({ event: 'final', data: createFilteredResult(result) })
+      } catch (error: any) {
+        logger.error(`[${requestId}] Streamed workflow execution failed`, error)
+        send({
+          event: 'error',
+          error: error.message || 'Failed to execute workflow',
+          code: error instanceof UsageLimitError ? 'USAGE_LIMIT_EXCEEDED' : 'EXECUTION_ERROR',
+        })
+      }
+      controller.close()
+    },
+  })
+
+  return new Response(stream, {
+    status: 200,
+    headers: {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      Connection: 'keep-alive',
+      'X-Accel-Buffering': 'no',
+    },
+  })
+}
+
 export async function GET(request: NextRequest, { params }: { params: Promise<{ id: string }> }) {
   const requestId = crypto.randomUUID().slice(0, 8)
   const { id } = await params
@@ -464,6 +546,7 @@ export async function POST(
     // Check execution mode from header
     const executionMode = request.headers.get('X-Execution-Mode')
     const isAsync = executionMode === 'async'
+    const isStreaming = request.headers.get('Accept')?.includes('text/event-stream') ?? false
 
     // Parse request body
     const body = await request.text()
@@ -589,6 +672,14 @@ export async function POST(
         )
       }
 
+      if (isStreaming) {
+        const { blocks } = await loadDeployedWorkflowState(workflowId)
+        if (!containsResponseBlock(blocks || {})) {
+          return createStreamingResponse(validation.workflow, requestId, input)
+        }
+        logger.info(`[${requestId}] Workflow has a Response block, answering without streaming`)
+      }
+
       const result = await executeWorkflow(validation.workflow, requestId, input)
 
       const hasResponseBlock = workflowHasResponseBlock(result)
@@ -0,0 +1,145 @@
+"""
+Micro-benchmark for JSON codecs and result object allocation.
+
+Compares every available JSONCodec against the standard library on a typical execute
+request and response, and the result dataclasses with ``__slots__`` against the plain
+``@dataclass`` versions they replaced.
+
+Usage:
+    python benchmarks/bench_codec.py [--iterations N] [--json]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from simstudio import JSONCodec, WorkflowExecutionResult, WorkflowStatus
+from simstudio.codec import MsgspecCodec, OrjsonCodec
+
+
+@dataclass
+class DataclassExecutionResult:
+    """The ``@dataclass`` WorkflowExecutionResult without ``__slots__``, as shipped before."""
+    success: bool
+    output: Optional[Any] = None
+    error: Optional[str] = None
+    logs: Optional[list] = None
+    metadata: Optional[Dict[str, Any]] = None
+    trace_spans: Optional[list] = None
+    total_duration: Optional[float] = None
+
+
+@dataclass
+class DataclassStatus:
+    """The ``@dataclass`` WorkflowStatus without ``__slots__``, as shipped before."""
+    is_deployed: bool
+    deployed_at: Optional[str] = None
+    is_published: bool = False
+    needs_redeployment: bool = False
+
+
+REQUEST = {
+    'message': 'Summarize the attached document',
+    'context': {'user': 'u-1', 'tags': ['a'] * 8},
+}
+RESPONSE = {
+    'success': True,
+    'output': {
+        'content': 'x' * 512, 'model': 'gpt-4o', 'tokens': {'prompt': 120, 'completion': 80},
+    },
+    'logs': [
+        {
+            'blockId': f'block-{i}', 'success': True, 'durationMs': i,
+            'output': {'content': 'y' * 128},
+        }
+        for i in range(20)
+    ],
+    'metadata': {'duration': 1234, 'executedAt': '2024-01-01T00:00:00Z'},
+    'traceSpans': [
+        {'id': f'span-{i}', 'name': 'agent', 'duration': i, 'children': []} for i in range(20)
+    ],
+    'totalDuration': 1234,
+}
+
+
+def available_codecs() -> List[JSONCodec]:
+    codecs = [JSONCodec()]
+    for codec_class in (OrjsonCodec, MsgspecCodec):
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+    return codecs
+
+
+def per_call_us(fn, iterations: int) -> float:
+    """Best of three runs, in microseconds per call."""
+    return min(timeit.repeat(fn, number=iterations, repeat=3)) / iterations * 1e6
+
+
+def bytes_per_object(factory, count: int = 10000) -> float:
+    """Average traced allocation per object, in bytes."""
+    tracemalloc.start()
+    objects = [factory() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def run(iterations: int) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    body = json.dumps(RESPONSE).encode('utf-8')
+    for codec in available_codecs():
+        rows.append({'case': f'encode request ({codec.name})',
+                     'us_per_call': per_call_us(lambda: codec.dumps(REQUEST), iterations)})
+        rows.append({'case': f'decode response ({codec.name})',
+                     'us_per_call': per_call_us(lambda: codec.loads(body), iterations)})
+
+    result_args = dict(success=True, output={'content': 'x'}, metadata={'duration': 1})
+    status_args = dict(is_deployed=True, deployed_at='2024-01-01T00:00:00Z')
+    for label, result_type, status_type in (
+        ('dataclass', DataclassExecutionResult, DataclassStatus),
+        ('slots', WorkflowExecutionResult, WorkflowStatus),
+    ):
+        rows.append({
+            'case': f'WorkflowExecutionResult ({label})',
+            'us_per_call': per_call_us(lambda: result_type(**result_args), iterations),
+            'bytes_per_object': bytes_per_object(lambda: result_type(**result_args)),
+        })
+        rows.append({
+            'case': f'WorkflowStatus ({label})',
+            'us_per_call': per_call_us(lambda: status_type(**status_args), iterations),
+            'bytes_per_object': bytes_per_object(lambda: status_type(**status_args)),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--iterations', type=int, default=20000, help='Calls per timing run')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable JSON')
+    args = parser.parse_args()
+
+    rows = run(args.iterations)
+    if args.json:
+        report = {'benchmark': 'codec', 'python': sys.version.split()[0], 'results': rows}
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+
+    print(f"{'case':<40} {'us/call':>10} {'bytes/object':>14}")
+    for row in rows:
+        size = row.get('bytes_per_object')
+        size_column = '' if size is None else f'{size:>14.0f}'
+        print(f"{row['case']:<40} {row['us_per_call']:>10.2f} {size_column}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""
+Throughput and latency benchmark for SimStudioClient against a local mock Sim server.
+
+For every combination of concurrency level and payload size, a fresh
+``python -m simstudio.testing`` server is started in a subprocess (so its CPU time is
+not charged to the client) and one shared SimStudioClient executes workflows from a
+thread pool. Reported per cell: requests per second, p50/p95/p99 latency, client CPU
+time per call, peak traced client memory (from a separate, shorter pass) and the
+connections the client opened and reused.
+Runs fully offline.
+
+Usage:
+    python benchmarks/bench_throughput.py [--concurrency 1 8 32] [--payload-sizes 64 65536]
+        [--requests 500] [--latency 0.02] [--mode sync|async] [--transport requests|http]
+        [--json results.json] [--baseline previous.json --tolerance 0.15]
+
+``--json`` writes machine-readable results; ``--baseline`` compares against an earlier
+JSON file and exits with status 1 if throughput or p95 latency regressed by more than
+``--tolerance``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import simstudio
+from simstudio import PoolConfig, SimStudioClient, SimStudioError
+
+
+def start_server(args: argparse.Namespace, payload_size: int) -> Tuple[subprocess.Popen, str]:
+    command = [
+        sys.executable, '-m', 'simstudio.testing',
+        '--latency', str(args.latency),
+        '--jitter', str(args.jitter),
+        '--payload-size', str(payload_size),
+        '--job-duration', str(args.job_duration),
+    ]
+    env = dict(os.environ)
+    package_root = os.path.dirname(os.path.dirname(simstudio.__file__))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_root, env.get('PYTHONPATH')]))
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True, env=env)
+    assert process.stdout is not None
+    url = process.stdout.readline().strip()
+    if not url:
+        process.kill()
+        raise RuntimeError('Mock server failed to start')
+    return process, url
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def run_cell(
+    url: str, args: argparse.Namespace, concurrency: int, payload_size: int
+) -> Dict[str, Any]:
+    client = SimStudioClient(api_key='benchmark-key', base_url=url, transport=args.transport,
+                             pool=PoolConfig(max_connections=concurrency))
+    execute = client.execute_workflow if args.mode == 'sync' else client.execute_workflow_sync
+    latencies: List[float] = []
+    errors = 0
+
+    def one_call(index: int) -> Optional[float]:
+        started = time.perf_counter()
+        try:
+            execute('benchmark-workflow', {'index': index}, timeout=args.timeout)
+        except SimStudioError:
+            return None
+        return time.perf_counter() - started
+
+    def drive(count: int) -> None:
+        nonlocal errors
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for latency in pool.map(one_call, range(count)):
+                if latency is None:
+                    errors += 1
+                else:
+                    latencies.append(latency)
+
+    # Warm up connections before measuring.
+    drive(min(concurrency, args.requests))
+    latencies.clear()
+    errors = 0
+
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    drive(args.requests)
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+    measured, measured_errors = sorted(latencies), errors
+
+    # Memory is traced in a separate, shorter pass: tracing slows every allocation.
+    tracemalloc.start()
+    drive(min(args.requests, concurrency * 4))
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    pool_stats = client.pool_stats()
+    client.close()
+
+    return {
+        'mode': args.mode,
+        'transport': args.transport,
+        'concurrency': concurrency,
+        'payload_bytes': payload_size,
+        'requests': args.requests,
+        'errors': measured_errors,
+        'rps': len(measured) / wall if wall else 0.0,
+        'p50_ms': percentile(measured, 0.50) * 1000,
+        'p95_ms': percentile(measured, 0.95) * 1000,
+        'p99_ms': percentile(measured, 0.99) * 1000,
+        'cpu_ms_per_call': cpu / args.requests * 1000,
+        'peak_memory_kib': peak_memory / 1024,
+        'connections_created': pool_stats.created,
+        'connections_reused': pool_stats.reused,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    """Describe every cell whose throughput or p95 latency regressed beyond the tolerance."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def cell_key(row: Dict[str, Any]) -> Tuple[Any, ...]:
+        transport = row.get('transport', 'requests')
+        return row['mode'], transport, row['concurrency'], row['payload_bytes']
+
+    previous = {cell_key(r): r for r in baseline['results']}
+    regressions = []
+    for row in results:
+        before = previous.get(cell_key(row))
+        if before is None:
+            continue
+        cell = (
+            f"{row['mode']} {row['transport']} c={row['concurrency']} "
+            f"payload={row['payload_bytes']}"
+        )
+        if row['rps'] < before['rps'] * (1 - tolerance):
+            regressions.append(f"{cell}: rps {before['rps']:.1f} -> {row['rps']:.1f}")
+        if row['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{cell}: p95 {before['p95_ms']:.1f}ms -> {row['p95_ms']:.1f}ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--payload-sizes', type=int, nargs='+', default=[64, 16 * 1024, 256 * 1024])
+    parser.add_argument('--requests', type=int, default=500, help='Measured calls per cell')
+    parser.add_argument('--latency', type=float, default=0.02, help='Simulated server latency (s)')
+    parser.add_argument('--jitter', type=float, default=0.005, help='Extra random latency (s)')
+    parser.add_argument('--job-duration', type=float, default=0.0,
+                        help='Simulated async job duration (s)')
+    parser.add_argument('--mode', choices=['sync', 'async'], default='sync')
+    parser.add_argument('--transport', choices=['requests', 'http'], default='requests')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--json', dest='json_path',
+                        help='Write machine-readable results to this file')
+    parser.add_argument('--baseline', help='Earlier --json output to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed relative regression')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'mode':<6} {'conc':>5} {'payload':>9} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'cpu ms':>7} {'mem KiB':>9} {'err':>4}")
+    for payload_size in args.payload_sizes:
+        process, url = start_server(args, payload_size)
+        try:
+            for concurrency in args.concurrency:
+                row = run_cell(url, args, concurrency, payload_size)
+                results.append(row)
+                print(f"{row['mode']:<6} {concurrency:>5} {payload_size:>9} {row['rps']:>9.1f} "
+                      f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} "
+                      f"{row['cpu_ms_per_call']:>7.3f} {row['peak_memory_kib']:>9.0f} "
+                      f"{row['errors']:>4}")
+        finally:
+            process.terminate()
+            process.wait()
+
+    if args.json_path:
+        report = {
+            'benchmark': 'throughput',
+            'sdk_version': simstudio.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'config': {
+                'requests': args.requests,
+                'latency': args.latency,
+                'jitter': args.jitter,
+                'job_duration': args.job_duration,
+            },
+            'results': results,
+        }
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
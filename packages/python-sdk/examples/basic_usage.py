@@ -114,38 +114,18 @@ def batch_execution_example():
     
     results = []
     
-    for workflow_id, input_data in workflows:
-        try:
-            # Validate workflow before execution
-            if not client.validate_workflow(workflow_id):
-                print(f"⚠️  Skipping {workflow_id}: not deployed")
-                continue
-                
-            result = client.execute_workflow(workflow_id, input_data)
-            results.append({
-                "workflow_id": workflow_id,
-                "success": result.success,
-                "output": result.output,
-                "error": result.error
-            })
-            
-            status = "✅ Success" if result.success else "❌ Failed"
-            print(f"{status}: {workflow_id}")
-            
-        except SimStudioError as error:
-            results.append({
-                "workflow_id": workflow_id,
-                "success": False,
-                "error": str(error)
-            })
-            print(f"❌ SDK Error in {workflow_id}: {error}")
-        except Exception as error:
-            results.append({
-                "workflow_id": workflow_id,
-                "success": False,
-                "error": str(error)
-            })
-            print(f"❌ Unexpected error in {workflow_id}: {error}")
+    # Runs up to 4 executions at a time; failed items come back as results
+    for index, result in client.execute_many(workflows, max_concurrency=4):
+        workflow_id = workflows[index][0]
+        results.append({
+            "workflow_id": workflow_id,
+            "success": result.success,
+            "output": result.output,
+            "error": result.error
+        })
+        
+        status = "✅ Success" if result.success else f"❌ Failed ({result.error})"
+        print(f"{status}: {workflow_id}")
     
     # Summary
     successful = sum(1 for r in results if r["success"])
@@ -31,9 +31,28 @@ setup(
         "typing-extensions>=4.0.0; python_version<'3.10'",
     ],
     extras_require={
+        "async": [
+            "httpx>=0.23.0",
+        ],
+        "fast": [
+            "orjson>=3.6.0",
+        ],
+        "otel": [
+            "opentelemetry-api>=1.0.0",
+        ],
+        "analytics": [
+            "numpy>=1.20.0",
+        ],
+        "parquet": [
+            "pyarrow>=10.0.0",
+        ],
         "dev": [
             "pytest>=6.0.0",
             "pytest-asyncio>=0.18.0",
+            "httpx>=0.23.0",
+            "opentelemetry-sdk>=1.0.0",
+            "numpy>=1.20.0",
+            "pyarrow>=10.0.0",
             "black>=22.0.0",
             "flake8>=4.0.0",
             "mypy>=0.910",
@@ -42,6 +61,11 @@ setup(
             "pytest>=6.0.0",
         ],
     },
+    entry_points={
+        "console_scripts": [
+            "simstudio=simstudio.cli:main",
+        ],
+    },
     keywords=["simstudio", "ai", "workflow", "sdk", "api", "automation"],
     project_urls={
         "Bug Reports": "https://github.com/simstudioai/sim/issues",
@@ -4,19 +4,205 @@ Sim SDK for Python
 Official Python SDK for Sim, allowing you to execute workflows programmatically.
 """
 
-from typing import Any, Dict, Optional
-from dataclasses import dataclass
+import importlib
+import itertools
+import json
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urlencode
 
-import requests
+from .transport import (
+    PoolConfig,
+    PoolStats,
+    Response,
+    Transport,
+    TransportError,
+    TransportTimeout,
+    resolve_transport,
+)
+
+if TYPE_CHECKING:
+    from .balancer import EndpointStats, LoadBalancer
+    from .cache import ResultCache, SingleFlight, StatusCache
+    from .codec import JSONCodec
+    from .hedging import HedgePolicy
+    from .instrumentation import ClientHooks, PhaseClock
+    from .jobs import JobTracker
+    from .rate_limit import RateLimiter
+    from .retry import CircuitBreaker, RetryPolicy
+    from .streaming import WorkflowStream
+    from .uploads import FileUploader
+
+T = TypeVar('T')
+_C = TypeVar('_C')
 
 
 __version__ = "0.1.0"
-__all__ = ["SimStudioClient", "SimStudioError", "WorkflowExecutionResult", "WorkflowStatus"]
+__all__ = [
+    "AsyncSimStudioClient",
+    "AsyncWorkflowStream",
+    "CircuitBreaker",
+    "ClientHooks",
+    "EndpointStats",
+    "ExecutionScheduler",
+    "FileUploader",
+    "HTTPTransport",
+    "HedgePolicy",
+    "JSONCodec",
+    "JobStatus",
+    "JobTracker",
+    "LatencyHistograms",
+    "LoadBalancer",
+    "LogWriter",
+    "Outbox",
+    "OutboxEntry",
+    "PoolConfig",
+    "PoolStats",
+    "PriorityClass",
+    "PriorityClassStats",
+    "RateLimitError",
+    "RateLimiter",
+    "RequestTimings",
+    "RequestsTransport",
+    "ResultCache",
+    "RetryPolicy",
+    "SimStudioClient",
+    "SimStudioError",
+    "StatusCache",
+    "StreamChunk",
+    "TraceStore",
+    "TracingHooks",
+    "Transport",
+    "WorkflowExecutionResult",
+    "WorkflowJob",
+    "WorkflowStatus",
+    "WorkflowStream",
+]
 
+# Public names that live in optional submodules, imported on first access so that
+# `import simstudio` does not pull in their (optional) dependencies.
+_LAZY_EXPORTS = {
+    "AsyncSimStudioClient": "async_client",
+    "AsyncWorkflowStream": "async_client",
+    "CircuitBreaker": "retry",
+    "ClientHooks": "instrumentation",
+    "EndpointStats": "balancer",
+    "ExecutionScheduler": "scheduler",
+    "FileUploader": "uploads",
+    "HTTPTransport": "http_transport",
+    "HedgePolicy": "hedging",
+    "JSONCodec": "codec",
+    "JobTracker": "jobs",
+    "LatencyHistograms": "instrumentation",
+    "LoadBalancer": "balancer",
+    "LogWriter": "logs",
+    "Outbox": "outbox",
+    "OutboxEntry": "outbox",
+    "PriorityClass": "scheduler",
+    "PriorityClassStats": "scheduler",
+    "RateLimiter": "rate_limit",
+    "RequestsTransport": "requests_transport",
+    "RequestTimings": "instrumentation",
+    "ResultCache": "cache",
+    "RetryPolicy": "retry",
+    "StatusCache": "cache",
+    "StreamChunk": "streaming",
+    "TraceStore": "analytics",
+    "TracingHooks": "instrumentation",
+    "WorkflowStream": "streaming",
+}
 
-@dataclass
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+_LAZY_DECODE_LOCK = threading.Lock()
+
+
+def _lazy_json_field(name: str) -> property:
+    """A result attribute that may hold raw JSON bytes until it is first read."""
+    attribute = '_' + name
+
+    def get(self: "WorkflowExecutionResult") -> Any:
+        raw = self._raw
+        if raw is not None and name in raw:
+            with _LAZY_DECODE_LOCK:
+                encoded = raw.pop(name, None)
+                if encoded is not None:
+                    setattr(self, attribute, self._loads(encoded))
+        return getattr(self, attribute)
+
+    def set(self: "WorkflowExecutionResult", value: Any) -> None:
+        if self._raw is not None:
+            self._raw.pop(name, None)
+        setattr(self, attribute, value)
+
+    return property(get, set)
+
+
+def _with_slots(*slots: str, **attributes: Any) -> Callable[[Type[_C]], Type[_C]]:
+    """
+    Recreate a dataclass with ``__slots__``, like ``dataclass(slots=True)`` on Python 3.10+.
+
+    ``attributes`` are set on the new class in place of the fields' defaults (e.g.
+    properties backed by one of the slots).
+    """
+    def decorate(cls: Type[_C]) -> Type[_C]:
+        namespace = dict(cls.__dict__)
+        for name in (*slots, *(f.name for f in fields(cls))):  # type: ignore[arg-type]
+            namespace.pop(name, None)
+        namespace.pop('__dict__', None)
+        namespace.pop('__weakref__', None)
+        namespace.update(attributes)
+        namespace['__slots__'] = slots
+        return type(cls.__name__, cls.__bases__, namespace)
+
+    return decorate
+
+
+@_with_slots(
+    'success', 'output', 'error', '_logs', 'metadata', '_trace_spans', 'total_duration',
+    '_raw', '_loads',
+    logs=_lazy_json_field('logs'),
+    trace_spans=_lazy_json_field('trace_spans'),
+)
+@dataclass(init=False)
 class WorkflowExecutionResult:
-    """Result of a workflow execution."""
+    """
+    Result of a workflow execution.
+
+    When the client decodes lazily, ``logs`` and ``trace_spans`` are kept as raw JSON
+    and only decoded the first time they are read.
+    """
     success: bool
     output: Optional[Any] = None
     error: Optional[str] = None
@@ -25,7 +211,28 @@ class WorkflowExecutionResult:
     trace_spans: Optional[list] = None
     total_duration: Optional[float] = None
 
+    def __init__(
+        self,
+        success: bool,
+        output: Optional[Any] = None,
+        error: Optional[str] = None,
+        logs: Optional[list] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        trace_spans: Optional[list] = None,
+        total_duration: Optional[float] = None
+    ):
+        self._raw: Optional[Dict[str, bytes]] = None
+        self._loads: Callable[[bytes], Any] = json.loads
+        self.success = success
+        self.output = output
+        self.error = error
+        self._logs = logs
+        self.metadata = metadata
+        self._trace_spans = trace_spans
+        self.total_duration = total_duration
+
 
+@_with_slots('is_deployed', 'deployed_at', 'is_published', 'needs_redeployment')
 @dataclass
 class WorkflowStatus:
     """Status of a workflow."""
@@ -35,138 +242,820 @@ class WorkflowStatus:
     needs_redeployment: bool = False
 
 
+@dataclass
+class WorkflowJob:
+    """Handle for a workflow execution queued with ``X-Execution-Mode: async``."""
+    task_id: str
+    workflow_id: str
+    status: str = 'queued'
+    created_at: Optional[str] = None
+    status_url: Optional[str] = None
+    submitted_at: float = field(default_factory=time.monotonic, repr=False, compare=False)
+
+
+@dataclass
+class JobStatus:
+    """Status of a queued workflow execution, as reported by ``/api/jobs/{taskId}``."""
+    task_id: str
+    status: str
+    output: Optional[Any] = None
+    error: Optional[Any] = None
+    metadata: Optional[Dict[str, Any]] = None
+    estimated_duration: Optional[float] = None
+
+    @property
+    def is_final(self) -> bool:
+        """Whether the job has completed, failed or been cancelled."""
+        return self.status in _FINAL_JOB_STATUSES
+
+
+_FINAL_JOB_STATUSES = frozenset(['completed', 'failed', 'cancelled'])
+
+# Adaptive job polling: poll quickly at first, then roughly in proportion to how long the
+# job has been running (bounding how late a result is noticed to ~25%), and never less
+# often than a tenth of the server's duration estimate or `_MAX_POLL_INTERVAL`.
+_MIN_POLL_INTERVAL = 0.5
+_MAX_POLL_INTERVAL = 10.0
+_POLL_ELAPSED_FRACTION = 0.25
+
+_RESULT_ATTRIBUTES = frozenset([
+    'success', 'output', 'error', 'logs', 'metadata', 'trace_spans', 'total_duration'
+])
+
+# Chunk size for streamed (``fields``/``lazy_decoding``) execute responses.
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Error codes the execute route returns when the cached deployment status is stale.
+_STALE_STATUS_ERROR_CODES = frozenset(['WORKFLOW_IS_NOT_DEPLOYED', 'WORKFLOW_NOT_FOUND'])
+
+# Error code returned by the execute route when async executions cannot be queued
+# (e.g. self-hosted deployments without a background job runner).
+_ASYNC_QUEUE_UNAVAILABLE = 'FAILED_TO_QUEUE_WORKFLOW_EXECUTION'
+
+
 class SimStudioError(Exception):
     """Exception raised for Sim API errors."""
-    
+
     def __init__(self, message: str, code: Optional[str] = None, status: Optional[int] = None):
         super().__init__(message)
         self.code = code
         self.status = status
 
 
+class RateLimitError(SimStudioError):
+    """Exception raised when the Sim API rejects a call for exceeding the rate limit (HTTP 429)."""
+
+    def __init__(
+        self,
+        message: str,
+        code: Optional[str] = 'RATE_LIMIT_EXCEEDED',
+        status: Optional[int] = 429,
+        remaining: Optional[int] = None,
+        reset_at: Optional[datetime] = None
+    ):
+        super().__init__(message, code, status)
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+
+# The sync execute route only reports the rate limit window inside its error message.
+_REMAINING_PATTERN = re.compile(r'(\d+) requests remaining')
+_RESET_AT_PATTERN = re.compile(r'Resets at (\S+)')
+
+
+def _parse_reset_at(value: Any) -> Optional[datetime]:
+    """Parse the server's ``resetAt`` timestamp (ISO 8601, usually with a ``Z`` suffix)."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.rstrip('.').replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _rate_limit_error(error_data: Dict[str, Any], fallback: str) -> RateLimitError:
+    """
+    Build a RateLimitError from a 429 body, reading remaining/resetAt from its fields or,
+    failing that, from its message.
+    """
+    message = error_data.get('error', fallback)
+    text = f"{message} {error_data.get('message', '')}"
+    remaining = error_data.get('remaining')
+    if remaining is None:
+        match = _REMAINING_PATTERN.search(text)
+        remaining = int(match.group(1)) if match else None
+    reset_at = error_data.get('resetAt')
+    if reset_at is None:
+        match = _RESET_AT_PATTERN.search(text)
+        reset_at = match.group(1) if match else None
+    return RateLimitError(
+        message,
+        error_data.get('code') or 'RATE_LIMIT_EXCEEDED',
+        429,
+        remaining=remaining,
+        reset_at=_parse_reset_at(reset_at)
+    )
+
+
+def _error_from_response(
+    status_code: int, reason: Optional[str], error_data: Any
+) -> SimStudioError:
+    """Build a SimStudioError from a non-2xx response and its decoded body (if any)."""
+    fallback = f'HTTP {status_code}: {reason}'
+    if status_code == 429:
+        return _rate_limit_error(error_data if isinstance(error_data, dict) else {}, fallback)
+    if isinstance(error_data, dict):
+        return SimStudioError(
+            error_data.get('error', fallback), error_data.get('code'), status_code
+        )
+    return SimStudioError(fallback, None, status_code)
+
+
+def _parse_execution_result(result_data: Dict[str, Any]) -> WorkflowExecutionResult:
+    """Convert an execute response body into a WorkflowExecutionResult."""
+    return WorkflowExecutionResult(
+        success=result_data['success'],
+        output=result_data.get('output'),
+        error=result_data.get('error'),
+        logs=result_data.get('logs'),
+        metadata=result_data.get('metadata'),
+        trace_spans=result_data.get('traceSpans'),
+        total_duration=result_data.get('totalDuration')
+    )
+
+
+def _result_payload(result: WorkflowExecutionResult) -> Dict[str, Any]:
+    """Convert a WorkflowExecutionResult back into the execute response body shape."""
+    return {
+        'success': result.success,
+        'output': result.output,
+        'error': result.error,
+        'logs': result.logs,
+        'metadata': result.metadata,
+        'traceSpans': result.trace_spans,
+        'totalDuration': result.total_duration,
+    }
+
+
+def _parse_workflow_status(status_data: Dict[str, Any]) -> WorkflowStatus:
+    """Convert a status response body into a WorkflowStatus."""
+    return WorkflowStatus(
+        is_deployed=status_data.get('isDeployed', False),
+        deployed_at=status_data.get('deployedAt'),
+        is_published=status_data.get('isPublished', False),
+        needs_redeployment=status_data.get('needsRedeployment', False)
+    )
+
+
+def _parse_job_submission(workflow_id: str, job_data: Dict[str, Any]) -> WorkflowJob:
+    """Convert a 202 async execute response body into a WorkflowJob."""
+    links = job_data.get('links') or {}
+    return WorkflowJob(
+        task_id=job_data['taskId'],
+        workflow_id=workflow_id,
+        status=job_data.get('status', 'queued'),
+        created_at=job_data.get('createdAt'),
+        status_url=links.get('status')
+    )
+
+
+def _parse_job_status(job_data: Dict[str, Any]) -> JobStatus:
+    """Convert a ``/api/jobs/{taskId}`` response body into a JobStatus."""
+    return JobStatus(
+        task_id=job_data.get('taskId', ''),
+        status=job_data.get('status', 'unknown'),
+        output=job_data.get('output'),
+        error=job_data.get('error'),
+        metadata=job_data.get('metadata'),
+        estimated_duration=job_data.get('estimatedDuration')
+    )
+
+
+def _result_from_job(job: JobStatus) -> WorkflowExecutionResult:
+    """Settle a final JobStatus into a WorkflowExecutionResult."""
+    metadata = job.metadata or {}
+    total_duration = metadata.get('duration')
+
+    if job.status == 'completed':
+        output = job.output
+        if isinstance(output, dict) and 'success' in output:
+            return WorkflowExecutionResult(
+                success=bool(output['success']),
+                output=output.get('output'),
+                error=output.get('error'),
+                metadata={**metadata, 'executionId': output.get('executionId')},
+                total_duration=total_duration
+            )
+        return WorkflowExecutionResult(success=True, output=output, metadata=metadata,
+                                       total_duration=total_duration)
+
+    if job.status == 'cancelled':
+        error = 'Workflow execution was cancelled'
+    elif isinstance(job.error, dict):
+        error = job.error.get('message') or str(job.error)
+    else:
+        error = str(job.error) if job.error is not None else 'Workflow execution failed'
+    return WorkflowExecutionResult(success=False, error=error, metadata=metadata,
+                                   total_duration=total_duration)
+
+
+def _next_poll_delay(elapsed: float, estimated_duration: Optional[float]) -> float:
+    """
+    Seconds to wait before polling a job again.
+
+    Args:
+        elapsed: Seconds since the job was submitted
+        estimated_duration: Server-reported duration estimate in milliseconds, if any
+    """
+    delay = max(_MIN_POLL_INTERVAL, elapsed * _POLL_ELAPSED_FRACTION)
+    if estimated_duration:
+        delay = min(delay, max(_MIN_POLL_INTERVAL, estimated_duration / 1000.0 / 10))
+    return min(delay, _MAX_POLL_INTERVAL)
+
+
+def _format_log_date(value: Union[str, datetime]) -> str:
+    """Format an ``iter_logs`` date filter as ISO 8601; naive datetimes are taken as UTC."""
+    if isinstance(value, str):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _normalize_fields(fields: Optional[Iterable[str]]) -> Optional[FrozenSet[str]]:
+    """Validate a ``fields`` selection of WorkflowExecutionResult attributes."""
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = [fields]
+    selected = frozenset(fields)
+    unknown = selected - _RESULT_ATTRIBUTES
+    if unknown:
+        raise ValueError(f"Unknown result fields: {', '.join(sorted(unknown))}")
+    return selected
+
+
+def _resolve_codec(codec: Optional["JSONCodec"]) -> "JSONCodec":
+    """Turn a client's ``codec`` option into a JSONCodec (the fastest available by default)."""
+    if codec is not None:
+        return codec
+    from .codec import default_codec
+    return default_codec()
+
+
+def _resolve_balancer(
+    base_url: Union[str, Sequence[str], "LoadBalancer"]
+) -> Optional["LoadBalancer"]:
+    """Turn a client's ``base_url`` option into a LoadBalancer (or None for a single URL)."""
+    if isinstance(base_url, str):
+        return None
+    from .balancer import LoadBalancer
+    if isinstance(base_url, LoadBalancer):
+        return base_url
+    return LoadBalancer(list(base_url))
+
+
+def _resolve_rate_limiter(
+    api_key: str, rate_limit: Union[bool, "RateLimiter"]
+) -> Optional["RateLimiter"]:
+    """Turn a client's ``rate_limit`` option into a RateLimiter (or None when disabled)."""
+    if rate_limit is False or rate_limit is None:
+        return None
+    if rate_limit is True:
+        from .rate_limit import RateLimiter
+        return RateLimiter.shared(api_key)
+    return rate_limit
+
+
+def _resolve_retry_policy(retry: Union[bool, "RetryPolicy"]) -> Optional["RetryPolicy"]:
+    """Turn a client's ``retry`` option into a RetryPolicy (or None when disabled)."""
+    if retry is False or retry is None:
+        return None
+    if retry is True:
+        from .retry import RetryPolicy
+        return RetryPolicy()
+    return retry
+
+
+def _resolve_circuit_breaker(
+    circuit_breaker: Union[bool, "CircuitBreaker"]
+) -> Optional["CircuitBreaker"]:
+    """Turn a client's ``circuit_breaker`` option into a CircuitBreaker (or None when disabled)."""
+    if circuit_breaker is False or circuit_breaker is None:
+        return None
+    if circuit_breaker is True:
+        from .retry import CircuitBreaker
+        return CircuitBreaker()
+    return circuit_breaker
+
+
+def _resolve_hedge_policy(hedging: Union[bool, "HedgePolicy"]) -> Optional["HedgePolicy"]:
+    """Turn a client's ``hedging`` option into a HedgePolicy (or None when disabled)."""
+    if hedging is False or hedging is None:
+        return None
+    if hedging is True:
+        from .hedging import HedgePolicy
+        return HedgePolicy()
+    return hedging
+
+
+def _resolve_status_cache(status_cache: Union[bool, "StatusCache"]) -> Optional["StatusCache"]:
+    """Turn a client's ``status_cache`` option into a StatusCache (or None when disabled)."""
+    if status_cache is False or status_cache is None:
+        return None
+    if status_cache is True:
+        from .cache import StatusCache
+        return StatusCache()
+    return status_cache
+
+
+def _resolve_result_cache(result_cache: Union[bool, "ResultCache"]) -> Optional["ResultCache"]:
+    """Turn a client's ``result_cache`` option into a ResultCache (or None when disabled)."""
+    if result_cache is False or result_cache is None:
+        return None
+    if result_cache is True:
+        from .cache import ResultCache
+        return ResultCache()
+    return result_cache
+
+
+def _resolve_in_flight(coalesce: bool) -> Optional["SingleFlight"]:
+    """Turn a client's ``coalesce`` option into a SingleFlight (or None when disabled)."""
+    if not coalesce:
+        return None
+    from .cache import SingleFlight
+    return SingleFlight()
+
+
 class SimStudioClient:
     """
     Sim API client for executing workflows programmatically.
-    
+
     Args:
         api_key: Your Sim API key
-        base_url: Base URL for the Sim API (defaults to https://sim.ai)
+        base_url: Base URL for the Sim API (defaults to https://sim.ai). A list of base
+            URLs of Sim replicas spreads the requests over them with a LoadBalancer (least
+            outstanding requests, weighted by latency, ejecting failing replicas); pass a
+            LoadBalancer to tune its health checks.
+        rate_limit: Queue executions through a client-side RateLimiter instead of failing
+            on HTTP 429. ``True`` uses the limiter shared by every client of this API key
+            in the process; a RateLimiter instance is used as-is. Disabled by default.
+        status_cache: Cache ``get_workflow_status``/``validate_workflow`` results. ``True``
+            uses a StatusCache with default size and TTL; a StatusCache instance is used
+            as-is. Disabled by default.
+        result_cache: Memoize successful ``execute_workflow`` results per workflow
+            deployment and input, for deterministic workflows. ``True`` uses an in-memory
+            ResultCache; pass a ResultCache for custom sizing or an on-disk tier. Enabling it
+            also enables the status cache, which supplies the deployment timestamp; a
+            cached result is served only after a fresh status request confirms that
+            deployment. Disabled by default.
+        coalesce: Share one execution between concurrent identical ``execute_workflow``
+            calls (same workflow ID and canonicalized input). Attached callers receive the
+            same WorkflowExecutionResult, or the same error. Disabled by default.
+        fields: Default selection of WorkflowExecutionResult attributes to decode, e.g.
+            ``{'success', 'output'}``; unselected attributes are left as None. Selecting
+            fields streams the response and skips the rest of the body as it arrives.
+            ``None`` (default) decodes everything.
+        lazy_decoding: Stream the response and keep ``logs``/``trace_spans`` as raw JSON
+            until they are first read. Disabled by default.
+        codec: JSONCodec for request and response bodies. Defaults to orjson or msgspec
+            when installed, else the standard library ``json``.
+        hooks: ClientHooks notified of every execute request, with connect, upload,
+            server, download and decode timings (e.g. LatencyHistograms, TracingHooks).
+        transport: HTTP transport: ``'requests'`` (default), ``'http'`` for the standard
+            library's ``http.client`` (no requests import, faster cold start) or a
+            Transport instance such as ``simstudio.testing.MemoryTransport``.
+        pool: PoolConfig for the transport's connection pool: connections per host, idle
+            timeout and whether to block when they are all busy. By default the pool holds
+            10 connections per host and ``execute_many`` grows it to its concurrency; an
+            explicit PoolConfig is kept as given.
+        retry: Retry executions that cannot have run the workflow (connection failures,
+            502/503/504, 429 after its reset) with jittered exponential backoff, within
+            the call's ``timeout`` as an overall deadline. ``True`` uses a RetryPolicy with
+            defaults; a RetryPolicy instance is used as-is. Disabled by default.
+        circuit_breaker: Fail executions of a workflow fast (code ``CIRCUIT_OPEN``) while
+            it keeps failing with timeouts, transport errors or 5xx answers. ``True`` uses
+            a CircuitBreaker with defaults; an instance can be shared between clients.
+            Disabled by default.
+        hedging: Hedge the idempotent status and job-status requests: one still
+            unanswered after the 95th percentile of recent latencies is sent again and
+            the first answer wins, within a budget of 10% extra requests. ``True`` uses a
+            HedgePolicy with defaults; a HedgePolicy instance is used as-is. Disabled by
+            default.
+
+    A client is safe to share between threads. Its transport, caches, rate limiter and
+    connection pool are guarded for concurrent use, so one client per process (and API
+    key) lets every thread reuse the same pooled connections; ``pool_stats()`` shows how
+    the pool is used.
     """
-    
-    def __init__(self, api_key: str, base_url: str = "https://sim.ai"):
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Union[str, Sequence[str], "LoadBalancer"] = "https://sim.ai",
+        rate_limit: Union[bool, "RateLimiter"] = False,
+        status_cache: Union[bool, "StatusCache"] = False,
+        result_cache: Union[bool, "ResultCache"] = False,
+        coalesce: bool = False,
+        fields: Optional[Iterable[str]] = None,
+        lazy_decoding: bool = False,
+        codec: Optional["JSONCodec"] = None,
+        hooks: Optional[Iterable["ClientHooks"]] = None,
+        transport: Union[str, Transport, None] = None,
+        pool: Optional[PoolConfig] = None,
+        retry: Union[bool, "RetryPolicy"] = False,
+        circuit_breaker: Union[bool, "CircuitBreaker"] = False,
+        hedging: Union[bool, "HedgePolicy"] = False
+    ):
         self.api_key = api_key
+        self._balancer = _resolve_balancer(base_url)
+        if self._balancer is not None:
+            base_url = self._balancer.endpoints[0]
+        assert isinstance(base_url, str)
         self.base_url = base_url.rstrip('/')
-        self._session = requests.Session()
-        self._session.headers.update({
+        self._result_cache = _resolve_result_cache(result_cache)
+        self._in_flight = _resolve_in_flight(coalesce)
+        self._status_cache = _resolve_status_cache(
+            True if self._result_cache is not None and not status_cache else status_cache
+        )
+        self._shared_rate_limit = rate_limit is True
+        self._rate_limiter = _resolve_rate_limiter(api_key, rate_limit)
+        self._retry = _resolve_retry_policy(retry)
+        self._circuit_breaker = _resolve_circuit_breaker(circuit_breaker)
+        self._owns_hedging = hedging is True
+        self._hedging = _resolve_hedge_policy(hedging)
+        self._fields = _normalize_fields(fields)
+        self._lazy_decoding = lazy_decoding
+        self._codec = _resolve_codec(codec)
+        self._hooks: List["ClientHooks"] = list(hooks or ())
+        self._transport = resolve_transport(transport, instrumented=bool(self._hooks), pool=pool)
+        if self._balancer is not None:
+            self._transport = self._balancer._bind(self._transport, self.base_url)
+        self._transport.headers.update({
             'X-API-Key': self.api_key,
             'Content-Type': 'application/json',
         })
-    
+        self._pool = pool or PoolConfig()
+        self._grow_pool = pool is None
+        self._lock = threading.Lock()
+        self._job_tracker: Optional["JobTracker"] = None
+        self._uploader: Optional["FileUploader"] = None
+
     def execute_workflow(
-        self, 
-        workflow_id: str, 
+        self,
+        workflow_id: str,
         input_data: Optional[Dict[str, Any]] = None,
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        fields: Optional[Iterable[str]] = None
     ) -> WorkflowExecutionResult:
         """
         Execute a workflow with optional input data.
-        
+
+        With ``coalesce=True``, a call made while an identical execution is in flight
+        attaches to it instead of starting another one. The attached call waits at most
+        its own ``timeout``; giving up does not cancel the shared execution. If the shared
+        execution fails (including on the first caller's timeout), every attached caller
+        receives the same error.
+
         Args:
             workflow_id: The ID of the workflow to execute
             input_data: Input data to pass to the workflow
-            timeout: Timeout in seconds (default: 30.0)
-            
+            timeout: Timeout in seconds (default: 30.0). With ``retry``, it bounds all
+                attempts and the backoff between them.
+            fields: Result attributes to decode for this call, overriding the client's
+                ``fields`` (``success`` is always decoded)
+
         Returns:
             WorkflowExecutionResult object containing the execution result
-            
+
         Raises:
-            SimStudioError: If the workflow execution fails
+            SimStudioError: If the workflow execution fails, or with code ``CIRCUIT_OPEN``
+                while the workflow's circuit is open
+            RateLimitError: If the rate limit is exceeded (after queueing, when rate limiting
+                is enabled)
+            ValueError: If ``fields`` names an unknown attribute
+        """
+        selected = self._fields if fields is None else _normalize_fields(fields)
+        if self._in_flight is None:
+            return self._execute_uncoalesced(workflow_id, input_data, timeout, selected)
+
+        from .cache import canonical_input_hash
+        key = (workflow_id, canonical_input_hash(input_data), selected)
+        try:
+            return self._in_flight.do(
+                key,
+                lambda: self._execute_uncoalesced(workflow_id, input_data, timeout, selected),
+                timeout=timeout
+            )
+        except TimeoutError:
+            raise SimStudioError(f'Workflow execution timed out after {timeout} seconds', 'TIMEOUT')
+
+    def _execute_uncoalesced(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]],
+        timeout: float,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> WorkflowExecutionResult:
+        if self._result_cache is not None:
+            return self._execute_memoized(workflow_id, input_data, timeout, fields)
+        return self._send_execution(workflow_id, input_data, timeout, fields)
+
+    def _execute_memoized(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]],
+        timeout: float,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> WorkflowExecutionResult:
+        """
+        Serve an execution from the result cache, executing and memoizing it on a miss.
+
+        Only complete results are memoized, so a cached result can serve any ``fields``.
+        A hit is served only after the workflow's deployment has been confirmed with a
+        status request made for it, so a redeploy is never hidden by the status cache.
+        """
+        assert self._result_cache is not None and self._status_cache is not None
+        loaded = self._status_cache.get(workflow_id) is None
+        try:
+            status = self.get_workflow_status(workflow_id)
+        except SimStudioError:
+            return self._send_execution(workflow_id, input_data, timeout, fields)
+
+        from .cache import _result_scope
+        scope = _result_scope(self.base_url, self.api_key)
+        cached = None
+        if status.is_deployed:
+            cached = self._result_cache.get(workflow_id, status.deployed_at, input_data, scope)
+        if cached is not None and not loaded:
+            self._status_cache.invalidate(workflow_id)
+            try:
+                current = self.get_workflow_status(workflow_id)
+            except SimStudioError:
+                return self._send_execution(workflow_id, input_data, timeout, fields)
+            if not current.is_deployed or current.deployed_at != status.deployed_at:
+                cached, status = None, current
+        if cached is not None:
+            return cached
+        if not status.is_deployed:
+            return self._send_execution(workflow_id, input_data, timeout, fields)
+
+        result = self._send_execution(workflow_id, input_data, timeout, fields)
+        if fields is None:
+            self._result_cache.put(workflow_id, status.deployed_at, input_data, result, scope)
+        return result
+
+    def _send_execution(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]],
+        timeout: float,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> WorkflowExecutionResult:
+        """Execute through the resilience layers, keeping the status cache consistent."""
+        payload = self._encode_input(input_data)
+        try:
+            return self._resilient(
+                workflow_id,
+                timeout,
+                lambda remaining: self._execute(workflow_id, payload, remaining, fields)
+            )
+        except SimStudioError as e:
+            if self._status_cache is not None and e.code in _STALE_STATUS_ERROR_CODES:
+                self._status_cache.invalidate(workflow_id)
+            raise
+
+    def _encode_input(self, input_data: Optional[Dict[str, Any]]) -> bytes:
+        """
+        Encode workflow input once, before any attempt is made, so that input the codec
+        cannot serialize is neither retried nor counted against the workflow's circuit.
+        """
+        try:
+            return self._codec.dumps(input_data or {})
+        except (TypeError, ValueError) as e:
+            raise SimStudioError(
+                f'Failed to encode workflow input: {str(e)}', 'EXECUTION_ERROR'
+            ) from e
+
+    def _resilient(self, workflow_id: str, timeout: float, send: Callable[[float], T]) -> T:
+        """
+        Call ``send(timeout)`` through the retry policy, circuit breaker and rate limiter,
+        each if enabled. Every retry attempt passes the breaker and the limiter again.
         """
+        def attempt(remaining: float) -> T:
+            if self._rate_limiter is not None:
+                return self._rate_limiter.call(lambda: send(remaining))
+            return send(remaining)
+
+        def guarded(remaining: float) -> T:
+            if self._circuit_breaker is not None:
+                return self._circuit_breaker.call(workflow_id, lambda: attempt(remaining))
+            return attempt(remaining)
+
+        if self._retry is not None:
+            return self._retry.call(guarded, timeout)
+        return guarded(timeout)
+
+    def _execute(
+        self,
+        workflow_id: str,
+        payload: bytes,
+        timeout: float,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> WorkflowExecutionResult:
+        """Send a single execute request, reporting it to the client's hooks (if any)."""
+        if not self._hooks:
+            return self._send_request(workflow_id, payload, timeout, fields)
+
+        from .instrumentation import PhaseClock, RequestInfo, dispatch
+        url = f"{self.base_url}/api/workflows/{workflow_id}/execute"
+        info = RequestInfo(workflow_id, 'POST', url)
+        dispatch(self._hooks, 'on_request_start', info)
+        clock = PhaseClock()
+        try:
+            with clock:
+                result = self._send_request(workflow_id, payload, timeout, fields, clock)
+        except SimStudioError as e:
+            dispatch(self._hooks, 'on_error', info, e, clock.finish(), clock.status_code)
+            raise
+        dispatch(self._hooks, 'on_response', info, clock.status_code, clock.finish(result), result)
+        return result
+
+    def _send_request(
+        self,
+        workflow_id: str,
+        payload: bytes,
+        timeout: float,
+        fields: Optional[FrozenSet[str]] = None,
+        clock: Optional["PhaseClock"] = None
+    ) -> WorkflowExecutionResult:
+        """POST the execution and decode the response, timing each phase on ``clock``."""
         url = f"{self.base_url}/api/workflows/{workflow_id}/execute"
-        
+        stream = fields is not None or self._lazy_decoding
+
         try:
-            response = self._session.post(
+            response = self._transport.request(
+                'POST',
                 url,
-                json=input_data or {},
-                timeout=timeout
+                body=payload,
+                timeout=timeout,
+                # Instrumented requests read the body themselves to time the download.
+                stream=stream or clock is not None
             )
-            
+            if clock is not None:
+                clock.sent(response.status_code)
+
             if not response.ok:
-                try:
-                    error_data = response.json()
-                    error_message = error_data.get('error', f'HTTP {response.status_code}: {response.reason}')
-                    error_code = error_data.get('code')
-                except (ValueError, KeyError):
-                    error_message = f'HTTP {response.status_code}: {response.reason}'
-                    error_code = None
-                
-                raise SimStudioError(error_message, error_code, response.status_code)
-            
-            result_data = response.json()
-            
-            return WorkflowExecutionResult(
-                success=result_data['success'],
-                output=result_data.get('output'),
-                error=result_data.get('error'),
-                logs=result_data.get('logs'),
-                metadata=result_data.get('metadata'),
-                trace_spans=result_data.get('traceSpans'),
-                total_duration=result_data.get('totalDuration')
+                raise self._error_from(response)
+
+            if not stream:
+                body = response.content
+                if clock is not None:
+                    clock.timings.download = clock.lap()
+                result = _parse_execution_result(self._codec.loads(body))
+                if clock is not None:
+                    clock.timings.decode = clock.lap()
+                return result
+
+            from .decoding import LAZY_FIELDS, decode_execution_result
+            try:
+                result = decode_execution_result(
+                    response.iter_content(_STREAM_CHUNK_SIZE),
+                    fields,
+                    LAZY_FIELDS if self._lazy_decoding else frozenset(),
+                    self._codec
+                )
+            finally:
+                response.close()
+            if clock is not None:
+                clock.timings.download = clock.lap()
+            return result
+
+        except TransportTimeout as e:
+            raise SimStudioError(
+                f'Workflow execution timed out after {timeout} seconds', 'TIMEOUT'
+            ) from e
+        except (TransportError, ValueError) as e:
+            raise SimStudioError(f'Failed to execute workflow: {str(e)}', 'EXECUTION_ERROR') from e
+
+    def stream_workflow(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        timeout: float = 30.0
+    ) -> "WorkflowStream":
+        """
+        Execute a workflow, receiving the output of its streaming blocks as it is produced.
+
+        The execution is requested as server-sent events (``Accept: text/event-stream``),
+        so the first chunk arrives as soon as the first streaming block produces output
+        instead of when the whole run has finished.
+
+        Args:
+            workflow_id: The ID of the workflow to execute
+            input_data: Input data to pass to the workflow
+            timeout: Timeout in seconds for the response to start and for each wait
+                between events (default: 30.0). With ``retry``, it bounds all attempts
+                to start the stream.
+
+        Returns:
+            WorkflowStream yielding StreamChunk objects; its ``result`` holds the final
+            WorkflowExecutionResult once the stream has ended
+
+        Raises:
+            SimStudioError: If the execution cannot be started, or with code
+                ``CIRCUIT_OPEN`` while the workflow's circuit is open. Errors while
+                reading the stream are raised as SimStudioError from the iteration.
+            RateLimitError: If the rate limit is exceeded (after queueing, when rate limiting
+                is enabled)
+        """
+        from .streaming import WorkflowStream
+        payload = self._encode_input(input_data)
+        response = self._resilient(
+            workflow_id,
+            timeout,
+            lambda remaining: self._open_stream(workflow_id, payload, remaining)
+        )
+        return WorkflowStream(response, self._codec, timeout)
+
+    def _open_stream(
+        self,
+        workflow_id: str,
+        payload: bytes,
+        timeout: float
+    ) -> Response:
+        """POST a streamed execution, returning the response once its headers arrive."""
+        from .streaming import EVENT_STREAM
+        url = f"{self.base_url}/api/workflows/{workflow_id}/execute"
+
+        try:
+            response = self._transport.request(
+                'POST',
+                url,
+                body=payload,
+                headers={'Accept': EVENT_STREAM},
+                timeout=timeout,
+                stream=True
             )
-            
-        except requests.Timeout:
-            raise SimStudioError(f'Workflow execution timed out after {timeout} seconds', 'TIMEOUT')
-        except requests.RequestException as e:
-            raise SimStudioError(f'Failed to execute workflow: {str(e)}', 'EXECUTION_ERROR')
-    
+            if not response.ok:
+                raise self._error_from(response)
+            return response
+
+        except TransportTimeout as e:
+            raise SimStudioError(
+                f'Workflow execution timed out after {timeout} seconds', 'TIMEOUT'
+            ) from e
+        except TransportError as e:
+            raise SimStudioError(f'Failed to execute workflow: {str(e)}', 'EXECUTION_ERROR') from e
+
     def get_workflow_status(self, workflow_id: str) -> WorkflowStatus:
         """
         Get the status of a workflow (deployment status, etc.).
-        
+
         Args:
             workflow_id: The ID of the workflow
-            
+
         Returns:
             WorkflowStatus object containing the workflow status
-            
+
         Raises:
             SimStudioError: If getting the status fails
         """
+        if self._status_cache is not None:
+            return self._status_cache.get_or_load(
+                workflow_id, lambda: self._fetch_status(workflow_id)
+            )
+        return self._fetch_status(workflow_id)
+
+    def _fetch_status(self, workflow_id: str) -> WorkflowStatus:
+        """Request a workflow's status from the API."""
         url = f"{self.base_url}/api/workflows/{workflow_id}/status"
-        
+
         try:
-            response = self._session.get(url)
-            
+            response = self._get(url, 'status')
+
             if not response.ok:
-                try:
-                    error_data = response.json()
-                    error_message = error_data.get('error', f'HTTP {response.status_code}: {response.reason}')
-                    error_code = error_data.get('code')
-                except (ValueError, KeyError):
-                    error_message = f'HTTP {response.status_code}: {response.reason}'
-                    error_code = None
-                
-                raise SimStudioError(error_message, error_code, response.status_code)
-            
-            status_data = response.json()
-            
-            return WorkflowStatus(
-                is_deployed=status_data.get('isDeployed', False),
-                deployed_at=status_data.get('deployedAt'),
-                is_published=status_data.get('isPublished', False),
-                needs_redeployment=status_data.get('needsRedeployment', False)
-            )
-            
-        except requests.RequestException as e:
+                raise self._error_from(response)
+
+            return _parse_workflow_status(self._codec.loads(response.content))
+
+        except (TransportError, ValueError) as e:
             raise SimStudioError(f'Failed to get workflow status: {str(e)}', 'STATUS_ERROR')
-    
+
+    def _get(self, url: str, route: str, **kwargs: Any) -> Response:
+        """GET an idempotent resource, hedged by the client's HedgePolicy (if any)."""
+        if self._hedging is None:
+            return self._transport.request('GET', url, **kwargs)
+        return self._hedging.call(route, lambda: self._transport.request('GET', url, **kwargs))
+
     def validate_workflow(self, workflow_id: str) -> bool:
         """
         Validate that a workflow is ready for execution.
-        
+
         Args:
             workflow_id: The ID of the workflow
-            
+
         Returns:
             True if the workflow is deployed and ready, False otherwise
         """
@@ -175,65 +1064,602 @@ class SimStudioClient:
             return status.is_deployed
         except SimStudioError:
             return False
-    
-    def execute_workflow_sync(
+
+    def execute_many(
+        self,
+        items: Iterable[Tuple[str, Optional[Dict[str, Any]]]],
+        max_concurrency: int = 8,
+        ordered: bool = False,
+        timeout: float = 30.0
+    ) -> Iterator[Tuple[int, WorkflowExecutionResult]]:
+        """
+        Execute many workflows concurrently, yielding results as they finish.
+
+        Items are pulled from ``items`` lazily and at most ``max_concurrency`` executions
+        are in flight (or waiting to be yielded) at any time, so memory stays flat even
+        for very large generators. All workers share this client's connection pool.
+
+        A failing item does not abort the batch: it is yielded as a
+        WorkflowExecutionResult with ``success=False``, the error message in ``error``
+        and the SimStudioError ``code``/``status`` in ``metadata``.
+
+        Args:
+            items: Iterable of ``(workflow_id, input_data)`` pairs
+            max_concurrency: Maximum number of executions in flight (default: 8)
+            ordered: Yield results in input order instead of completion order
+            timeout: Timeout in seconds for each execution (default: 30.0)
+
+        Yields:
+            ``(index, result)`` tuples, where ``index`` is the item's position in ``items``
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+
+        self._ensure_pool_size(max_concurrency)
+        pending = iter(enumerate(items))
+        window: Deque[Tuple[int, Future]] = deque()
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='simstudio')
+
+        def submit(count: int) -> None:
+            for index, (workflow_id, input_data) in itertools.islice(pending, count):
+                future = executor.submit(self._execute_batch_item, workflow_id, input_data, timeout)
+                window.append((index, future))
+
+        try:
+            submit(max_concurrency)
+            while window:
+                if ordered:
+                    index, future = window.popleft()
+                    result = future.result()
+                    submit(1)
+                    yield index, result
+                    continue
+
+                done: Set[Future] = wait([f for _, f in window], return_when=FIRST_COMPLETED).done
+                finished = [(i, f) for i, f in window if f in done]
+                for entry in finished:
+                    window.remove(entry)
+                submit(len(finished))
+                for index, future in finished:
+                    yield index, future.result()
+        finally:
+            for _, future in window:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _execute_batch_item(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]],
+        timeout: float
+    ) -> WorkflowExecutionResult:
+        """Execute one execute_many item, turning failures into a failed result."""
+        try:
+            return self.execute_workflow(workflow_id, input_data, timeout)
+        except SimStudioError as e:
+            return WorkflowExecutionResult(
+                success=False,
+                error=str(e),
+                metadata={'code': e.code, 'status': e.status}
+            )
+        except Exception as e:
+            return WorkflowExecutionResult(
+                success=False,
+                error=str(e),
+                metadata={'code': 'EXECUTION_ERROR', 'status': None}
+            )
+
+    def _ensure_pool_size(self, size: int) -> None:
+        """
+        Grow the transport's per-host connection pool to hold at least ``size``
+        connections, unless the client was given an explicit PoolConfig.
+        """
+        with self._lock:
+            if not self._grow_pool or size <= self._pool.max_connections:
+                return
+            self._pool = replace(self._pool, max_connections=size)
+            self._transport.configure_pool(self._pool)
+
+    def pool_stats(self) -> PoolStats:
+        """
+        Get the transport's connection pool counters.
+
+        Returns:
+            PoolStats snapshot: connections created, reused, discarded and expired, requests
+            that waited for a connection, and connections in use (now and at peak)
+        """
+        return self._transport.pool_stats()
+
+    def endpoint_stats(self) -> List["EndpointStats"]:
+        """
+        Get the state and counters of each endpoint of a load-balanced client.
+
+        Returns:
+            One EndpointStats per base URL (state, requests in flight, requests, failures,
+            ejections, smoothed latency and traffic weight); empty for a single base URL
+        """
+        if self._balancer is None:
+            return []
+        return self._balancer.stats()
+
+    def submit_workflow(
         self,
         workflow_id: str,
         input_data: Optional[Dict[str, Any]] = None,
         timeout: float = 30.0
+    ) -> WorkflowJob:
+        """
+        Queue a workflow execution without waiting for it to finish.
+
+        The execution runs on the server in the background; use ``get_job_status`` or
+        ``wait_for_job`` to follow it.
+
+        Args:
+            workflow_id: The ID of the workflow to execute
+            input_data: Input data to pass to the workflow
+            timeout: Timeout for the submit request in seconds (default: 30.0)
+
+        Returns:
+            WorkflowJob handle for the queued execution
+
+        Raises:
+            SimStudioError: If the execution could not be queued
+        """
+        submitted = self._submit(workflow_id, input_data, timeout)
+        if not isinstance(submitted, WorkflowJob):
+            raise SimStudioError(
+                'Server executed the workflow synchronously instead of queueing it',
+                'ASYNC_NOT_SUPPORTED'
+            )
+        return submitted
+
+    def _submit(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]],
+        timeout: float
+    ) -> Union[WorkflowJob, WorkflowExecutionResult]:
+        """
+        POST an async-mode execution, returning a WorkflowJob or, if the server ran it
+        inline, the result.
+        """
+        payload = self._encode_input(input_data)
+        try:
+            return self._resilient(
+                workflow_id,
+                timeout,
+                lambda remaining: self._post_submit(workflow_id, payload, remaining)
+            )
+        except SimStudioError as e:
+            if self._status_cache is not None and e.code in _STALE_STATUS_ERROR_CODES:
+                self._status_cache.invalidate(workflow_id)
+            raise
+
+    def _post_submit(
+        self,
+        workflow_id: str,
+        payload: bytes,
+        timeout: float
+    ) -> Union[WorkflowJob, WorkflowExecutionResult]:
+        url = f"{self.base_url}/api/workflows/{workflow_id}/execute"
+
+        try:
+            response = self._transport.request(
+                'POST',
+                url,
+                body=payload,
+                headers={'X-Execution-Mode': 'async'},
+                timeout=timeout
+            )
+
+            if not response.ok:
+                raise self._error_from(response)
+
+            data = self._codec.loads(response.content)
+            if 'taskId' in data:
+                return _parse_job_submission(workflow_id, data)
+            return _parse_execution_result(data)
+
+        except TransportTimeout as e:
+            raise SimStudioError(
+                f'Workflow submission timed out after {timeout} seconds', 'TIMEOUT'
+            ) from e
+        except (TransportError, ValueError) as e:
+            raise SimStudioError(f'Failed to submit workflow: {str(e)}', 'EXECUTION_ERROR') from e
+
+    def get_job_status(self, task_id: str, timeout: float = 30.0) -> JobStatus:
+        """
+        Get the status of a queued workflow execution.
+
+        Args:
+            task_id: The task ID returned by ``submit_workflow``
+            timeout: Timeout for the request in seconds (default: 30.0)
+
+        Returns:
+            JobStatus object containing the job status
+
+        Raises:
+            SimStudioError: If getting the job status fails
+        """
+        url = f"{self.base_url}/api/jobs/{task_id}"
+
+        try:
+            response = self._get(url, 'job', timeout=timeout)
+
+            if not response.ok:
+                raise self._error_from(response)
+
+            return _parse_job_status(self._codec.loads(response.content))
+
+        except (TransportError, ValueError) as e:
+            raise SimStudioError(f'Failed to get job status: {str(e)}', 'JOB_STATUS_ERROR')
+
+    def wait_for_job(
+        self,
+        job: WorkflowJob,
+        timeout: float = 30.0,
+        max_wait: Optional[float] = 600.0
+    ) -> WorkflowExecutionResult:
+        """
+        Poll a queued workflow execution until it completes, fails or is cancelled.
+
+        Polls are spaced adaptively: quickly at first, then in proportion to how long the
+        job has been running, capped by the server's ``estimatedDuration``.
+
+        Args:
+            job: The WorkflowJob returned by ``submit_workflow``
+            timeout: Timeout for each status request in seconds (default: 30.0)
+            max_wait: Maximum total seconds to wait since submission (default: 600.0;
+                None waits without limit)
+
+        Returns:
+            WorkflowExecutionResult object containing the execution result
+
+        Raises:
+            SimStudioError: If polling fails or ``max_wait`` is exceeded
+        """
+        estimated_duration: Optional[float] = None
+
+        while True:
+            elapsed = time.monotonic() - job.submitted_at
+            delay = _next_poll_delay(elapsed, estimated_duration)
+            if max_wait is not None:
+                remaining = max_wait - elapsed
+                if remaining <= 0:
+                    raise SimStudioError(
+                        f'Workflow job {job.task_id} did not finish within {max_wait} seconds',
+                        'TIMEOUT'
+                    )
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+            status = self.get_job_status(job.task_id, timeout)
+            job.status = status.status
+            if status.is_final:
+                return _result_from_job(status)
+            estimated_duration = status.estimated_duration
+
+    def invalidate_workflow_status(self, workflow_id: Optional[str] = None) -> None:
+        """
+        Drop cached workflow statuses (no-op when the status cache is disabled).
+
+        Cached statuses are also dropped automatically when an execution fails because
+        the workflow is not deployed or not found.
+
+        Args:
+            workflow_id: The workflow to invalidate, or None to clear the whole cache
+        """
+        if self._status_cache is not None:
+            self._status_cache.invalidate(workflow_id)
+
+    @property
+    def job_tracker(self) -> "JobTracker":
+        """
+        Shared JobTracker that polls all of this client's queued executions from one scheduler.
+
+        Created on first access with default settings and closed together with the client.
+        """
+        with self._lock:
+            if self._job_tracker is None:
+                from .jobs import JobTracker
+                self._job_tracker = JobTracker(self)
+            return self._job_tracker
+
+    @property
+    def uploader(self) -> "FileUploader":
+        """
+        Shared FileUploader behind ``upload_file``.
+
+        Created on first access with default settings and closed together with the client.
+        """
+        with self._lock:
+            if self._uploader is None:
+                from .uploads import FileUploader
+                self._uploader = FileUploader(self)
+            return self._uploader
+
+    def upload_file(
+        self,
+        path: str,
+        name: Optional[str] = None,
+        content_type: Optional[str] = None,
+        timeout: float = 60.0
+    ) -> Dict[str, Any]:
+        """
+        Upload a local file for use as workflow input.
+
+        The file is sent straight from a memory map, in parallel parts when it is large,
+        so memory use stays flat whatever its size, and a file whose content was uploaded
+        before is not sent again. Pass the returned reference in ``input_data`` instead of
+        the file's content. See FileUploader for the details.
+
+        Args:
+            path: File to upload
+            name: File name shown in Sim (default: the file's base name)
+            content_type: MIME type (default: guessed from ``name``)
+            timeout: Timeout in seconds for each request (default: 60.0)
+
+        Returns:
+            The file reference (``id``, ``name``, ``url``, ``size``, ``type``, ``key``,
+            ``path``, ``uploadedAt``, ``sha256``)
+
+        Raises:
+            SimStudioError: If the upload fails
+            OSError: If the file cannot be read
+        """
+        return self.uploader.upload(path, name, content_type, timeout)
+
+    def execute_workflow_sync(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        timeout: float = 30.0,
+        max_wait: Optional[float] = 600.0
     ) -> WorkflowExecutionResult:
         """
         Execute a workflow and poll for completion (useful for long-running workflows).
-        
-        Note: Currently, the API is synchronous, so this method just calls execute_workflow.
-        In the future, if async execution is added, this method can be enhanced.
-        
+
+        The execution is queued with ``X-Execution-Mode: async`` and polled via
+        ``/api/jobs/{taskId}``, so no HTTP request is held open for the length of the run.
+        Falls back to a regular ``execute_workflow`` call if the server cannot queue
+        async executions.
+
         Args:
             workflow_id: The ID of the workflow to execute
             input_data: Input data to pass to the workflow
-            timeout: Timeout for the initial request in seconds
-            
+            timeout: Timeout for each individual request in seconds
+            max_wait: Maximum total seconds to wait for the execution (default: 600.0;
+                None waits without limit)
+
         Returns:
             WorkflowExecutionResult object containing the execution result
-            
+
         Raises:
             SimStudioError: If the workflow execution fails
         """
-        # For now, the API is synchronous, so we just execute directly
-        # In the future, if async execution is added, this method can be enhanced
-        return self.execute_workflow(workflow_id, input_data, timeout)
-    
+        try:
+            submitted = self._submit(workflow_id, input_data, timeout)
+        except SimStudioError as e:
+            if e.code != _ASYNC_QUEUE_UNAVAILABLE:
+                raise
+            return self.execute_workflow(workflow_id, input_data, timeout)
+
+        if isinstance(submitted, WorkflowJob):
+            return self.wait_for_job(submitted, timeout, max_wait)
+        return submitted
+
+    def iter_logs(
+        self,
+        workspace_id: str,
+        workflow_ids: Optional[Iterable[str]] = None,
+        folder_ids: Optional[Iterable[str]] = None,
+        triggers: Optional[Iterable[str]] = None,
+        level: Optional[str] = None,
+        start_date: Union[str, datetime, None] = None,
+        end_date: Union[str, datetime, None] = None,
+        search: Optional[str] = None,
+        details: str = 'basic',
+        page_size: int = 100,
+        prefetch: int = 4,
+        timeout: float = 30.0
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over a workspace's execution logs, newest first.
+
+        Pages of ``GET /api/logs`` are fetched ``prefetch`` at a time in the background
+        while the current page is consumed, so at most ``prefetch + 1`` pages are held in
+        memory. Without ``end_date``, the listing is pinned to the time of the call, so
+        executions logged during a long crawl do not shift the pages.
+
+        Args:
+            workspace_id: Workspace whose logs to list
+            workflow_ids: Only logs of these workflows
+            folder_ids: Only logs of workflows in these folders
+            triggers: Only logs of these trigger types (e.g. ``'api'``, ``'schedule'``)
+            level: Only logs of this level (``'info'`` or ``'error'``)
+            start_date: Only executions started at or after this time
+            end_date: Only executions started at or before this time (default: now)
+            search: Only executions whose ID contains this text
+            details: ``'basic'`` (default) or ``'full'``, which adds the execution ID,
+                files, cost breakdown and ``executionData`` with trace spans
+            page_size: Logs per request (default: 100)
+            prefetch: Pages requested ahead of the one being consumed (default: 4)
+            timeout: Timeout for each page request in seconds (default: 30.0)
+
+        Yields:
+            Log entries as returned by the API (dicts with ``id``, ``workflowId``,
+            ``level``, ``trigger``, ``createdAt``, ``duration``, ``workflow``, ``cost``, ...)
+
+        Raises:
+            SimStudioError: If a page cannot be fetched (code ``LOGS_ERROR`` for transport
+                failures)
+            ValueError: If ``page_size``/``prefetch`` is below 1 or ``details`` is unknown
+        """
+        if page_size < 1 or prefetch < 1:
+            raise ValueError('page_size and prefetch must be at least 1')
+        if details not in ('basic', 'full'):
+            raise ValueError("details must be 'basic' or 'full'")
+
+        query: Dict[str, Any] = {
+            'workspaceId': workspace_id,
+            'details': details,
+            'endDate': _format_log_date(end_date or datetime.now(timezone.utc)),
+        }
+        for name, values in (('workflowIds', workflow_ids), ('folderIds', folder_ids),
+                             ('triggers', triggers)):
+            if values is not None:
+                query[name] = ','.join(values)
+        if level is not None:
+            query['level'] = level
+        if start_date is not None:
+            query['startDate'] = _format_log_date(start_date)
+        if search is not None:
+            query['search'] = search
+
+        page = self._fetch_logs_page(query, 0, page_size, timeout)
+        offsets = iter(range(page_size, int(page.get('total') or 0), page_size))
+        self._ensure_pool_size(prefetch + 1)
+        window: Deque[Future] = deque()
+        executor = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix='simstudio-logs')
+
+        def submit(count: int) -> None:
+            for offset in itertools.islice(offsets, count):
+                window.append(
+                    executor.submit(self._fetch_logs_page, query, offset, page_size, timeout)
+                )
+
+        try:
+            submit(prefetch)
+            while True:
+                yield from page.get('data') or ()
+                if not window:
+                    return
+                page = window.popleft().result()
+                submit(1)
+        finally:
+            for future in window:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _fetch_logs_page(
+        self,
+        query: Dict[str, Any],
+        offset: int,
+        limit: int,
+        timeout: float
+    ) -> Dict[str, Any]:
+        url = f"{self.base_url}/api/logs?{urlencode(dict(query, limit=limit, offset=offset))}"
+
+        try:
+            response = self._get(url, 'logs', timeout=timeout)
+
+            if not response.ok:
+                raise self._error_from(response)
+
+            page: Dict[str, Any] = self._codec.loads(response.content)
+            return page
+
+        except (TransportError, ValueError) as e:
+            raise SimStudioError(f'Failed to get logs: {str(e)}', 'LOGS_ERROR') from e
+
+    def export_logs(
+        self,
+        path: str,
+        workspace_id: str,
+        batch_rows: int = 10_000,
+        compression: str = 'zstd',
+        **filters: Any
+    ) -> int:
+        """
+        Write a workspace's execution logs to a Parquet file.
+
+        Logs are streamed from ``iter_logs`` and written in row groups of ``batch_rows``,
+        so memory stays bounded however many logs are exported. See LogWriter for the
+        columns. Requires ``pyarrow`` (``pip install "simstudio-sdk[parquet]"``). If
+        fetching fails part-way, the file holds the row groups written until then.
+
+        Args:
+            path: Parquet file to create (overwritten if it exists)
+            workspace_id: Workspace whose logs to export
+            batch_rows: Rows per Parquet row group (default: 10000)
+            compression: Parquet compression codec (default: ``'zstd'``)
+            **filters: Further ``iter_logs`` arguments, e.g. ``start_date`` or
+                ``details='full'``
+
+        Returns:
+            Number of log rows written
+        """
+        from .logs import LogWriter
+
+        batch: List[Dict[str, Any]] = []
+        with LogWriter(path, compression) as writer:
+            for row in self.iter_logs(workspace_id, **filters):
+                batch.append(row)
+                if len(batch) >= batch_rows:
+                    writer.write(batch)
+                    batch = []
+            writer.write(batch)
+        return writer.rows_written
+
+    @staticmethod
+    def _error_from(response: Response) -> SimStudioError:
+        """Convert a failed HTTP response into a SimStudioError."""
+        try:
+            error_data = response.json()
+        except ValueError:
+            error_data = None
+        return _error_from_response(response.status_code, response.reason, error_data)
+
     def set_api_key(self, api_key: str) -> None:
         """
         Update the API key.
-        
+
         Args:
             api_key: New API key
         """
         self.api_key = api_key
-        self._session.headers.update({'X-API-Key': api_key})
-    
+        self._transport.headers['X-API-Key'] = api_key
+        self.invalidate_workflow_status()
+        if self._shared_rate_limit:
+            self._rate_limiter = _resolve_rate_limiter(api_key, True)
+
     def set_base_url(self, base_url: str) -> None:
         """
         Update the base URL.
-        
+
+        Requests then go to this URL only; a client created with several base URLs stops
+        balancing.
+
         Args:
             base_url: New base URL
         """
+        if self._balancer is not None:
+            from .balancer import _BalancedTransport
+            if isinstance(self._transport, _BalancedTransport):
+                self._transport = self._transport.transport
+            self._balancer.close()
+            self._balancer = None
         self.base_url = base_url.rstrip('/')
-    
+        self.invalidate_workflow_status()
+
     def close(self) -> None:
-        """Close the underlying HTTP session."""
-        self._session.close()
-    
+        """Close the underlying HTTP session and stop the job tracker and uploader, if any."""
+        if self._job_tracker is not None:
+            self._job_tracker.close()
+        if self._uploader is not None:
+            self._uploader.close()
+        if self._hedging is not None and self._owns_hedging:
+            self._hedging.close()
+        self._transport.close()
+
     def __enter__(self):
         """Context manager entry."""
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.close()
 
 
 # For backward compatibility
-Client = SimStudioClient 
\ No newline at end of file
+Client = SimStudioClient
@@ -0,0 +1,447 @@
+"""
+Columnar analytics over the trace spans of many workflow executions.
+
+Requires the optional ``numpy`` dependency (``pip install "simstudio-sdk[analytics]"``).
+"""
+
+import collections.abc
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from . import WorkflowExecutionResult
+
+_STORE_FORMAT = 1
+
+# Column name -> dtype. Strings are dictionary-encoded into int32 codes.
+_COLUMNS: Dict[str, str] = {
+    'execution': 'int64',
+    'workflow': 'int32',
+    'deployment': 'int32',
+    'block': 'int32',
+    'name': 'int32',
+    'type': 'int32',
+    'parent': 'int64',
+    'depth': 'int16',
+    'start': 'float64',
+    'duration': 'float64',
+    'tokens': 'float64',
+    'status': 'int8',
+    'critical': 'bool',
+}
+_DICTIONARIES = ('workflow', 'deployment', 'block', 'name', 'type')
+
+_STATUS_CODES = {'success': 1, 'error': 0}
+
+# Spans whose end is within this many seconds of the next span's start still chain.
+_CRITICAL_PATH_TOLERANCE = 0.001
+
+
+class _Dictionary:
+    """Maps strings to dense int codes."""
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: Optional[str]) -> int:
+        key = value or ''
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.values)
+            self.values.append(key)
+        return code
+
+    def get(self, value: str) -> Optional[int]:
+        return self.codes.get(value)
+
+
+def _timestamp(value: Any) -> float:
+    if not isinstance(value, str) or not value:
+        return float('nan')
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return float('nan')
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _tokens(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, dict):
+        total = value.get('total')
+        if isinstance(total, (int, float)):
+            return float(total)
+        counts = [value.get(k) for k in ('prompt', 'completion')]
+        parts = [float(v) for v in counts if isinstance(v, (int, float))]
+        if parts:
+            return sum(parts)
+    return float('nan')
+
+
+def _critical_path(blocks: List[Tuple[int, float, float]]) -> List[int]:
+    """
+    Rows of the spans on an execution's critical path.
+
+    Walks back from the span that ends last, each time to the latest-ending span that
+    finished before the current one started. ``blocks`` holds (row, start, end).
+    """
+    timed = sorted((b for b in blocks if b[1] == b[1] and b[2] == b[2]), key=lambda b: b[2])
+    path = []
+    boundary = float('inf')
+    index = len(timed) - 1
+    while index >= 0:
+        while index >= 0 and timed[index][2] > boundary + _CRITICAL_PATH_TOLERANCE:
+            index -= 1
+        if index < 0:
+            break
+        row, start, _ = timed[index]
+        path.append(row)
+        boundary = start
+        index -= 1
+    return path
+
+
+class TraceStore:
+    """
+    Compact columnar store of trace spans flattened from many executions.
+
+    Every span becomes one row of fixed-width NumPy columns: ``execution``, ``workflow``,
+    ``deployment``, ``block`` (block ID, or the span name for nested spans), ``name``,
+    ``type``, ``parent`` (row of the parent span, -1 for top-level spans), ``depth``,
+    ``start`` (epoch seconds), ``duration`` (ms), ``tokens``, ``status`` (1 success,
+    0 error, -1 unknown) and ``critical`` (top-level span on the execution's critical
+    path). Strings are dictionary-encoded, so a span costs about 60 bytes however large
+    its input and output were. Rows are buffered and packed into arrays every
+    ``chunk_size`` spans, so results can be streamed in without holding them.
+
+    Args:
+        chunk_size: Spans buffered before being packed into arrays (default: 65536)
+        max_depth: Deepest nesting level kept; 0 keeps only top-level block spans
+            (default: keep all)
+    """
+
+    def __init__(self, chunk_size: int = 65536, max_depth: Optional[int] = None):
+        if np is None:
+            raise ImportError(
+                'TraceStore requires numpy. '
+                'Install it with: pip install "simstudio-sdk[analytics]"'
+            )
+        self.chunk_size = chunk_size
+        self.max_depth = max_depth
+        self._dictionaries = {name: _Dictionary() for name in _DICTIONARIES}
+        self._chunks: Dict[str, List[Any]] = {name: [] for name in _COLUMNS}
+        self._buffer: Dict[str, List[Any]] = {name: [] for name in _COLUMNS}
+        self._rows = 0
+        self._executions = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def executions(self) -> int:
+        """Number of executions added."""
+        return self._executions
+
+    def add(
+        self,
+        result: Union["WorkflowExecutionResult", Sequence[Dict[str, Any]]],
+        workflow_id: Optional[str] = None,
+        deployment: Optional[str] = None,
+    ) -> None:
+        """
+        Add the trace spans of one execution.
+
+        Args:
+            result: A WorkflowExecutionResult, or its ``trace_spans`` list
+            workflow_id: Workflow the execution belongs to
+            deployment: Deployment the execution ran on (e.g. ``WorkflowStatus.deployed_at``)
+        """
+        spans = (
+            result if isinstance(result, collections.abc.Sequence)
+            else (result.trace_spans or [])
+        )
+        execution = self._executions
+        self._executions += 1
+        workflow = self._dictionaries['workflow'].code(workflow_id)
+        deployment_code = self._dictionaries['deployment'].code(deployment)
+        buffer = self._buffer
+        blocks_dictionary = self._dictionaries['block']
+        names = self._dictionaries['name']
+        types = self._dictionaries['type']
+
+        roots = [span for span in spans if isinstance(span, dict)]
+        # Some executions wrap every block in a single synthetic workflow span.
+        wrapped = len(roots) == 1 and roots[0].get('type') == 'workflow'
+        block_depth = 1 if wrapped else 0
+        top_level: List[Tuple[int, float, float]] = []
+
+        stack: List[Tuple[Dict[str, Any], int, int]] = [(span, 0, -1) for span in reversed(roots)]
+        while stack:
+            span, depth, parent = stack.pop()
+            if self.max_depth is not None and depth - block_depth > self.max_depth:
+                continue
+            row = self._rows
+            self._rows += 1
+            start = _timestamp(span.get('startTime'))
+            duration = span.get('duration')
+            duration = float(duration) if isinstance(duration, (int, float)) else float('nan')
+            name = span.get('name')
+            buffer['execution'].append(execution)
+            buffer['workflow'].append(workflow)
+            buffer['deployment'].append(deployment_code)
+            buffer['block'].append(blocks_dictionary.code(span.get('blockId') or name))
+            buffer['name'].append(names.code(name))
+            buffer['type'].append(types.code(span.get('type')))
+            buffer['parent'].append(parent)
+            buffer['depth'].append(depth)
+            buffer['start'].append(start)
+            buffer['duration'].append(duration)
+            buffer['tokens'].append(_tokens(span.get('tokens')))
+            status = span.get('status')
+            buffer['status'].append(_STATUS_CODES.get(status, -1) if status else -1)
+            buffer['critical'].append(False)
+            if depth == block_depth:
+                end = _timestamp(span.get('endTime'))
+                if end != end:
+                    end = start + duration / 1000.0
+                top_level.append((row, start, end))
+            children = span.get('children')
+            if children:
+                stack.extend(
+                    (child, depth + 1, row)
+                    for child in reversed(children) if isinstance(child, dict)
+                )
+
+        first_buffered = self._rows - len(buffer['critical'])
+        for row in _critical_path(top_level):
+            if row >= first_buffered:
+                buffer['critical'][row - first_buffered] = True
+            else:  # pragma: no cover - rows of one execution are flushed together
+                raise AssertionError('critical path row already packed')
+
+        if len(buffer['execution']) >= self.chunk_size:
+            self._flush()
+
+    def extend(
+        self,
+        results: Iterable[Union["WorkflowExecutionResult", Sequence[Dict[str, Any]]]],
+        workflow_id: Optional[str] = None,
+        deployment: Optional[str] = None,
+    ) -> None:
+        """Add many executions, e.g. streamed from ``execute_many`` or a log export."""
+        for result in results:
+            self.add(result, workflow_id, deployment)
+
+    def column(self, name: str) -> "np.ndarray":
+        """One column as an array (string columns as their int codes)."""
+        self._compact()
+        chunks = self._chunks[name]
+        return chunks[0] if chunks else np.empty(0, dtype=_COLUMNS[name])
+
+    def values(self, name: str) -> "np.ndarray":
+        """A dictionary-encoded column decoded to strings."""
+        lookup = np.array(self._dictionaries[name].values, dtype=str)
+        return lookup[self.column(name)] if len(lookup) else np.empty(0, dtype=str)
+
+    def block_stats(
+        self,
+        percentiles: Sequence[float] = (50, 95, 99),
+        by: str = 'block',
+        workflow_id: Optional[str] = None,
+        deployment: Optional[str] = None,
+        top_level_only: bool = False,
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Per-group duration statistics, computed without Python-level loops over spans.
+
+        Args:
+            percentiles: Duration percentiles to compute (default: 50, 95, 99)
+            by: Column to group by: ``block``, ``name`` or ``type`` (default: block)
+            workflow_id: Only include executions of this workflow
+            deployment: Only include executions of this deployment
+            top_level_only: Only include top-level block spans (not model/tool calls)
+
+        Returns:
+            Dict of equal-length arrays: the group key (named after ``by``), ``count``,
+            ``mean_ms``, ``p<q>_ms`` for each percentile, ``total_ms``, ``error_rate``,
+            ``tokens`` and ``critical_path_share`` (this group's share of the summed
+            duration of all critical-path spans), sorted by ``total_ms`` descending.
+        """
+        if by not in ('block', 'name', 'type'):
+            raise ValueError("by must be 'block', 'name' or 'type'")
+        mask = self._mask(workflow_id, deployment, top_level_only)
+        codes, stats = self._group_stats(self.column(by)[mask], mask, percentiles)
+        order = np.argsort(-stats['total_ms'], kind='stable')
+        lookup = np.array(self._dictionaries[by].values, dtype=str)
+        result = {by: lookup[codes[order]] if len(codes) else np.empty(0, dtype=str)}
+        result.update({key: value[order] for key, value in stats.items()})
+        return result
+
+    def compare_deployments(
+        self,
+        baseline: str,
+        candidate: str,
+        percentile: float = 50,
+        threshold: float = 0.2,
+        min_count: int = 5,
+        workflow_id: Optional[str] = None,
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Compare per-block duration percentiles between two deployments.
+
+        Args:
+            baseline: Deployment to compare against
+            candidate: Deployment being checked
+            percentile: Duration percentile to compare (default: 50)
+            threshold: Relative slowdown that counts as a regression (default: 0.2)
+            min_count: Minimum spans of a block in each deployment to flag it (default: 5)
+            workflow_id: Only include executions of this workflow
+
+        Returns:
+            Dict of equal-length arrays over blocks present in both deployments:
+            ``block``, ``baseline_ms``, ``candidate_ms``, ``change`` (relative),
+            ``baseline_count``, ``candidate_count`` and ``regressed``, sorted by
+            ``change`` descending.
+        """
+        key = f'p{percentile:g}_ms'
+        sides = []
+        for deployment in (baseline, candidate):
+            mask = self._mask(workflow_id, deployment, top_level_only=False)
+            sides.append(self._group_stats(self.column('block')[mask], mask, (percentile,)))
+        (base_codes, base), (cand_codes, cand) = sides
+        shared, base_index, cand_index = np.intersect1d(base_codes, cand_codes, return_indices=True)
+        base_ms, cand_ms = base[key][base_index], cand[key][cand_index]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.where(base_ms > 0, cand_ms / base_ms - 1.0, np.nan)
+        base_count, cand_count = base['count'][base_index], cand['count'][cand_index]
+        regressed = (change > threshold) & (base_count >= min_count) & (cand_count >= min_count)
+        order = np.argsort(-np.nan_to_num(change, nan=-np.inf), kind='stable')
+        lookup = np.array(self._dictionaries['block'].values, dtype=str)
+        return {
+            'block': lookup[shared[order]] if len(shared) else np.empty(0, dtype=str),
+            'baseline_ms': base_ms[order],
+            'candidate_ms': cand_ms[order],
+            'change': change[order],
+            'baseline_count': base_count[order],
+            'candidate_count': cand_count[order],
+            'regressed': regressed[order],
+        }
+
+    def save(self, path: str) -> None:
+        """Write the store to a compressed ``.npz`` file."""
+        self._compact()
+        arrays: Dict[str, Any] = {name: self.column(name) for name in _COLUMNS}
+        for name in _DICTIONARIES:
+            arrays[f'dictionary_{name}'] = np.array(self._dictionaries[name].values, dtype=str)
+        arrays['meta'] = np.array([_STORE_FORMAT, self._executions], dtype='int64')
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str, chunk_size: int = 65536) -> 'TraceStore':
+        """Read a store written by ``save``; more executions can then be added."""
+        store = cls(chunk_size=chunk_size)
+        with np.load(path, allow_pickle=False) as data:
+            version, executions = (int(v) for v in data['meta'])
+            if version != _STORE_FORMAT:
+                raise ValueError(f'Unsupported trace store format {version}')
+            for name in _COLUMNS:
+                store._chunks[name] = [data[name].astype(_COLUMNS[name], copy=False)]
+            for name in _DICTIONARIES:
+                store._dictionaries[name] = _Dictionary(str(v) for v in data[f'dictionary_{name}'])
+        store._rows = len(store._chunks['execution'][0])
+        store._executions = executions
+        return store
+
+    def _flush(self) -> None:
+        if not self._buffer['execution']:
+            return
+        for name, dtype in _COLUMNS.items():
+            self._chunks[name].append(np.array(self._buffer[name], dtype=dtype))
+            self._buffer[name] = []
+
+    def _compact(self) -> None:
+        """Pack buffered rows and merge chunks so each column is one array."""
+        self._flush()
+        for name, chunks in self._chunks.items():
+            if len(chunks) > 1:
+                self._chunks[name] = [np.concatenate(chunks)]
+
+    def _mask(
+        self,
+        workflow_id: Optional[str],
+        deployment: Optional[str],
+        top_level_only: bool,
+    ) -> "np.ndarray":
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in (('workflow', workflow_id), ('deployment', deployment)):
+            if value is not None:
+                code = self._dictionaries[name].get(value)
+                mask &= self.column(name) == (code if code is not None else -1)
+        if top_level_only:
+            depth = self.column('depth')
+            parent = self.column('parent')
+            # Top-level blocks sit at depth 0, or depth 1 under a synthetic workflow span.
+            wrapper = self._dictionaries['type'].get('workflow')
+            is_wrapper = self.column('type') == (wrapper if wrapper is not None else -1)
+            under_wrapper = np.zeros(len(self), dtype=bool)
+            has_parent = parent >= 0
+            under_wrapper[has_parent] = is_wrapper[parent[has_parent]]
+            mask &= ((depth == 0) & ~is_wrapper) | ((depth == 1) & under_wrapper)
+        return mask
+
+    def _group_stats(
+        self,
+        keys: "np.ndarray",
+        mask: "np.ndarray",
+        percentiles: Sequence[float],
+    ) -> Tuple["np.ndarray", Dict[str, "np.ndarray"]]:
+        duration = self.column('duration')[mask]
+        valid = ~np.isnan(duration)
+        keys, duration = keys[valid], duration[valid]
+        status = self.column('status')[mask][valid]
+        tokens = self.column('tokens')[mask][valid]
+        critical = self.column('critical')[mask][valid]
+
+        if not len(keys):
+            empty = np.empty(0)
+            stats = {'count': np.empty(0, dtype='int64'), 'mean_ms': empty}
+            stats.update({f'p{q:g}_ms': empty for q in percentiles})
+            stats.update({'total_ms': empty, 'error_rate': empty, 'tokens': empty,
+                          'critical_path_share': empty})
+            return np.empty(0, dtype='int32'), stats
+
+        order = np.lexsort((duration, keys))
+        keys, duration = keys[order], duration[order]
+        codes, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+
+        stats = {'count': counts, 'mean_ms': np.add.reduceat(duration, starts) / counts}
+        for q in percentiles:
+            position = q / 100.0 * (counts - 1)
+            lower = np.floor(position).astype('int64')
+            upper = np.ceil(position).astype('int64')
+            low, high = duration[starts + lower], duration[starts + upper]
+            stats[f'p{q:g}_ms'] = low + (high - low) * (position - lower)
+        total = np.add.reduceat(duration, starts)
+        critical_duration = np.where(critical[order], duration, 0.0)
+        critical_total = critical_duration.sum()
+        stats['total_ms'] = total
+        stats['error_rate'] = np.add.reduceat((status[order] == 0).astype('int64'), starts) / counts
+        stats['tokens'] = np.add.reduceat(np.nan_to_num(tokens[order]), starts)
+        stats['critical_path_share'] = (
+            np.add.reduceat(critical_duration, starts) / critical_total
+            if critical_total > 0 else np.zeros(len(codes))
+        )
+        return codes, stats
@@ -0,0 +1,629 @@
+"""
+Asyncio client for the Sim API.
+
+Requires the optional ``httpx`` dependency (``pip install "simstudio-sdk[async]"``).
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    httpx = None  # type: ignore[assignment]
+
+from . import (
+    _ASYNC_QUEUE_UNAVAILABLE,
+    JobStatus,
+    SimStudioError,
+    WorkflowExecutionResult,
+    WorkflowJob,
+    WorkflowStatus,
+    _error_from_response,
+    _next_poll_delay,
+    _parse_execution_result,
+    _parse_job_status,
+    _parse_job_submission,
+    _parse_workflow_status,
+    _resolve_circuit_breaker,
+    _resolve_codec,
+    _resolve_rate_limiter,
+    _resolve_retry_policy,
+    _result_from_job,
+)
+from .rate_limit import RateLimiter
+from .streaming import EVENT_STREAM, StreamChunk, _EventStream, _is_event_stream
+
+if TYPE_CHECKING:
+    from .codec import JSONCodec
+    from .retry import CircuitBreaker, RetryPolicy
+
+T = TypeVar('T')
+
+
+class AsyncSimStudioClient:
+    """
+    Asyncio Sim API client for executing workflows programmatically.
+
+    All requests share one bounded pool of keep-alive connections. Callers beyond
+    ``max_connections`` wait for a free connection instead of failing, so a single
+    event loop can keep many executions in flight at once.
+
+    Args:
+        api_key: Your Sim API key
+        base_url: Base URL for the Sim API (defaults to https://sim.ai)
+        max_connections: Maximum number of concurrent connections in the pool
+        max_keepalive_connections: Maximum number of idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept open before it is closed
+        rate_limit: Queue executions through a client-side RateLimiter instead of failing
+            on HTTP 429 (see SimStudioClient). Disabled by default.
+        transport: Optional httpx transport, mainly useful for testing
+        codec: JSONCodec for request and response bodies (see SimStudioClient)
+        retry: Retry executions that cannot have run the workflow (see SimStudioClient).
+            Disabled by default.
+        circuit_breaker: Fail executions of a failing workflow fast (see
+            SimStudioClient). Disabled by default.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://sim.ai",
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        rate_limit: Union[bool, RateLimiter] = False,
+        transport: Optional[Any] = None,
+        codec: Optional["JSONCodec"] = None,
+        retry: Union[bool, "RetryPolicy"] = False,
+        circuit_breaker: Union[bool, "CircuitBreaker"] = False,
+    ):
+        if httpx is None:
+            raise ImportError(
+                'AsyncSimStudioClient requires httpx. '
+                'Install it with: pip install "simstudio-sdk[async]"'
+            )
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self._shared_rate_limit = rate_limit is True
+        self._rate_limiter = _resolve_rate_limiter(api_key, rate_limit)
+        self._retry = _resolve_retry_policy(retry)
+        self._circuit_breaker = _resolve_circuit_breaker(circuit_breaker)
+        self._codec = _resolve_codec(codec)
+        self._client = httpx.AsyncClient(
+            headers={
+                'X-API-Key': self.api_key,
+                'Content-Type': 'application/json',
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            transport=transport,
+        )
+
+    async def execute_workflow(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        timeout: float = 30.0
+    ) -> WorkflowExecutionResult:
+        """
+        Execute a workflow with optional input data.
+
+        Args:
+            workflow_id: The ID of the workflow to execute
+            input_data: Input data to pass to the workflow
+            timeout: Timeout in seconds (default: 30.0). Time spent waiting for a
+                free pooled connection does not count towards it. With ``retry``, it
+                bounds all attempts and the backoff between them.
+
+        Returns:
+            WorkflowExecutionResult object containing the execution result
+
+        Raises:
+            SimStudioError: If the workflow execution fails, or with code ``CIRCUIT_OPEN``
+                while the workflow's circuit is open
+            RateLimitError: If the rate limit is exceeded (after queueing, when rate limiting
+                is enabled)
+        """
+        payload = self._encode_input(input_data)
+        return await self._resilient(
+            workflow_id,
+            timeout,
+            lambda remaining: self._execute(workflow_id, payload, remaining)
+        )
+
+    def _encode_input(self, input_data: Optional[Dict[str, Any]]) -> bytes:
+        """Encode workflow input once, before any attempt (see SimStudioClient)."""
+        try:
+            return self._codec.dumps(input_data or {})
+        except (TypeError, ValueError) as e:
+            raise SimStudioError(
+                f'Failed to encode workflow input: {str(e)}', 'EXECUTION_ERROR'
+            ) from e
+
+    async def _resilient(
+        self,
+        workflow_id: str,
+        timeout: float,
+        send: Callable[[float], Awaitable[T]]
+    ) -> T:
+        """Await ``send(timeout)`` through the retry policy, circuit breaker and rate limiter."""
+        async def attempt(remaining: float) -> T:
+            if self._rate_limiter is not None:
+                return await self._rate_limiter.call_async(lambda: send(remaining))
+            return await send(remaining)
+
+        async def guarded(remaining: float) -> T:
+            if self._circuit_breaker is not None:
+                return await self._circuit_breaker.call_async(
+                    workflow_id, lambda: attempt(remaining)
+                )
+            return await attempt(remaining)
+
+        if self._retry is not None:
+            return await self._retry.call_async(guarded, timeout)
+        return await guarded(timeout)
+
+    async def _execute(
+        self,
+        workflow_id: str,
+        payload: bytes,
+        timeout: float
+    ) -> WorkflowExecutionResult:
+        """Send a single execute request."""
+        url = f"{self.base_url}/api/workflows/{workflow_id}/execute"
+
+        try:
+            response = await self._client.post(
+                url,
+                content=payload,
+                timeout=httpx.Timeout(timeout, pool=None),
+            )
+
+            if not response.is_success:
+                raise self._error_from(response)
+
+            return _parse_execution_result(self._codec.loads(response.content))
+
+        except httpx.TimeoutException as e:
+            raise SimStudioError(
+                f'Workflow execution timed out after {timeout} seconds', 'TIMEOUT'
+            ) from e
+        except (httpx.HTTPError, ValueError) as e:
+            raise SimStudioError(f'Failed to execute workflow: {str(e)}', 'EXECUTION_ERROR') from e
+
+    async def stream_workflow(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        timeout: float = 30.0
+    ) -> "AsyncWorkflowStream":
+        """
+        Execute a workflow, receiving the output of its streaming blocks as it is produced.
+
+        Mirrors SimStudioClient.stream_workflow; iterate the result with ``async for``.
+
+        Args:
+            workflow_id: The ID of the workflow to execute
+            input_data: Input data to pass to the workflow
+            timeout: Timeout in seconds for the response to start and for each wait
+                between events (default: 30.0)
+
+        Returns:
+            AsyncWorkflowStream yielding StreamChunk objects
+
+        Raises:
+            SimStudioError: If the execution cannot be started, or with code
+                ``CIRCUIT_OPEN`` while the workflow's circuit is open
+            RateLimitError: If the rate limit is exceeded (after queueing, when rate limiting
+                is enabled)
+        """
+        payload = self._encode_input(input_data)
+        return await self._resilient(
+            workflow_id,
+            timeout,
+            lambda remaining: self._open_stream(workflow_id, payload, remaining)
+        )
+
+    async def _open_stream(
+        self,
+        workflow_id: str,
+        payload: bytes,
+        timeout: float
+    ) -> "AsyncWorkflowStream":
+        url = f"{self.base_url}/api/workflows/{workflow_id}/execute"
+        request = self._client.build_request(
+            'POST',
+            url,
+            content=payload,
+            headers={'Accept': EVENT_STREAM},
+            timeout=httpx.Timeout(timeout, pool=None),
+        )
+
+        try:
+            response = await self._client.send(request, stream=True)
+            if not response.is_success:
+                try:
+                    await response.aread()
+                finally:
+                    await response.aclose()
+                raise self._error_from(response)
+
+        except httpx.TimeoutException as e:
+            raise SimStudioError(
+                f'Workflow execution timed out after {timeout} seconds', 'TIMEOUT'
+            ) from e
+        except (httpx.HTTPError, ValueError) as e:
+            raise SimStudioError(f'Failed to execute workflow: {str(e)}', 'EXECUTION_ERROR') from e
+
+        stream = AsyncWorkflowStream(response, self._codec, timeout)
+        if not stream._streamed:
+            await stream._buffer()
+        return stream
+
+    async def get_workflow_status(self, workflow_id: str, timeout: float = 30.0) -> WorkflowStatus:
+        """
+        Get the status of a workflow (deployment status, etc.).
+
+        Args:
+            workflow_id: The ID of the workflow
+            timeout: Timeout for the request in seconds (default: 30.0)
+
+        Returns:
+            WorkflowStatus object containing the workflow status
+
+        Raises:
+            SimStudioError: If getting the status fails
+        """
+        url = f"{self.base_url}/api/workflows/{workflow_id}/status"
+
+        try:
+            response = await self._client.get(url, timeout=httpx.Timeout(timeout, pool=None))
+
+            if not response.is_success:
+                raise self._error_from(response)
+
+            return _parse_workflow_status(self._codec.loads(response.content))
+
+        except (httpx.HTTPError, ValueError) as e:
+            raise SimStudioError(f'Failed to get workflow status: {str(e)}', 'STATUS_ERROR')
+
+    async def validate_workflow(self, workflow_id: str, timeout: float = 30.0) -> bool:
+        """
+        Validate that a workflow is ready for execution.
+
+        Args:
+            workflow_id: The ID of the workflow
+            timeout: Timeout for the request in seconds (default: 30.0)
+
+        Returns:
+            True if the workflow is deployed and ready, False otherwise
+        """
+        try:
+            status = await self.get_workflow_status(workflow_id, timeout)
+            return status.is_deployed
+        except SimStudioError:
+            return False
+
+    async def submit_workflow(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        timeout: float = 30.0
+    ) -> WorkflowJob:
+        """
+        Queue a workflow execution without waiting for it to finish.
+
+        Mirrors SimStudioClient.submit_workflow.
+
+        Args:
+            workflow_id: The ID of the workflow to execute
+            input_data: Input data to pass to the workflow
+            timeout: Timeout for the submit request in seconds (default: 30.0)
+
+        Returns:
+            WorkflowJob handle for the queued execution
+
+        Raises:
+            SimStudioError: If the execution could not be queued
+        """
+        submitted = await self._submit(workflow_id, input_data, timeout)
+        if not isinstance(submitted, WorkflowJob):
+            raise SimStudioError(
+                'Server executed the workflow synchronously instead of queueing it',
+                'ASYNC_NOT_SUPPORTED'
+            )
+        return submitted
+
+    async def _submit(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]],
+        timeout: float
+    ) -> Union[WorkflowJob, WorkflowExecutionResult]:
+        """
+        POST an async-mode execution, returning a WorkflowJob or, if the server ran it
+        inline, the result.
+        """
+        payload = self._encode_input(input_data)
+        return await self._resilient(
+            workflow_id,
+            timeout,
+            lambda remaining: self._post_submit(workflow_id, payload, remaining)
+        )
+
+    async def _post_submit(
+        self,
+        workflow_id: str,
+        payload: bytes,
+        timeout: float
+    ) -> Union[WorkflowJob, WorkflowExecutionResult]:
+        url = f"{self.base_url}/api/workflows/{workflow_id}/execute"
+
+        try:
+            response = await self._client.post(
+                url,
+                content=payload,
+                headers={'X-Execution-Mode': 'async'},
+                timeout=httpx.Timeout(timeout, pool=None),
+            )
+
+            if not response.is_success:
+                raise self._error_from(response)
+
+            data = self._codec.loads(response.content)
+            if 'taskId' in data:
+                return _parse_job_submission(workflow_id, data)
+            return _parse_execution_result(data)
+
+        except httpx.TimeoutException as e:
+            raise SimStudioError(
+                f'Workflow submission timed out after {timeout} seconds', 'TIMEOUT'
+            ) from e
+        except (httpx.HTTPError, ValueError) as e:
+            raise SimStudioError(f'Failed to submit workflow: {str(e)}', 'EXECUTION_ERROR') from e
+
+    async def get_job_status(self, task_id: str, timeout: float = 30.0) -> JobStatus:
+        """
+        Get the status of a queued workflow execution.
+
+        Args:
+            task_id: The task ID returned by ``submit_workflow``
+            timeout: Timeout for the request in seconds (default: 30.0)
+
+        Returns:
+            JobStatus object containing the job status
+
+        Raises:
+            SimStudioError: If getting the job status fails
+        """
+        url = f"{self.base_url}/api/jobs/{task_id}"
+
+        try:
+            response = await self._client.get(url, timeout=httpx.Timeout(timeout, pool=None))
+
+            if not response.is_success:
+                raise self._error_from(response)
+
+            return _parse_job_status(self._codec.loads(response.content))
+
+        except (httpx.HTTPError, ValueError) as e:
+            raise SimStudioError(f'Failed to get job status: {str(e)}', 'JOB_STATUS_ERROR')
+
+    async def wait_for_job(
+        self,
+        job: WorkflowJob,
+        timeout: float = 30.0,
+        max_wait: Optional[float] = 600.0
+    ) -> WorkflowExecutionResult:
+        """
+        Poll a queued workflow execution until it completes, fails or is cancelled.
+
+        Mirrors SimStudioClient.wait_for_job.
+
+        Args:
+            job: The WorkflowJob returned by ``submit_workflow``
+            timeout: Timeout for each status request in seconds (default: 30.0)
+            max_wait: Maximum total seconds to wait since submission (default: 600.0;
+                None waits without limit)
+
+        Returns:
+            WorkflowExecutionResult object containing the execution result
+
+        Raises:
+            SimStudioError: If polling fails or ``max_wait`` is exceeded
+        """
+        estimated_duration: Optional[float] = None
+
+        while True:
+            elapsed = time.monotonic() - job.submitted_at
+            delay = _next_poll_delay(elapsed, estimated_duration)
+            if max_wait is not None:
+                remaining = max_wait - elapsed
+                if remaining <= 0:
+                    raise SimStudioError(
+                        f'Workflow job {job.task_id} did not finish within {max_wait} seconds',
+                        'TIMEOUT'
+                    )
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+
+            status = await self.get_job_status(job.task_id, timeout)
+            job.status = status.status
+            if status.is_final:
+                return _result_from_job(status)
+            estimated_duration = status.estimated_duration
+
+    async def execute_workflow_sync(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        timeout: float = 30.0,
+        max_wait: Optional[float] = 600.0
+    ) -> WorkflowExecutionResult:
+        """
+        Execute a workflow and poll for completion (useful for long-running workflows).
+
+        Mirrors SimStudioClient.execute_workflow_sync.
+
+        Args:
+            workflow_id: The ID of the workflow to execute
+            input_data: Input data to pass to the workflow
+            timeout: Timeout for each individual request in seconds
+            max_wait: Maximum total seconds to wait for the execution (default: 600.0;
+                None waits without limit)
+
+        Returns:
+            WorkflowExecutionResult object containing the execution result
+
+        Raises:
+            SimStudioError: If the workflow execution fails
+        """
+        try:
+            submitted = await self._submit(workflow_id, input_data, timeout)
+        except SimStudioError as e:
+            if e.code != _ASYNC_QUEUE_UNAVAILABLE:
+                raise
+            return await self.execute_workflow(workflow_id, input_data, timeout)
+
+        if isinstance(submitted, WorkflowJob):
+            return await self.wait_for_job(submitted, timeout, max_wait)
+        return submitted
+
+    @staticmethod
+    def _error_from(response: "httpx.Response") -> SimStudioError:
+        """Convert a failed HTTP response into a SimStudioError."""
+        try:
+            error_data = response.json()
+        except ValueError:
+            error_data = None
+        return _error_from_response(response.status_code, response.reason_phrase, error_data)
+
+    def set_api_key(self, api_key: str) -> None:
+        """
+        Update the API key.
+
+        Args:
+            api_key: New API key
+        """
+        self.api_key = api_key
+        self._client.headers['X-API-Key'] = api_key
+        if self._shared_rate_limit:
+            self._rate_limiter = _resolve_rate_limiter(api_key, True)
+
+    def set_base_url(self, base_url: str) -> None:
+        """
+        Update the base URL.
+
+        Args:
+            base_url: New base URL
+        """
+        self.base_url = base_url.rstrip('/')
+
+    async def close(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncSimStudioClient":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit."""
+        await self.close()
+
+
+class AsyncWorkflowStream(_EventStream):
+    """
+    Output of a workflow execution, yielded chunk by chunk with ``async for``.
+
+    Returned by ``AsyncSimStudioClient.stream_workflow``; behaves like WorkflowStream.
+
+    Attributes:
+        result: The final WorkflowExecutionResult, None until the stream has ended
+    """
+
+    def __init__(self, response: "httpx.Response", codec: "JSONCodec", timeout: float):
+        super().__init__(codec, timeout)
+        self._response = response
+        self._streamed = _is_event_stream(response.headers.get('Content-Type'))
+        self._received = response.aiter_bytes()
+        self._pending: Deque[StreamChunk] = deque()
+
+    def __aiter__(self) -> AsyncIterator[StreamChunk]:
+        return self
+
+    async def __anext__(self) -> StreamChunk:
+        while not self._pending:
+            if not self._streamed or self._response.is_closed:
+                raise StopAsyncIteration
+            data = await self._read(self._received.__anext__)
+            if data is None:
+                await self.aclose()
+                self._check_finished()
+                raise StopAsyncIteration
+            try:
+                self._pending.extend(self._chunks(data))
+            except ValueError as e:
+                await self.aclose()
+                raise SimStudioError(f'Workflow stream failed: {str(e)}', 'EXECUTION_ERROR') from e
+            except BaseException:
+                await self.aclose()
+                raise
+        return self._pending.popleft()
+
+    async def finish(self) -> WorkflowExecutionResult:
+        """Read the rest of the stream, discarding its chunks, and return the final result."""
+        async for _ in self:
+            pass
+        self._check_finished()
+        return self.result  # type: ignore[return-value]
+
+    async def aclose(self) -> None:
+        """Stop reading and release the connection."""
+        await self._response.aclose()
+
+    async def __aenter__(self) -> "AsyncWorkflowStream":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.aclose()
+
+    async def _buffer(self) -> None:
+        """Take the result of a server that answered with one JSON body instead of events."""
+        content = await self._read(self._response.aread)
+        try:
+            self._buffered(content or b'')
+        except ValueError as e:
+            raise SimStudioError(f'Workflow stream failed: {str(e)}', 'EXECUTION_ERROR') from e
+        finally:
+            await self.aclose()
+
+    async def _read(self, step: Callable[[], Awaitable[T]]) -> Optional[T]:
+        """Await a read, returning None at the end of the body."""
+        try:
+            return await step()
+        except StopAsyncIteration:
+            return None
+        except httpx.TimeoutException as e:
+            await self.aclose()
+            raise self._timed_out() from e
+        except (httpx.HTTPError, ValueError) as e:
+            await self.aclose()
+            raise SimStudioError(f'Workflow stream failed: {str(e)}', 'EXECUTION_ERROR') from e
@@ -0,0 +1,352 @@
+"""
+Client-side load balancing over several Sim replicas.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+from .transport import PoolConfig, PoolStats, Response, Transport, TransportError
+
+# Answers that say the replica itself is unwell, as opposed to the workflow or the request.
+_UNHEALTHY_STATUSES = frozenset([502, 503, 504])
+# Share of its traffic a readmitted endpoint starts with.
+_MIN_WEIGHT = 0.1
+# Latency assumed for an endpoint without samples, so new endpoints are tried early.
+_UNKNOWN_LATENCY = 0.001
+
+
+@dataclass
+class EndpointStats:
+    """
+    Counters and state of one load-balanced endpoint.
+
+    Attributes:
+        url: Base URL of the endpoint
+        state: ``'healthy'``, ``'ejected'`` or ``'warming'`` (readmitted, still ramping up)
+        in_flight: Requests currently outstanding
+        requests: Requests routed to the endpoint
+        failures: Requests and health checks that failed (transport errors, timeouts,
+            502/503/504 answers)
+        ejections: Times the endpoint was ejected
+        latency: Smoothed response time in seconds (None before the first response)
+        weight: Share of its full traffic the endpoint currently gets (1.0 when healthy)
+    """
+
+    url: str
+    state: str
+    in_flight: int
+    requests: int
+    failures: int
+    ejections: int
+    latency: Optional[float]
+    weight: float
+
+
+class _Endpoint:
+    """Balancer state of one replica."""
+
+    __slots__ = ('url', 'in_flight', 'requests', 'failures', 'consecutive_failures', 'ejections',
+                 'streak', 'ejected_until', 'warm_from', 'latency')
+
+    def __init__(self, url: str):
+        self.url = url
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        # Ejections in a row without a full recovery in between; doubles the ejection time.
+        self.streak = 0
+        self.ejected_until: Optional[float] = None
+        self.warm_from: Optional[float] = None
+        self.latency: Optional[float] = None
+
+
+class LoadBalancer:
+    """
+    Routes a client's requests over several Sim replicas.
+
+    Each request goes to the available endpoint with the lowest
+    ``(in_flight + 1) * latency`` score, where ``latency`` is a moving average of its
+    recent response times, so slow or busy replicas get proportionally less traffic.
+
+    Passive checks: transport errors, timeouts and 502/503/504 answers count as failures
+    (other errors, such as a failing workflow, say nothing about the replica). After
+    ``failure_threshold`` failures in a row an endpoint is ejected for
+    ``ejection_time``, doubled for every further ejection before it fully recovers, up
+    to ``max_ejection_time``. Once that time has passed it gets traffic again. With
+    ``health_check_workflow``, a background thread also requests
+    ``/api/workflows/{id}/status`` from every endpoint each ``health_check_interval``;
+    failed checks count like failed requests, and an ejected endpoint only returns after
+    a check succeeds.
+
+    Returning endpoints warm up: their share of traffic grows from 10% to 100% over
+    ``slow_start`` seconds. If every endpoint is ejected, the one due back first is used
+    rather than failing the request.
+
+    A LoadBalancer serves one client, which closes it.
+
+    Args:
+        endpoints: Base URLs of the replicas
+        failure_threshold: Failures in a row that eject an endpoint (default: 3)
+        ejection_time: Seconds of the first ejection (default: 10.0)
+        max_ejection_time: Longest ejection in seconds (default: 300.0)
+        slow_start: Seconds over which a returning endpoint ramps up (default: 30.0)
+        health_check_workflow: Workflow whose status is requested by active health
+            checks (default: passive checks only)
+        health_check_interval: Seconds between active health checks (default: 10.0)
+        latency_decay: Weight of each new response time in the moving average
+            (default: 0.2)
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[str],
+        failure_threshold: int = 3,
+        ejection_time: float = 10.0,
+        max_ejection_time: float = 300.0,
+        slow_start: float = 30.0,
+        health_check_workflow: Optional[str] = None,
+        health_check_interval: float = 10.0,
+        latency_decay: float = 0.2,
+    ):
+        if isinstance(endpoints, str) or not endpoints:
+            raise ValueError('endpoints must be a non-empty list of base URLs')
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be at least 1')
+        if not 0 < latency_decay <= 1:
+            raise ValueError('latency_decay must be in (0, 1]')
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.slow_start = slow_start
+        self.health_check_workflow = health_check_workflow
+        self.health_check_interval = health_check_interval
+        self.latency_decay = latency_decay
+        self._endpoints = [_Endpoint(url.rstrip('/')) for url in endpoints]
+        self._lock = threading.Lock()
+        self._transport: Optional[Transport] = None
+        self._stop = threading.Event()
+        self._checker: Optional[threading.Thread] = None
+
+    @property
+    def endpoints(self) -> List[str]:
+        """Base URLs of the endpoints."""
+        return [endpoint.url for endpoint in self._endpoints]
+
+    def stats(self) -> List[EndpointStats]:
+        """Current state and counters of every endpoint."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                EndpointStats(
+                    url=endpoint.url,
+                    state=self._state(endpoint, now),
+                    in_flight=endpoint.in_flight,
+                    requests=endpoint.requests,
+                    failures=endpoint.failures,
+                    ejections=endpoint.ejections,
+                    latency=endpoint.latency,
+                    weight=self._weight(endpoint, now),
+                )
+                for endpoint in self._endpoints
+            ]
+
+    def _bind(self, transport: Transport, base_url: str) -> Transport:
+        """
+        Wrap a client's transport so requests to ``base_url`` are balanced over the endpoints.
+
+        Active health checks start now and are sent through the same transport, with its
+        headers.
+        """
+        with self._lock:
+            if self._transport is not None:
+                raise RuntimeError('A LoadBalancer can only serve one client')
+            self._transport = transport
+        if self.health_check_workflow is not None:
+            self._checker = threading.Thread(
+                target=self._check_loop, name='simstudio-health-checks', daemon=True
+            )
+            self._checker.start()
+        return _BalancedTransport(transport, self, base_url.rstrip('/'))
+
+    def close(self) -> None:
+        """Stop the health checks."""
+        self._stop.set()
+        checker = self._checker
+        if checker is not None and checker is not threading.current_thread():
+            checker.join()
+
+    def _acquire(self) -> _Endpoint:
+        """Pick the endpoint for a request and count it as in flight."""
+        now = time.monotonic()
+        with self._lock:
+            available = [e for e in self._endpoints if self._available(e, now)]
+            if available:
+                endpoint = min(available, key=lambda e: (self._score(e, now), random.random()))
+            else:
+                endpoint = min(self._endpoints, key=lambda e: e.ejected_until or 0.0)
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _finish(self, endpoint: _Endpoint) -> None:
+        with self._lock:
+            endpoint.in_flight -= 1
+
+    def _record(self, endpoint: _Endpoint, failed: bool, elapsed: Optional[float] = None) -> None:
+        """Count a response or health check, ejecting or readmitting the endpoint."""
+        now = time.monotonic()
+        with self._lock:
+            if failed:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if elapsed is not None:
+                    # Failing fast must not make an endpoint look fast and attract more traffic.
+                    endpoint.latency = 2 * max(endpoint.latency or _UNKNOWN_LATENCY, elapsed)
+                if endpoint.consecutive_failures >= self.failure_threshold and (
+                    endpoint.ejected_until is None or now >= endpoint.ejected_until
+                ):
+                    self._eject(endpoint, now)
+                return
+            endpoint.consecutive_failures = 0
+            if elapsed is not None:
+                previous = endpoint.latency
+                endpoint.latency = elapsed if previous is None else (
+                    previous + self.latency_decay * (elapsed - previous)
+                )
+            if endpoint.ejected_until is not None and now >= endpoint.ejected_until:
+                # Passively, traffic resumed (and the ramp started) when the ejection ended.
+                endpoint.warm_from = (
+                    now if self.health_check_workflow is not None else endpoint.ejected_until
+                )
+                endpoint.ejected_until = None
+            elif endpoint.warm_from is not None and now - endpoint.warm_from >= self.slow_start:
+                endpoint.warm_from = None
+                endpoint.streak = 0
+
+    def _eject(self, endpoint: _Endpoint, now: float) -> None:
+        duration = min(self.max_ejection_time, self.ejection_time * 2 ** endpoint.streak)
+        endpoint.ejected_until = now + duration
+        endpoint.warm_from = None
+        endpoint.ejections += 1
+        endpoint.streak += 1
+
+    def _available(self, endpoint: _Endpoint, now: float) -> bool:
+        if endpoint.ejected_until is None:
+            return True
+        # With active checks, a successful check has to readmit the endpoint.
+        return self.health_check_workflow is None and now >= endpoint.ejected_until
+
+    def _weight(self, endpoint: _Endpoint, now: float) -> float:
+        if endpoint.ejected_until is not None:
+            if not self._available(endpoint, now):
+                return 0.0
+            started = endpoint.ejected_until
+        elif endpoint.warm_from is not None:
+            started = endpoint.warm_from
+        else:
+            return 1.0
+        if self.slow_start <= 0:
+            return 1.0
+        return min(1.0, max(_MIN_WEIGHT, (now - started) / self.slow_start))
+
+    def _score(self, endpoint: _Endpoint, now: float) -> float:
+        latency = endpoint.latency if endpoint.latency is not None else _UNKNOWN_LATENCY
+        return (endpoint.in_flight + 1) * latency / self._weight(endpoint, now)
+
+    def _state(self, endpoint: _Endpoint, now: float) -> str:
+        if endpoint.ejected_until is not None and not self._available(endpoint, now):
+            return 'ejected'
+        return 'healthy' if self._weight(endpoint, now) >= 1.0 else 'warming'
+
+    def _check_loop(self) -> None:
+        while not self._stop.wait(self.health_check_interval):
+            for endpoint in self._endpoints:
+                if self._stop.is_set():
+                    return
+                self._check(endpoint)
+
+    def _check(self, endpoint: _Endpoint) -> None:
+        """Request the health check workflow's status from one endpoint."""
+        transport = self._transport
+        if transport is None:
+            return
+        url = f'{endpoint.url}/api/workflows/{self.health_check_workflow}/status'
+        try:
+            response = transport.request(
+                'GET', url, timeout=max(1.0, min(self.health_check_interval, 10.0))
+            )
+        except TransportError:
+            self._record(endpoint, failed=True)
+            return
+        # Any other answer (even 401 or 404) shows the replica is up and serving.
+        self._record(endpoint, failed=response.status_code in _UNHEALTHY_STATUSES)
+
+
+class _BalancedTransport(Transport):
+    """Sends requests for the client's base URL to the endpoint its LoadBalancer picks."""
+
+    def __init__(self, transport: Transport, balancer: LoadBalancer, base_url: str):
+        super().__init__()
+        self.transport = transport
+        self.headers = transport.headers
+        self._balancer = balancer
+        self._base_url = base_url
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[Union[bytes, memoryview]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        if not (url == self._base_url or url.startswith(self._base_url + '/')):
+            return self.transport.request(method, url, body, headers, timeout, stream)
+        balancer = self._balancer
+        endpoint = balancer._acquire()
+        started = time.monotonic()
+        try:
+            response = self.transport.request(
+                method, endpoint.url + url[len(self._base_url):], body, headers, timeout, stream
+            )
+        except TransportError:
+            balancer._finish(endpoint)
+            balancer._record(endpoint, True, time.monotonic() - started)
+            raise
+        except BaseException:
+            balancer._finish(endpoint)
+            raise
+        balancer._record(
+            endpoint, response.status_code in _UNHEALTHY_STATUSES, time.monotonic() - started
+        )
+        if not stream or response._read is None:
+            balancer._finish(endpoint)
+            return response
+        # A streamed body is still being transferred; the request stays in flight until then.
+        release = response._release
+
+        def finish() -> None:
+            try:
+                if release is not None:
+                    release()
+            finally:
+                balancer._finish(endpoint)
+
+        response._release = finish
+        return response
+
+    def configure_pool(self, config: PoolConfig) -> None:
+        self.transport.configure_pool(config)
+
+    def pool_stats(self) -> PoolStats:
+        return self.transport.pool_stats()
+
+    def close(self) -> None:
+        self._balancer.close()
+        self.transport.close()
@@ -0,0 +1,390 @@
+"""
+Client-side caching helpers.
+"""
+
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from . import WorkflowExecutionResult, WorkflowStatus, _parse_execution_result, _result_payload
+
+T = TypeVar('T')
+
+
+class _Call(Generic[T]):
+    """An in-flight SingleFlight call that followers wait on."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the function; callers arriving while it
+    is still running attach to it and receive the same result, or a copy of the same
+    exception. An attached caller can give up after its own ``timeout`` (raising
+    ``TimeoutError``) without affecting the leader or other attached callers.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T], timeout: Optional[float] = None) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f'Shared call did not finish within {timeout} seconds')
+            if call.error is not None:
+                raise copy.copy(call.error) from call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class StatusCache:
+    """
+    Bounded LRU cache of WorkflowStatus objects with a time-to-live.
+
+    Loads go through a SingleFlight, so concurrent lookups of the same uncached workflow
+    share one ``/status`` request. Safe to share across threads.
+
+    Args:
+        maxsize: Maximum number of workflows kept (default: 1024)
+        ttl: Seconds a cached status stays valid (default: 60.0)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, WorkflowStatus]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, workflow_id: str) -> Optional[WorkflowStatus]:
+        """Return the cached status, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(workflow_id)
+            if entry is None:
+                return None
+            expires_at, status = entry
+            if expires_at <= time.monotonic():
+                del self._entries[workflow_id]
+                return None
+            self._entries.move_to_end(workflow_id)
+            return status
+
+    def put(self, workflow_id: str, status: WorkflowStatus) -> None:
+        """Cache a status, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[workflow_id] = (time.monotonic() + self.ttl, status)
+            self._entries.move_to_end(workflow_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, workflow_id: Optional[str] = None) -> None:
+        """Drop one workflow's cached status, or every entry when no ID is given."""
+        with self._lock:
+            if workflow_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(workflow_id, None)
+
+    def get_or_load(self, workflow_id: str, loader: Callable[[], WorkflowStatus]) -> WorkflowStatus:
+        """Return the cached status, loading (once, for all concurrent callers) on a miss."""
+        status = self.get(workflow_id)
+        if status is not None:
+            with self._lock:
+                self.hits += 1
+            return status
+
+        def load() -> WorkflowStatus:
+            loaded = loader()
+            self.put(workflow_id, loaded)
+            return loaded
+
+        with self._lock:
+            self.misses += 1
+        return self._flight.do(workflow_id, load)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+def canonical_input_hash(input_data: Optional[Dict[str, Any]]) -> str:
+    """Stable hash of workflow input: key order and whitespace do not change it."""
+    canonical = json.dumps(
+        input_data or {},
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Memoizes successful executions of deterministic workflows.
+
+    Entries are keyed by scope, workflow ID, deployment timestamp
+    (``WorkflowStatus.deployed_at``) and a canonical hash of the input, so a redeploy makes
+    every earlier entry for that workflow unreachable; they are purged as soon as the new
+    deployment is seen. A client confirms the deployment with a status request before
+    serving a hit, so results are never served for a deployment that has been replaced.
+    A client passes its base URL and a hash of its API key as the scope, so a cache
+    shared between clients (or kept across a ``set_base_url``) never serves one server's
+    or account's results to another.
+
+    Results live in an in-memory LRU tier and, when ``path`` is given, in an SQLite file
+    with least-recently-used eviction once it grows past ``max_disk_bytes``. Cached
+    results are shared between callers and should be treated as read-only.
+
+    Args:
+        maxsize: Maximum number of results kept in memory (default: 1024)
+        path: SQLite file for the on-disk tier (default: memory only)
+        max_disk_bytes: Size budget for the on-disk tier (default: 256 MiB)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        path: Optional[str] = None,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory: "OrderedDict[Tuple[str, str, str], WorkflowExecutionResult]" = OrderedDict()
+        self._deployments: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        if path is not None:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            ' key TEXT PRIMARY KEY, workflow_id TEXT NOT NULL, deployed_at TEXT NOT NULL,'
+            ' payload BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS results_workflow ON results (workflow_id)')
+        self._disk_bytes = self._db.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM results'
+        ).fetchone()[0]
+
+    def get(
+        self,
+        workflow_id: str,
+        deployed_at: Optional[str],
+        input_data: Optional[Dict[str, Any]],
+        scope: str = '',
+    ) -> Optional[WorkflowExecutionResult]:
+        """Return the memoized result for this workflow deployment and input, if any."""
+        key = (_scoped(scope, workflow_id), deployed_at or '', canonical_input_hash(input_data))
+        with self._lock:
+            self._observe_deployment(key[0], key[1])
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return result
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT payload FROM results WHERE key = ?', (_disk_key(key),)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        'UPDATE results SET accessed = ? WHERE key = ?',
+                        (time.time(), _disk_key(key))
+                    )
+                    result = _parse_execution_result(json.loads(row[0]))
+                    self._remember(key, result)
+                    self.disk_hits += 1
+                    return result
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        workflow_id: str,
+        deployed_at: Optional[str],
+        input_data: Optional[Dict[str, Any]],
+        result: WorkflowExecutionResult,
+        scope: str = '',
+    ) -> None:
+        """Memoize a successful result (unsuccessful results are never cached)."""
+        if not result.success:
+            return
+        key = (_scoped(scope, workflow_id), deployed_at or '', canonical_input_hash(input_data))
+        with self._lock:
+            self._observe_deployment(key[0], key[1])
+            self._remember(key, result)
+            if self._db is not None:
+                payload = json.dumps(_result_payload(result), default=str).encode('utf-8')
+                previous = self._db.execute(
+                    'SELECT size FROM results WHERE key = ?', (_disk_key(key),)
+                ).fetchone()
+                self._db.execute(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                    (_disk_key(key), key[0], key[1], payload, len(payload), time.time())
+                )
+                self._disk_bytes += len(payload) - (previous[0] if previous else 0)
+                self._evict_disk()
+
+    def invalidate(self, workflow_id: Optional[str] = None) -> None:
+        """Drop every memoized result for one workflow (in every scope), or for all workflows."""
+        with self._lock:
+            if workflow_id is None:
+                self._memory.clear()
+                self._deployments.clear()
+                if self._db is not None:
+                    self._db.execute('DELETE FROM results')
+                    self._disk_bytes = 0
+            else:
+                for scoped in [w for w in self._deployments if _unscoped(w) == workflow_id]:
+                    del self._deployments[scoped]
+                self._purge(workflow_id, keep_deployment=None, any_scope=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the size of each tier."""
+        with self._lock:
+            return {
+                'hits': self.memory_hits + self.disk_hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'memory_entries': len(self._memory),
+                'disk_bytes': self._disk_bytes,
+            }
+
+    def close(self) -> None:
+        """Close the on-disk tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: Tuple[str, str, str], result: WorkflowExecutionResult) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _observe_deployment(self, workflow: str, deployed_at: str) -> None:
+        """Purge a workflow's entries from older deployments the first time a new one is seen."""
+        previous = self._deployments.get(workflow)
+        self._deployments[workflow] = deployed_at
+        if previous != deployed_at:
+            self._purge(workflow, keep_deployment=deployed_at)
+
+    def _purge(
+        self, workflow: str, keep_deployment: Optional[str], any_scope: bool = False
+    ) -> None:
+        """
+        Drop a scoped workflow's entries, except those of ``keep_deployment``; with
+        ``any_scope``, ``workflow`` is a bare workflow ID matched in every scope.
+        """
+        identity = _unscoped if any_scope else str
+        for key in [
+            k for k in self._memory if identity(k[0]) == workflow and k[1] != keep_deployment
+        ]:
+            del self._memory[key]
+        if self._db is not None:
+            if any_scope:
+                suffix = _SCOPE_SEPARATOR + workflow
+                self._db.execute(
+                    'DELETE FROM results WHERE (workflow_id = ? OR substr(workflow_id, -?) = ?)'
+                    ' AND deployed_at IS NOT ?',
+                    (workflow, len(suffix), suffix, keep_deployment)
+                )
+            else:
+                self._db.execute(
+                    'DELETE FROM results WHERE workflow_id = ? AND deployed_at IS NOT ?',
+                    (workflow, keep_deployment)
+                )
+            self._disk_bytes = self._db.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM results'
+            ).fetchone()[0]
+
+    def _evict_disk(self) -> None:
+        assert self._db is not None
+        while self._disk_bytes > self.max_disk_bytes:
+            row = self._db.execute(
+                'SELECT key, size FROM results ORDER BY accessed LIMIT 1'
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute('DELETE FROM results WHERE key = ?', (row[0],))
+            self._disk_bytes -= row[1]
+            self.evictions += 1
+
+
+def _disk_key(key: Tuple[str, str, str]) -> str:
+    return '\x1f'.join(key)
+
+
+_SCOPE_SEPARATOR = '\x1e'
+
+
+def _result_scope(base_url: str, api_key: str) -> str:
+    """Scope of a client's cached results: its base URL and a hash of its API key."""
+    return f"{base_url}#{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:32]}"
+
+
+def _scoped(scope: str, workflow_id: str) -> str:
+    return f'{scope}{_SCOPE_SEPARATOR}{workflow_id}' if scope else workflow_id
+
+
+def _unscoped(workflow: str) -> str:
+    return workflow.rpartition(_SCOPE_SEPARATOR)[2]
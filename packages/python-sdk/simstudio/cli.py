@@ -0,0 +1,280 @@
+"""
+Command-line interface for bulk workflow runs.
+
+``simstudio run <workflow-id> --input records.jsonl --out results.jsonl`` executes the
+workflow once per input record, streaming records from a JSONL or CSV file and writing
+one JSON line per result as it finishes. Completed records are tracked in a checkpoint
+file, so rerunning the same command after a crash or Ctrl-C resumes where it stopped.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from . import SimStudioClient, _result_payload
+from .retry import RetryPolicy
+
+_CHECKPOINT_VERSION = 1
+
+
+class Checkpoint:
+    """
+    Record indexes completed so far, stored as a low-water mark plus the few indexes
+    finished out of order above it, so its size is bounded by the concurrency.
+
+    Args:
+        path: File the checkpoint is saved to
+        workflow_id: Workflow the run executes
+        input_path: Input file the indexes refer to
+    """
+
+    def __init__(self, path: str, workflow_id: str, input_path: str):
+        self.path = path
+        self.workflow_id = workflow_id
+        self.input_path = os.path.abspath(input_path)
+        self.next = 0
+        self.done: Set[int] = set()
+
+    @classmethod
+    def open(cls, path: str, workflow_id: str, input_path: str) -> 'Checkpoint':
+        """Load the checkpoint at ``path``, or start an empty one if there is none."""
+        checkpoint = cls(path, workflow_id, input_path)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return checkpoint
+        if data.get('version') != _CHECKPOINT_VERSION:
+            raise ValueError(f'Unsupported checkpoint version in {path}')
+        if data.get('workflow_id') != workflow_id or data.get('input') != checkpoint.input_path:
+            raise ValueError(
+                f'Checkpoint {path} belongs to a run of workflow {data.get("workflow_id")} '
+                f'over {data.get("input")}'
+            )
+        checkpoint.next = data['next']
+        checkpoint.done = set(data['done'])
+        return checkpoint
+
+    def __contains__(self, index: int) -> bool:
+        return index < self.next or index in self.done
+
+    def mark(self, index: int) -> None:
+        """Record ``index`` as completed."""
+        self.done.add(index)
+        while self.next in self.done:
+            self.done.remove(self.next)
+            self.next += 1
+
+    def save(self) -> None:
+        """Atomically replace the checkpoint file."""
+        data = {
+            'version': _CHECKPOINT_VERSION,
+            'workflow_id': self.workflow_id,
+            'input': self.input_path,
+            'next': self.next,
+            'done': sorted(self.done),
+        }
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+
+
+def read_records(
+    path: str,
+    input_format: str,
+    skip: Callable[[int], bool],
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Lazily read ``(index, record)`` pairs from a JSONL or CSV file.
+
+    The index is the line number (JSONL) or data row number (CSV), counted from 0.
+    Records for which ``skip(index)`` is true are not parsed where the format allows it.
+    Blank JSONL lines are yielded with a None record so they can be checkpointed too.
+    """
+    if input_format == 'csv':
+        with open(path, newline='') as f:
+            for index, row in enumerate(csv.DictReader(f)):
+                if not skip(index):
+                    yield index, row
+        return
+
+    with open(path, 'rb') as f:
+        for index, line in enumerate(f):
+            if skip(index):
+                continue
+            if not line.strip():
+                yield index, None
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f'{path}, line {index + 1}: invalid JSON ({e})')
+            yield index, record
+
+
+def _trim_partial_line(path: str) -> None:
+    """Drop a trailing line cut short by a crash mid-write, so appends start on a fresh line."""
+    try:
+        with open(path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            position = size
+            while position > 0:
+                step = min(64 * 1024, position)
+                f.seek(position - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b'\n')
+                if newline >= 0:
+                    f.truncate(position - step + newline + 1)
+                    return
+                position -= step
+            f.truncate(0)
+    except FileNotFoundError:
+        pass
+
+
+def run(args: argparse.Namespace) -> int:
+    """Execute the ``run`` command, returning the process exit status."""
+    api_key = args.api_key or os.environ.get('SIMSTUDIO_API_KEY')
+    if not api_key:
+        print('error: pass --api-key or set SIMSTUDIO_API_KEY', file=sys.stderr)
+        return 2
+    input_format = args.format or ('csv' if args.input.lower().endswith('.csv') else 'jsonl')
+    checkpoint_path = args.checkpoint or f'{args.out}.checkpoint'
+    try:
+        checkpoint = Checkpoint.open(checkpoint_path, args.workflow_id, args.input)
+    except (ValueError, KeyError) as e:
+        print(f'error: {e}', file=sys.stderr)
+        return 2
+
+    fields = args.fields.split(',') if args.fields else None
+    base_urls = [url.strip() for url in args.base_url.split(',') if url.strip()]
+    client = SimStudioClient(
+        api_key=api_key,
+        base_url=base_urls[0] if len(base_urls) == 1 else base_urls,
+        rate_limit=args.rate_limit,
+        fields=fields,
+        retry=RetryPolicy(max_attempts=args.retries + 1) if args.retries else False,
+    )
+    counts = {'succeeded': 0, 'failed': 0, 'skipped': 0}
+    # execute_many numbers items in submission order; map those back to record indexes.
+    positions: Dict[int, int] = {}
+
+    def skip(index: int) -> bool:
+        if index in checkpoint:
+            counts['skipped'] += 1
+            return True
+        return False
+
+    def items() -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        position = 0
+        for index, record in read_records(args.input, input_format, skip):
+            if record is None:
+                checkpoint.mark(index)
+                continue
+            positions[position] = index
+            position += 1
+            yield args.workflow_id, record
+
+    _trim_partial_line(args.out)
+    status = 0
+    saved_at = time.monotonic()
+    with client, open(args.out, 'ab') as out:
+        try:
+            results = client.execute_many(
+                items(), max_concurrency=args.concurrency, timeout=args.timeout
+            )
+            for position, result in results:
+                index = positions.pop(position)
+                payload: Dict[str, Any] = {'index': index}
+                payload.update((k, v) for k, v in _result_payload(result).items() if v is not None)
+                out.write(client._codec.dumps(payload) + b'\n')
+                checkpoint.mark(index)
+                counts['succeeded' if result.success else 'failed'] += 1
+                if time.monotonic() - saved_at >= args.checkpoint_interval:
+                    out.flush()
+                    os.fsync(out.fileno())
+                    checkpoint.save()
+                    saved_at = time.monotonic()
+        except ValueError as e:
+            print(f'error: {e}', file=sys.stderr)
+            status = 2
+        except KeyboardInterrupt:
+            status = 130
+        finally:
+            out.flush()
+            os.fsync(out.fileno())
+            checkpoint.save()
+
+    print(
+        f"{counts['succeeded']} succeeded, {counts['failed']} failed, "
+        f"{counts['skipped']} skipped (already completed)",
+        file=sys.stderr
+    )
+    if status == 0 and counts['failed']:
+        status = 1
+    return status
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='simstudio', description='Sim command-line tools.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run_parser = commands.add_parser(
+        'run',
+        help='Execute a workflow once per record of a JSONL or CSV file',
+        description='Execute a workflow once per input record, writing one JSON line per result. '
+                    'Rerunning the same command resumes from the checkpoint.'
+    )
+    run_parser.add_argument('workflow_id')
+    run_parser.add_argument('--input', required=True,
+                            help='JSONL file of input objects, or CSV with a header row')
+    run_parser.add_argument('--out', required=True, help='JSONL file results are appended to')
+    run_parser.add_argument('--format', choices=['jsonl', 'csv'],
+                            help='Input format (default: from the extension)')
+    run_parser.add_argument('--concurrency', type=int, default=8,
+                            help='Executions in flight (default: 8)')
+    run_parser.add_argument('--timeout', type=float, default=30.0,
+                            help='Seconds per execution, including retries (default: 30)')
+    run_parser.add_argument('--fields',
+                            help='Comma-separated result attributes to keep, e.g. '
+                                 'success,output,error')
+    run_parser.add_argument('--checkpoint', help='Checkpoint file (default: <out>.checkpoint)')
+    run_parser.add_argument('--checkpoint-interval', type=float, default=1.0,
+                            help='Seconds between checkpoint saves (default: 1)')
+    run_parser.add_argument('--rate-limit', action='store_true',
+                            help='Wait out HTTP 429 responses instead of recording them as '
+                                 'failures')
+    run_parser.add_argument('--retries', type=int, default=0,
+                            help='Retries of connection failures and 502/503/504 within --timeout '
+                                 '(default: 0)')
+    run_parser.add_argument('--api-key', help='API key (default: $SIMSTUDIO_API_KEY)')
+    run_parser.add_argument('--base-url',
+                            default=os.environ.get('SIMSTUDIO_BASE_URL', 'https://sim.ai'),
+                            help='API base URL, or comma-separated base URLs of replicas to '
+                                 'balance over (default: $SIMSTUDIO_BASE_URL or https://sim.ai)')
+    run_parser.set_defaults(handler=run)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    handler: Callable[[argparse.Namespace], int] = args.handler
+    return handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
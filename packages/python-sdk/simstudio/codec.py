@@ -0,0 +1,83 @@
+"""
+Pluggable JSON codecs for request and response bodies.
+"""
+
+import json
+from typing import Any, Optional, Union
+
+
+class JSONCodec:
+    """
+    Encodes request bodies and decodes response bodies with the standard library.
+
+    Subclass and override ``dumps``/``loads`` to plug in another JSON implementation;
+    pass an instance as a client's ``codec``.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode a request body as UTF-8 JSON."""
+        return json.dumps(obj, allow_nan=False).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode a JSON document."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSONCodec backed by ``orjson``."""
+
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj, option=self._options)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """JSONCodec backed by ``msgspec``."""
+
+    name = 'msgspec'
+
+    def __init__(self) -> None:
+        import msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._decode_error = msgspec.DecodeError
+
+    def dumps(self, obj: Any) -> bytes:
+        encoded: bytes = self._encoder.encode(obj)
+        return encoded
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as e:
+            raise ValueError(str(e)) from e
+
+
+_default: Optional[JSONCodec] = None
+
+
+def default_codec() -> JSONCodec:
+    """Return the fastest available codec: orjson, then msgspec, then the standard library."""
+    global _default
+    if _default is None:
+        for codec_class in (OrjsonCodec, MsgspecCodec):
+            try:
+                _default = codec_class()
+                break
+            except ImportError:
+                continue
+        else:
+            _default = JSONCodec()
+    return _default
@@ -0,0 +1,231 @@
+"""
+Incremental decoding of execute responses.
+
+The execute response is a single JSON object whose ``logs`` and ``traceSpans`` can be far
+larger than ``output``. Instead of buffering and decoding the whole body, the response is
+scanned chunk by chunk as it arrives: unwanted top-level fields are skipped without being
+kept in memory, and lazily decoded fields are kept as raw bytes until first accessed.
+"""
+
+import json
+import re
+from typing import TYPE_CHECKING, AbstractSet, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import WorkflowExecutionResult, _parse_execution_result
+
+if TYPE_CHECKING:
+    from .codec import JSONCodec
+
+# Response body key for each WorkflowExecutionResult attribute.
+RESULT_FIELDS: Dict[str, str] = {
+    'success': 'success',
+    'output': 'output',
+    'error': 'error',
+    'logs': 'logs',
+    'metadata': 'metadata',
+    'trace_spans': 'traceSpans',
+    'total_duration': 'totalDuration',
+}
+_ATTRIBUTES = {key: attribute for attribute, key in RESULT_FIELDS.items()}
+
+LAZY_FIELDS = frozenset(['logs', 'trace_spans'])
+
+_WHITESPACE = b' \t\r\n'
+_QUOTE, _BACKSLASH, _COMMA, _COLON = 0x22, 0x5C, 0x2C, 0x3A
+_OPEN = frozenset(b'{[')
+_CLOSE = frozenset(b'}]')
+
+# Skip, in one regex call, everything up to the next byte that changes the scanner state:
+# brackets (and commas at the top level) outside strings. Complete strings are consumed
+# whole; a string cut off by the end of a chunk stops the match at its opening quote.
+_SKIP_NESTED = re.compile(rb'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+_SKIP_TOP_LEVEL = re.compile(rb'(?:[^"{}\[\],]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+_BEFORE_OBJECT, _BEFORE_KEY, _IN_KEY, _BEFORE_COLON, _BEFORE_VALUE, _IN_VALUE, _DONE = range(7)
+
+
+class ObjectFieldScanner:
+    """
+    Splits a streamed JSON object into ``(key, raw value bytes)`` pairs.
+
+    Only values for which ``keep(key)`` is true are accumulated; others are scanned past
+    without being stored. Values are returned as raw JSON bytes for the caller to decode.
+    """
+
+    def __init__(self, keep: Callable[[str], bool]):
+        self._keep = keep
+        self._phase = _BEFORE_OBJECT
+        self._key_parts: List[bytes] = []
+        self._key_escape = False
+        self._key: Optional[str] = None
+        self._value_parts: Optional[List[bytes]] = None
+        self._value_start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, data: bytes) -> List[Tuple[str, bytes]]:
+        """Scan the next chunk, returning the kept fields completed within it."""
+        completed: List[Tuple[str, bytes]] = []
+        i, n = 0, len(data)
+        while i < n:
+            phase = self._phase
+            if phase == _IN_VALUE:
+                i = self._scan_value(data, i, completed)
+            elif phase == _IN_KEY:
+                i = self._scan_key(data, i)
+            else:
+                byte = data[i]
+                i += 1
+                if byte in _WHITESPACE:
+                    continue
+                if phase == _BEFORE_OBJECT and byte == 0x7B:
+                    self._phase = _BEFORE_KEY
+                elif phase == _BEFORE_KEY and byte == _QUOTE:
+                    self._phase = _IN_KEY
+                elif phase == _BEFORE_KEY and byte == 0x7D:
+                    self._phase = _DONE
+                elif phase == _BEFORE_COLON and byte == _COLON:
+                    self._phase = _BEFORE_VALUE
+                elif phase == _BEFORE_VALUE:
+                    i -= 1
+                    self._start_value(i)
+                else:
+                    raise ValueError(f'Unexpected byte {chr(byte)!r} in JSON object')
+        if self._phase == _IN_VALUE and self._value_parts is not None and self._value_start < n:
+            self._value_parts.append(data[self._value_start:])
+        self._value_start = 0
+        return completed
+
+    def finish(self) -> None:
+        """Check that the whole object was received."""
+        if self._phase != _DONE:
+            raise ValueError('Truncated JSON object')
+
+    def _scan_key(self, data: bytes, i: int) -> int:
+        n = len(data)
+        start = i
+        if self._key_escape:
+            self._key_escape = False
+            i += 1
+        while i < n:
+            match = _STRING_SPECIAL.search(data, i)
+            if match is None:
+                break
+            j = match.start()
+            if data[j] == _BACKSLASH:
+                if j + 1 >= n:
+                    self._key_escape = True
+                    self._key_parts.append(data[start:n])
+                    return n
+                i = j + 2
+                continue
+            self._key_parts.append(data[start:j])
+            self._key = json.loads(b'"' + b''.join(self._key_parts) + b'"')
+            self._key_parts = []
+            self._phase = _BEFORE_COLON
+            return j + 1
+        self._key_parts.append(data[start:n])
+        return n
+
+    def _start_value(self, start: int) -> None:
+        self._phase = _IN_VALUE
+        self._value_start = start
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._value_parts = [] if self._keep(self._key or '') else None
+
+    def _scan_value(self, data: bytes, i: int, completed: List[Tuple[str, bytes]]) -> int:
+        n = len(data)
+        if self._escape:
+            self._escape = False
+            i += 1
+        while i < n:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(data, i)
+                if match is None:
+                    return n
+                j = match.start()
+                if data[j] == _BACKSLASH:
+                    if j + 1 >= n:
+                        self._escape = True
+                        return n
+                    i = j + 2
+                    continue
+                self._in_string = False
+                i = j + 1
+                continue
+
+            skip = _SKIP_NESTED if self._depth else _SKIP_TOP_LEVEL
+            j = skip.match(data, i).end()  # type: ignore[union-attr]
+            if j >= n:
+                return n
+            byte = data[j]
+            if byte == _QUOTE:
+                self._in_string = True
+            elif byte in _OPEN:
+                self._depth += 1
+            elif byte in _CLOSE and self._depth > 0:
+                self._depth -= 1
+            elif byte == _COMMA and self._depth > 0:
+                pass
+            elif byte == 0x5D:
+                raise ValueError("Unexpected byte ']' in JSON object")
+            else:
+                # A comma or the closing brace at depth 0 ends this value.
+                self._end_value(data[self._value_start:j], completed)
+                self._phase = _BEFORE_KEY if byte == _COMMA else _DONE
+                return j + 1
+            i = j + 1
+        return n
+
+    def _end_value(self, tail: bytes, completed: List[Tuple[str, bytes]]) -> None:
+        if self._value_parts is not None:
+            self._value_parts.append(tail)
+            completed.append((self._key or '', b''.join(self._value_parts)))
+        self._value_parts = None
+        self._key = None
+
+
+def decode_execution_result(
+    chunks: Iterable[bytes],
+    fields: Optional[AbstractSet[str]] = None,
+    lazy: AbstractSet[str] = frozenset(),
+    codec: Optional["JSONCodec"] = None,
+) -> WorkflowExecutionResult:
+    """
+    Decode a streamed execute response body into a WorkflowExecutionResult.
+
+    Args:
+        chunks: The response body, chunk by chunk
+        fields: Attributes to materialize (``success`` is always included); None for all
+        lazy: Attributes to keep as raw JSON and decode on first access
+        codec: JSONCodec used to decode values (default: the standard library)
+
+    Raises:
+        ValueError: If the body is not a complete JSON object
+    """
+    wanted = None if fields is None else {RESULT_FIELDS[name] for name in fields} | {'success'}
+    loads = codec.loads if codec is not None else json.loads
+    scanner = ObjectFieldScanner(
+        lambda key: key in _ATTRIBUTES and (wanted is None or key in wanted)
+    )
+    eager: Dict[str, object] = {}
+    raw: Dict[str, bytes] = {}
+
+    for chunk in chunks:
+        for key, value in scanner.feed(chunk):
+            attribute = _ATTRIBUTES[key]
+            if attribute in lazy:
+                raw[attribute] = value
+            else:
+                eager[key] = loads(value)
+    scanner.finish()
+
+    result = _parse_execution_result(eager)
+    if raw:
+        result._raw = raw
+        result._loads = loads
+    return result
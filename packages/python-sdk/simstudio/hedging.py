@@ -0,0 +1,182 @@
+"""
+Hedged requests: a second copy of a slow idempotent request, first answer wins.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class HedgePolicy:
+    """
+    Sends a second copy of an idempotent request that is slower than usual.
+
+    Latencies of recent successful requests are kept per route (e.g. ``'status'`` and
+    ``'job'``). Once ``min_samples`` are known, a request still unanswered after the
+    ``percentile`` of them gets a hedge: the same request sent again. Whichever copy
+    answers first is returned. The other one is cancelled if it has not started yet;
+    otherwise it runs to its own timeout and its answer is dropped. If the first answer is
+    an error, the other copy's answer is awaited and preferred.
+
+    Hedges are capped by a budget, so they cannot multiply the load when every request
+    is slow (e.g. during an outage): each request earns ``max_hedge_ratio`` of a hedge,
+    and at most ``max_burst`` unspent hedges are saved up.
+
+    A request that cannot be hedged (while its route warms up, with no hedge left in the
+    budget, or while every worker of the policy's thread pool is busy) runs on the
+    calling thread. Only requests racing a possible hedge, and the hedges themselves, run
+    on the pool, and only when a worker is free, so its size does not cap how many
+    requests are in flight and no request waits in its queue. The hedge delay is timed
+    from when the request starts. A policy is safe to share between threads and clients.
+
+    Args:
+        percentile: Fraction of recent latencies a request may exceed before it is
+            hedged (default: 0.95)
+        min_samples: Latencies needed per route before hedging starts (default: 20)
+        window: Recent latencies kept per route (default: 256)
+        min_delay: Lower bound of the hedge delay in seconds (default: 0.005)
+        max_hedge_ratio: Hedges allowed per request, on average (default: 0.1)
+        max_burst: Unspent hedges that can be saved up (default: 10)
+        max_workers: Threads that run requests racing a hedge (default: 16)
+
+    Attributes:
+        requests: Requests sent through the policy
+        hedged: Requests that were hedged
+        hedge_wins: Hedged requests answered first by the hedge
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 256,
+        min_delay: float = 0.005,
+        max_hedge_ratio: float = 0.1,
+        max_burst: float = 10.0,
+        max_workers: int = 16,
+    ):
+        if not 0 < percentile <= 1:
+            raise ValueError('percentile must be in (0, 1]')
+        if min_samples < 1 or window < min_samples:
+            raise ValueError('Expected 1 <= min_samples <= window')
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self.max_hedge_ratio = max_hedge_ratio
+        self.max_burst = max_burst
+        self.max_workers = max_workers
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._budget = 0.0
+        self._latencies: Dict[Hashable, Deque[float]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Pool workers reserved by requests and hedges that were submitted and not done.
+        self._busy = 0
+        self._lock = threading.Lock()
+
+    def delay(self, route: Hashable) -> Optional[float]:
+        """Seconds after which a request on ``route`` is hedged, or None while warming up."""
+        with self._lock:
+            samples = self._latencies.get(route)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        rank = max(1, math.ceil(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[rank - 1])
+
+    def call(self, route: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run ``fn`` and, if it is slow, a hedged copy of it, returning the first answer.
+
+        Raises:
+            The error of the first copy to fail, if no copy succeeds
+        """
+        delay = self.delay(route)
+        with self._lock:
+            self.requests += 1
+            self._budget = min(self.max_burst, self._budget + self.max_hedge_ratio)
+            if delay is None or self._budget < 1 or self._busy >= self.max_workers:
+                executor = None
+            else:
+                executor = self._executor
+                if executor is None:
+                    executor = self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='simstudio-hedge'
+                    )
+                self._busy += 1
+        if executor is None:
+            return self._timed(route, fn)
+
+        started = threading.Event()
+        primary = self._submit(executor, route, fn, started)
+        started.wait()
+        if wait([primary], timeout=delay).done or not self._take_hedge():
+            return primary.result()
+
+        hedge = self._submit(executor, route, fn, threading.Event())
+        done = wait([primary, hedge], return_when=FIRST_COMPLETED).done
+        first, other = (primary, hedge) if primary in done else (hedge, primary)
+        if first.exception() is None or other.exception() is None:
+            winner = first if first.exception() is None else other
+            if winner is hedge:
+                with self._lock:
+                    self.hedge_wins += 1
+            (other if winner is first else first).cancel()
+            return winner.result()
+        return first.result()
+
+    def _take_hedge(self) -> bool:
+        """Spend a hedge from the budget and reserve a pool worker for it, if both are left."""
+        with self._lock:
+            if self._budget < 1 or self._busy >= self.max_workers:
+                return False
+            self._budget -= 1
+            self._busy += 1
+            self.hedged += 1
+            return True
+
+    def _submit(
+        self,
+        executor: ThreadPoolExecutor,
+        route: Hashable,
+        fn: Callable[[], T],
+        started: threading.Event,
+    ) -> "Future[T]":
+        """Run ``fn`` on a reserved pool worker, setting ``started`` when it begins."""
+        def run() -> T:
+            started.set()
+            return self._timed(route, fn)
+
+        future = executor.submit(run)
+        # Also called for a future cancelled before it started.
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self) -> None:
+        with self._lock:
+            self._busy -= 1
+
+    def _timed(self, route: Hashable, fn: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            samples = self._latencies.get(route)
+            if samples is None:
+                samples = self._latencies[route] = deque(maxlen=self.window)
+            samples.append(elapsed)
+        return result
+
+    def close(self) -> None:
+        """Stop the policy's threads once their requests finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,255 @@
+"""
+Keep-alive transport on the standard library's ``http.client``.
+"""
+
+import http.client
+import select
+import socket
+import ssl
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .instrumentation import _PhaseTimingMixin
+from .transport import (
+    PoolConfig,
+    PoolStats,
+    Response,
+    Transport,
+    TransportError,
+    TransportTimeout,
+    _Headers,
+    _PoolCounters,
+)
+
+_Connection = Union[http.client.HTTPConnection, http.client.HTTPSConnection]
+_PoolKey = Tuple[str, str, int]
+
+
+class _TimedHTTPConnection(_PhaseTimingMixin, http.client.HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_PhaseTimingMixin, http.client.HTTPSConnection):
+    pass
+
+
+def _guarded_read(read: Callable[..., bytes]) -> Callable[..., bytes]:
+    """Wrap a body reader so read failures surface as transport errors."""
+    def guarded(*args: Any) -> bytes:
+        try:
+            return read(*args)
+        except socket.timeout as e:
+            raise TransportTimeout(f'Read timed out: {e}') from e
+        except (OSError, http.client.HTTPException) as e:
+            raise TransportError(str(e) or type(e).__name__) from e
+    return guarded
+
+
+def _is_dropped(connection: _Connection) -> bool:
+    """Whether an idle connection was closed by the server (an idle socket never has data)."""
+    sock = connection.sock
+    if sock is None:
+        return False
+    try:
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+class HTTPTransport(Transport):
+    """
+    Transport on the standard library's ``http.client`` with a keep-alive connection
+    pool per host. It imports nothing outside the standard library, so a client using it
+    starts quickly. Unlike RequestsTransport it does not read proxy settings or
+    ``REQUESTS_CA_BUNDLE`` from the environment, and it does not ask for compressed
+    responses.
+
+    Args:
+        pool: Connection pool settings (default: PoolConfig())
+        instrumented: Use connections that record phase timings for client hooks
+        ssl_context: SSLContext for HTTPS (default: ``ssl.create_default_context()``)
+    """
+
+    def __init__(
+        self,
+        pool: Optional[PoolConfig] = None,
+        instrumented: bool = False,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        super().__init__()
+        self.pool = pool or PoolConfig()
+        self._ssl_context = ssl_context
+        self._connection_classes = (
+            (_TimedHTTPConnection, _TimedHTTPSConnection) if instrumented
+            else (http.client.HTTPConnection, http.client.HTTPSConnection)
+        )
+        # Per host: idle connections with the monotonic time they were returned (most
+        # recent last), and the number of connections open, idle or checked out.
+        self._idle: Dict[_PoolKey, List[Tuple[_Connection, float]]] = {}
+        self._open: Dict[_PoolKey, int] = {}
+        self._available = threading.Condition()
+        self._counters = _PoolCounters()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[Union[bytes, memoryview]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        parts = urlsplit(url)
+        secure = parts.scheme == 'https'
+        if not secure and parts.scheme != 'http':
+            raise TransportError(f'Unsupported URL scheme in {url!r}')
+        host = parts.hostname or ''
+        key = (parts.scheme, host, parts.port or (443 if secure else 80))
+        target = parts.path or '/'
+        if parts.query:
+            target = f'{target}?{parts.query}'
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+
+        connection = self._acquire(key, timeout)
+        # Connect explicitly, so a failure to connect is known to have sent nothing.
+        connecting = connection.sock is None
+        try:
+            if connecting:
+                connection.connect()
+                connecting = False
+            connection.request(method, target, body, request_headers)
+            raw = connection.getresponse()
+        except socket.timeout as e:
+            self._discard(key, connection)
+            raise TransportTimeout(f'Request timed out: {e}', connect=connecting) from e
+        except (OSError, http.client.HTTPException) as e:
+            self._discard(key, connection)
+            raise TransportError(str(e) or type(e).__name__, connect=connecting) from e
+        except BaseException:
+            self._discard(key, connection)
+            raise
+
+        def release() -> None:
+            self._release(key, connection, raw)
+
+        response_headers = _Headers(raw.getheaders())
+
+        if stream:
+            # For chunked bodies (such as server-sent events), read1 returns what has
+            # arrived instead of waiting for ``size`` bytes.
+            read = _guarded_read(raw.read1 if raw.chunked else raw.read)
+            return Response(raw.status, raw.reason, response_headers, read=read, release=release)
+        try:
+            content = _guarded_read(raw.read)()
+        finally:
+            release()
+        return Response(raw.status, raw.reason, response_headers, content=content)
+
+    def _acquire(self, key: _PoolKey, timeout: Optional[float]) -> _Connection:
+        """Check out an idle connection for ``key``, or a new one when the pool allows."""
+        connection: Optional[_Connection] = None
+        deadline: Optional[float] = None
+        waited = False
+        with self._available:
+            while True:
+                pool = self.pool
+                idle = self._idle.get(key)
+                if idle:
+                    self._expire(key, idle, time.monotonic() - (pool.idle_timeout or 0))
+                while idle:
+                    candidate, _ = idle.pop()
+                    if _is_dropped(candidate):
+                        candidate.close()
+                        self._open[key] -= 1
+                        continue
+                    connection = candidate
+                    break
+                if connection is not None or not pool.block:
+                    break
+                if self._open.get(key, 0) < pool.max_connections:
+                    break
+                # Every connection to the host is checked out: wait for one to come back.
+                if not waited:
+                    waited = True
+                    self._counters.waited()
+                    if pool.block_timeout is not None:
+                        deadline = time.monotonic() + pool.block_timeout
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TransportTimeout(
+                        f'Timed out after {pool.block_timeout}s waiting for a pooled connection'
+                    )
+                self._available.wait(remaining)
+            if connection is None:
+                self._open[key] = self._open.get(key, 0) + 1
+        self._counters.acquired(reused=connection is not None and connection.sock is not None)
+
+        if connection is None:
+            scheme, host, port = key
+            plain_class, secure_class = self._connection_classes
+            if scheme == 'https':
+                if self._ssl_context is None:
+                    self._ssl_context = ssl.create_default_context()
+                connection = secure_class(host, port, timeout=timeout, context=self._ssl_context)
+            else:
+                connection = plain_class(host, port, timeout=timeout)
+        else:
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+        return connection
+
+    def _expire(self, key: _PoolKey, idle: List[Tuple[_Connection, float]], cutoff: float) -> None:
+        """Close the idle connections returned before ``cutoff``; call with the lock held."""
+        if self.pool.idle_timeout is None:
+            return
+        while idle and idle[0][1] < cutoff:
+            idle.pop(0)[0].close()
+            self._open[key] -= 1
+            self._counters.expired()
+
+    def _release(self, key: _PoolKey, connection: _Connection, raw: Any) -> None:
+        """Pool a connection whose response was read to the end; close any other."""
+        if not raw.isclosed():
+            raw.close()
+            self._discard(key, connection)
+            return
+        with self._available:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.pool.max_connections:
+                idle.append((connection, time.monotonic()))
+                self._counters.released()
+                self._available.notify()
+                return
+            self._open[key] -= 1
+            self._counters.released(discarded=True)
+        connection.close()
+
+    def _discard(self, key: _PoolKey, connection: _Connection) -> None:
+        """Close a checked-out connection that cannot be reused and free its slot."""
+        connection.close()
+        with self._available:
+            self._open[key] -= 1
+            self._counters.released(discarded=True)
+            self._available.notify()
+
+    def configure_pool(self, config: PoolConfig) -> None:
+        with self._available:
+            self.pool = config
+            self._available.notify_all()
+
+    def pool_stats(self) -> PoolStats:
+        return self._counters.snapshot()
+
+    def close(self) -> None:
+        with self._available:
+            idle, self._idle = self._idle, {}
+            for key, connections in idle.items():
+                self._open[key] -= len(connections)
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
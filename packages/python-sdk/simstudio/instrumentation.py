@@ -0,0 +1,442 @@
+"""
+Per-request instrumentation: lifecycle hooks, phase timings, latency histograms and
+export of server trace spans to OpenTelemetry.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from . import WorkflowExecutionResult
+
+
+@dataclass
+class RequestTimings:
+    """
+    Where the time of one HTTP request went, in seconds.
+
+    ``connect`` is zero when a pooled connection was reused. ``server`` is the time from
+    the end of the upload to the response headers (server work plus network round trip);
+    compare it with ``server_reported``, the execution time the server measured itself.
+    For streamed (``fields``/``lazy_decoding``) responses the body is decoded while it is
+    downloaded, so that time is reported as ``download`` and ``decode`` stays zero.
+    """
+    connect: float = 0.0
+    upload: float = 0.0
+    server: float = 0.0
+    download: float = 0.0
+    decode: float = 0.0
+    total: float = 0.0
+    server_reported: Optional[float] = None
+
+
+@dataclass
+class RequestInfo:
+    """A request being instrumented; ``context`` is scratch space for hooks."""
+    workflow_id: str
+    method: str
+    url: str
+    started_at: float = field(default_factory=time.time)
+    context: Dict[str, Any] = field(default_factory=dict)
+
+
+class ClientHooks:
+    """
+    Receives lifecycle events for every execute request a client sends.
+
+    Subclass and override the methods you need; pass instances as a client's ``hooks``.
+    Hooks run on the calling thread, so they should be quick. Retries and rate-limited
+    attempts each produce their own events.
+    """
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        """Called before the request is sent."""
+
+    def on_response(
+        self,
+        info: RequestInfo,
+        status_code: int,
+        timings: RequestTimings,
+        result: "WorkflowExecutionResult",
+    ) -> None:
+        """Called after a successful response has been decoded."""
+
+    def on_error(
+        self,
+        info: RequestInfo,
+        error: BaseException,
+        timings: RequestTimings,
+        status_code: Optional[int] = None,
+    ) -> None:
+        """Called when the request fails, with the HTTP status if a response arrived."""
+
+
+# Connection-level phase timing. Transports mix _PhaseTimingMixin into their
+# http.client-style connections, which then record into the RequestTimings of the
+# request running on the current thread (requests are synchronous per thread).
+_active = threading.local()
+
+
+def _recording() -> Optional[RequestTimings]:
+    return getattr(_active, 'timings', None)
+
+
+class _PhaseTimingMixin:
+    def connect(self) -> None:
+        timings = _recording()
+        started = time.perf_counter()
+        try:
+            super().connect()  # type: ignore[misc]
+        finally:
+            if timings is not None:
+                timings.connect += time.perf_counter() - started
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        timings = _recording()
+        if timings is None:
+            return super().request(*args, **kwargs)  # type: ignore[misc]
+        connect_before = timings.connect
+        started = time.perf_counter()
+        try:
+            return super().request(*args, **kwargs)  # type: ignore[misc]
+        finally:
+            # A lazily opened connection is set up inside request(); count it once.
+            timings.upload += time.perf_counter() - started - (timings.connect - connect_before)
+
+    def getresponse(self, *args: Any, **kwargs: Any) -> Any:
+        timings = _recording()
+        started = time.perf_counter()
+        try:
+            return super().getresponse(*args, **kwargs)  # type: ignore[misc]
+        finally:
+            if timings is not None:
+                timings.server += time.perf_counter() - started
+
+
+class PhaseClock:
+    """Collects the RequestTimings of one request on the current thread."""
+
+    def __init__(self) -> None:
+        self.timings = RequestTimings()
+        self.status_code: Optional[int] = None
+        self._started = time.perf_counter()
+        self._mark = self._started
+
+    def __enter__(self) -> 'PhaseClock':
+        _active.timings = self.timings
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        _active.timings = None
+
+    def lap(self) -> float:
+        """Seconds since the previous lap (or since the clock started)."""
+        now = time.perf_counter()
+        elapsed, self._mark = now - self._mark, now
+        return elapsed
+
+    def sent(self, status_code: int) -> None:
+        """Mark the response headers as received."""
+        self.status_code = status_code
+        elapsed = self.lap()
+        timings = self.timings
+        if not (timings.connect or timings.upload or timings.server):
+            # Connections were not instrumented (e.g. a custom transport): attribute it
+            # all to the server phase.
+            timings.server = elapsed
+
+    def finish(self, result: Optional["WorkflowExecutionResult"] = None) -> RequestTimings:
+        self.timings.total = time.perf_counter() - self._started
+        if result is not None and isinstance(result.total_duration, (int, float)):
+            self.timings.server_reported = result.total_duration / 1000.0
+        return self.timings
+
+
+def dispatch(hooks: Iterable[ClientHooks], method: str, *args: Any) -> None:
+    """Call one hook method on every hook; a failing hook never fails the request."""
+    for hook in hooks:
+        try:
+            getattr(hook, method)(*args)
+        except Exception:
+            pass
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram with bounded relative error.
+
+    Bucket ``i`` holds values up to ``min_value * growth ** i``, so recording is one
+    logarithm and an increment, and percentiles are accurate to within ``growth``.
+
+    Args:
+        min_value: Upper bound of the first bucket in seconds (default: 1 ms)
+        max_value: Values above this all land in the last bucket (default: 10 minutes)
+        growth: Ratio between consecutive bucket bounds (default: 2 ** 0.25, about 19%)
+    """
+
+    def __init__(
+        self, min_value: float = 0.001, max_value: float = 600.0, growth: float = 2 ** 0.25
+    ):
+        self.min_value = min_value
+        self.growth = growth
+        self._inverse_log_growth = 1.0 / math.log(growth)
+        size = int(math.ceil(math.log(max_value / min_value) * self._inverse_log_growth)) + 1
+        self.counts = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+    def record(self, value: float) -> None:
+        if value <= self.min_value:
+            index = 0
+        else:
+            index = min(
+                len(self.counts) - 1,
+                int(math.ceil(math.log(value / self.min_value) * self._inverse_log_growth))
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def bound(self, index: int) -> float:
+        """Upper bound of a bucket."""
+        return self.min_value * self.growth ** index
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Approximate ``q``-th percentile (0-100), or None when empty."""
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(q / 100.0 * self.count)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.bound(index)
+        return self.bound(len(self.counts) - 1)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+
+
+class LatencyHistograms(ClientHooks):
+    """
+    Client hook keeping one LatencyHistogram of total request time per workflow and status.
+
+    Failed requests are recorded under their HTTP status, or ``0`` when no response
+    arrived (timeouts, connection errors).
+    """
+
+    def __init__(self, **histogram_options: Any):
+        self._options = histogram_options
+        self._histograms: Dict[Tuple[str, int], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def on_response(
+        self,
+        info: RequestInfo,
+        status_code: int,
+        timings: RequestTimings,
+        result: "WorkflowExecutionResult",
+    ) -> None:
+        self.record(info.workflow_id, status_code, timings.total)
+
+    def on_error(
+        self,
+        info: RequestInfo,
+        error: BaseException,
+        timings: RequestTimings,
+        status_code: Optional[int] = None,
+    ) -> None:
+        self.record(info.workflow_id, status_code or 0, timings.total)
+
+    def record(self, workflow_id: str, status_code: int, seconds: float) -> None:
+        key = (workflow_id, status_code)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(**self._options)
+            histogram.record(seconds)
+
+    def histogram(
+        self, workflow_id: Optional[str] = None, status_code: Optional[int] = None
+    ) -> LatencyHistogram:
+        """Merged histogram of every series matching the given workflow and/or status."""
+        merged = LatencyHistogram(**self._options)
+        with self._lock:
+            for (series_workflow, series_status), histogram in self._histograms.items():
+                if workflow_id is not None and series_workflow != workflow_id:
+                    continue
+                if status_code is not None and series_status != status_code:
+                    continue
+                merged.merge(histogram)
+        return merged
+
+    def percentile(
+        self, q: float, workflow_id: Optional[str] = None, status_code: Optional[int] = None
+    ) -> Optional[float]:
+        """Approximate latency percentile in seconds across the matching series."""
+        return self.histogram(workflow_id, status_code).percentile(q)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Count, sum and p50/p95/p99 of every (workflow, status) series."""
+        with self._lock:
+            series = list(self._histograms.items())
+        return [
+            {
+                'workflow_id': workflow_id,
+                'status': status_code,
+                'count': histogram.count,
+                'sum': histogram.sum,
+                'p50': histogram.percentile(50),
+                'p95': histogram.percentile(95),
+                'p99': histogram.percentile(99),
+            }
+            for (workflow_id, status_code), histogram in series
+        ]
+
+    def to_prometheus(self, name: str = 'simstudio_request_duration_seconds') -> str:
+        """Render every series in the Prometheus text exposition format."""
+        lines = [f'# HELP {name} Sim workflow execute request latency.', f'# TYPE {name} histogram']
+        with self._lock:
+            series = sorted(self._histograms.items())
+        for (workflow_id, status_code), histogram in series:
+            labels = f'workflow_id="{_escape_label(workflow_id)}",status="{status_code}"'
+            cumulative = 0
+            last = max(i for i, count in enumerate(histogram.counts) if count)
+            for index in range(last + 1):
+                cumulative += histogram.counts[index]
+                bound = f'{histogram.bound(index):.6g}'
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _timestamp_ns(value: Any) -> Optional[int]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1e9)
+
+
+class TracingHooks(ClientHooks):
+    """
+    Client hook that records each execute request as an OpenTelemetry span and nests the
+    server's ``traceSpans`` (one per block, with their children) beneath it.
+
+    Server spans keep the server's start and end timestamps, so they line up with the
+    client span up to clock skew. Requires ``opentelemetry-api``
+    (``pip install "simstudio-sdk[otel]"``).
+
+    Args:
+        tracer: Tracer to create spans with (default: ``trace.get_tracer('simstudio')``)
+    """
+
+    def __init__(self, tracer: Optional[Any] = None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                'TracingHooks requires opentelemetry-api. '
+                'Install it with: pip install "simstudio-sdk[otel]"'
+            )
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer('simstudio')
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        info.context['span'] = self._tracer.start_span(
+            'simstudio.execute_workflow',
+            kind=self._trace.SpanKind.CLIENT,
+            attributes={
+                'simstudio.workflow_id': info.workflow_id,
+                'http.request.method': info.method,
+                'url.full': info.url,
+            },
+        )
+
+    def on_response(
+        self,
+        info: RequestInfo,
+        status_code: int,
+        timings: RequestTimings,
+        result: "WorkflowExecutionResult",
+    ) -> None:
+        span = info.context.pop('span', None)
+        if span is None:
+            return
+        span.set_attribute('http.response.status_code', status_code)
+        self._set_timings(span, timings)
+        if not result.success:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(result.error)))
+        if result.trace_spans:
+            self.export_spans(result.trace_spans, span)
+        span.end()
+
+    def on_error(
+        self,
+        info: RequestInfo,
+        error: BaseException,
+        timings: RequestTimings,
+        status_code: Optional[int] = None,
+    ) -> None:
+        span = info.context.pop('span', None)
+        if span is None:
+            return
+        if status_code is not None:
+            span.set_attribute('http.response.status_code', status_code)
+        self._set_timings(span, timings)
+        span.record_exception(error)
+        span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(error)))
+        span.end()
+
+    def export_spans(self, trace_spans: Iterable[Dict[str, Any]], parent: Any) -> None:
+        """Record server trace spans (and their children) as children of ``parent``."""
+        context = self._trace.set_span_in_context(parent)
+        for server_span in trace_spans:
+            attributes = {
+                key: server_span[source]
+                for key, source in (
+                    ('simstudio.block_id', 'blockId'),
+                    ('simstudio.block_type', 'type'),
+                    ('simstudio.status', 'status'),
+                    ('simstudio.tokens', 'tokens'),
+                    ('simstudio.duration_ms', 'duration'),
+                )
+                if isinstance(server_span.get(source), (str, int, float))
+            }
+            span = self._tracer.start_span(
+                str(server_span.get('name') or server_span.get('type') or 'block'),
+                context=context,
+                start_time=_timestamp_ns(server_span.get('startTime')),
+                attributes=attributes,
+            )
+            if server_span.get('status') == 'error':
+                span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+            if server_span.get('children'):
+                self.export_spans(server_span['children'], span)
+            span.end(end_time=_timestamp_ns(server_span.get('endTime')))
+
+    @staticmethod
+    def _set_timings(span: Any, timings: RequestTimings) -> None:
+        for phase in ('connect', 'upload', 'server', 'download', 'decode', 'total'):
+            span.set_attribute(f'simstudio.timing.{phase}_ms', getattr(timings, phase) * 1000)
+        if timings.server_reported is not None:
+            span.set_attribute(
+                'simstudio.timing.server_reported_ms', timings.server_reported * 1000
+            )
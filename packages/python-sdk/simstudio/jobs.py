@@ -0,0 +1,251 @@
+"""
+Multiplexed tracking of queued (``X-Execution-Mode: async``) workflow executions.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from . import (
+    SimStudioError,
+    WorkflowExecutionResult,
+    WorkflowJob,
+    _next_poll_delay,
+    _result_from_job,
+)
+
+if TYPE_CHECKING:
+    from . import SimStudioClient
+
+# Job status errors that will not go away by polling again.
+_FATAL_POLL_STATUSES = frozenset([401, 403, 404])
+
+
+class _TrackedJob:
+    """Scheduler entry for one outstanding job."""
+
+    __slots__ = ('job', 'future', 'deadline', 'estimated_duration', 'errors')
+
+    def __init__(self, job: WorkflowJob, future: Future, deadline: Optional[float]):
+        self.job = job
+        self.future = future
+        self.deadline = deadline
+        self.estimated_duration: Optional[float] = None
+        self.errors = 0
+
+
+class JobTracker:
+    """
+    Tracks many queued workflow executions with a single background scheduler.
+
+    Outstanding jobs are kept in a heap ordered by their next poll time. One scheduler
+    thread pops due jobs, paces the resulting ``/api/jobs/{taskId}`` requests to a global
+    budget and hands them to a small pool of poll workers, so tracking tens of thousands
+    of jobs costs one thread plus ``max_concurrent_polls`` workers. Each job is spaced
+    with the same adaptive schedule as ``SimStudioClient.wait_for_job``.
+
+    Every tracked job gets a ``concurrent.futures.Future`` that settles into a
+    WorkflowExecutionResult (``asyncio.wrap_future`` turns it into an asyncio future).
+
+    Args:
+        client: The SimStudioClient used to poll job status
+        max_polls_per_second: Global budget of status requests per second (default: 10)
+        max_concurrent_polls: Maximum number of status requests in flight (default: 4)
+        timeout: Timeout for each status request in seconds (default: 30.0)
+        max_poll_errors: Consecutive failed polls before a job's future fails (default: 5)
+    """
+
+    def __init__(
+        self,
+        client: "SimStudioClient",
+        max_polls_per_second: float = 10.0,
+        max_concurrent_polls: int = 4,
+        timeout: float = 30.0,
+        max_poll_errors: int = 5,
+    ):
+        if max_polls_per_second <= 0:
+            raise ValueError('max_polls_per_second must be positive')
+        if max_concurrent_polls < 1:
+            raise ValueError('max_concurrent_polls must be at least 1')
+        self._client = client
+        self._poll_interval = 1.0 / max_polls_per_second
+        self._max_concurrent_polls = max_concurrent_polls
+        self._timeout = timeout
+        self._max_poll_errors = max_poll_errors
+
+        self._heap: List[Tuple[float, int, _TrackedJob]] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._next_slot = 0.0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._pollers = ThreadPoolExecutor(
+            max_workers=max_concurrent_polls,
+            thread_name_prefix='simstudio-jobs'
+        )
+
+    @property
+    def pending(self) -> int:
+        """Number of tracked jobs that have not settled yet."""
+        with self._cond:
+            return len(self._heap) + self._in_flight
+
+    def track(
+        self, job: WorkflowJob, max_wait: Optional[float] = None
+    ) -> "Future[WorkflowExecutionResult]":
+        """
+        Start tracking a queued execution.
+
+        Args:
+            job: The WorkflowJob returned by ``submit_workflow``
+            max_wait: Maximum total seconds to wait since submission (default: no limit)
+
+        Returns:
+            Future resolving to the job's WorkflowExecutionResult. It fails with a
+            SimStudioError on a ``TIMEOUT`` or when polling keeps failing. Cancelling
+            it stops tracking the job (the server-side execution keeps running).
+        """
+        future: Future = Future()
+        deadline = job.submitted_at + max_wait if max_wait is not None else None
+        entry = _TrackedJob(job, future, deadline)
+        now = time.monotonic()
+        self._schedule(entry, now + _next_poll_delay(now - job.submitted_at, None))
+        return future
+
+    def submit(
+        self,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        timeout: float = 30.0,
+        max_wait: Optional[float] = None,
+    ) -> "Future[WorkflowExecutionResult]":
+        """
+        Queue a workflow execution and track it.
+
+        Args:
+            workflow_id: The ID of the workflow to execute
+            input_data: Input data to pass to the workflow
+            timeout: Timeout for the submit request in seconds (default: 30.0)
+            max_wait: Maximum total seconds to wait since submission (default: no limit)
+
+        Returns:
+            Future resolving to the execution's WorkflowExecutionResult
+
+        Raises:
+            SimStudioError: If the execution could not be queued
+        """
+        job = self._client.submit_workflow(workflow_id, input_data, timeout)
+        return self.track(job, max_wait)
+
+    def close(self) -> None:
+        """Stop the scheduler and cancel the futures of all unsettled jobs."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            entries = [entry for _, _, entry in self._heap]
+            self._heap.clear()
+            self._cond.notify_all()
+        for entry in entries:
+            entry.future.cancel()
+        self._pollers.shutdown(wait=False)
+
+    def _schedule(self, entry: _TrackedJob, due: float) -> None:
+        if entry.deadline is not None:
+            due = min(due, entry.deadline)
+        with self._cond:
+            if self._closed:
+                entry.future.cancel()
+                return
+            heapq.heappush(self._heap, (due, next(self._sequence), entry))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='simstudio-job-tracker',
+                    daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                entry = self._next_due()
+                if entry is None:
+                    return
+                if entry.future.cancelled():
+                    continue
+                if entry.deadline is not None and time.monotonic() >= entry.deadline:
+                    self._settle(entry, error=SimStudioError(
+                        f'Workflow job {entry.job.task_id} did not finish in time',
+                        'TIMEOUT'
+                    ))
+                    continue
+                self._in_flight += 1
+                self._next_slot = max(time.monotonic(), self._next_slot) + self._poll_interval
+            try:
+                self._pollers.submit(self._poll, entry)
+            except RuntimeError:  # closed while the job was being dispatched
+                entry.future.cancel()
+                return
+
+    def _next_due(self) -> Optional[_TrackedJob]:
+        """Block (holding the condition) until a job is due and a poll slot is free."""
+        while not self._closed:
+            if not self._heap or self._in_flight >= self._max_concurrent_polls:
+                self._cond.wait()
+                continue
+            ready_at = max(self._heap[0][0], self._next_slot)
+            now = time.monotonic()
+            if ready_at > now:
+                self._cond.wait(ready_at - now)
+                continue
+            return heapq.heappop(self._heap)[2]
+        return None
+
+    def _poll(self, entry: _TrackedJob) -> None:
+        try:
+            status = self._client.get_job_status(entry.job.task_id, self._timeout)
+        except SimStudioError as e:
+            entry.errors += 1
+            if e.status in _FATAL_POLL_STATUSES or entry.errors >= self._max_poll_errors:
+                self._settle(entry, error=e)
+            else:
+                self._reschedule(entry)
+        except Exception as e:
+            self._settle(entry, error=e)
+        else:
+            entry.errors = 0
+            entry.job.status = status.status
+            if status.is_final:
+                self._settle(entry, result=_result_from_job(status))
+            else:
+                entry.estimated_duration = status.estimated_duration
+                self._reschedule(entry)
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify()
+
+    def _reschedule(self, entry: _TrackedJob) -> None:
+        now = time.monotonic()
+        delay = _next_poll_delay(now - entry.job.submitted_at, entry.estimated_duration)
+        self._schedule(entry, now + delay)
+
+    @staticmethod
+    def _settle(
+        entry: _TrackedJob,
+        result: Optional[WorkflowExecutionResult] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        try:
+            if error is not None:
+                entry.future.set_exception(error)
+            else:
+                entry.future.set_result(result)
+        except InvalidStateError:
+            pass  # cancelled by the caller in the meantime
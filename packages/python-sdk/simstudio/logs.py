@@ -0,0 +1,139 @@
+"""
+Columnar export of execution logs to Parquet.
+
+Requires the optional ``pyarrow`` dependency (``pip install "simstudio-sdk[parquet]"``).
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    pa = None
+    pq = None
+
+_COLUMN_NAMES = (
+    'id', 'execution_id', 'workflow_id', 'workflow_name', 'workspace_id', 'folder_id', 'level',
+    'trigger', 'created_at', 'duration_ms', 'cost_total', 'tokens_total', 'execution_data',
+)
+
+
+def _schema() -> "pa.Schema":
+    return pa.schema([
+        ('id', pa.string()),
+        ('execution_id', pa.string()),
+        ('workflow_id', pa.string()),
+        ('workflow_name', pa.string()),
+        ('workspace_id', pa.string()),
+        ('folder_id', pa.string()),
+        ('level', pa.string()),
+        ('trigger', pa.string()),
+        ('created_at', pa.timestamp('ms', tz='UTC')),
+        ('duration_ms', pa.int64()),
+        ('cost_total', pa.float64()),
+        ('tokens_total', pa.int64()),
+        ('execution_data', pa.string()),
+    ])
+
+
+def _duration_ms(value: Any) -> Optional[int]:
+    """Parse the API's ``'1234ms'`` durations."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str) and value.endswith('ms'):
+        try:
+            return int(float(value[:-2]))
+        except ValueError:
+            return None
+    return None
+
+
+def _log_columns(rows: Sequence[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Flatten log rows from ``iter_logs`` into one list per LogWriter column.
+
+    Nested values are read defensively: rows fetched with ``details='basic'`` carry no
+    execution ID, token counts or execution data, which become nulls.
+    """
+    columns: Dict[str, List[Any]] = {name: [] for name in _COLUMN_NAMES}
+    for row in rows:
+        workflow = row.get('workflow') or {}
+        cost = row.get('cost') or {}
+        tokens = cost.get('tokens') or {}
+        execution_data = row.get('executionData')
+        columns['id'].append(row.get('id'))
+        columns['execution_id'].append(row.get('executionId'))
+        columns['workflow_id'].append(row.get('workflowId'))
+        columns['workflow_name'].append(workflow.get('name'))
+        columns['workspace_id'].append(workflow.get('workspaceId'))
+        columns['folder_id'].append(workflow.get('folderId'))
+        columns['level'].append(row.get('level'))
+        columns['trigger'].append(row.get('trigger'))
+        columns['created_at'].append(row.get('createdAt'))
+        columns['duration_ms'].append(_duration_ms(row.get('duration')))
+        total = cost.get('total')
+        columns['cost_total'].append(float(total) if total is not None else None)
+        columns['tokens_total'].append(tokens.get('total'))
+        columns['execution_data'].append(
+            None if execution_data is None else json.dumps(execution_data, separators=(',', ':'))
+        )
+    return columns
+
+
+class LogWriter:
+    """
+    Appends execution log rows to a Parquet file, one row group per ``write``.
+
+    Only the rows of the current batch are held in memory, so exports of any size run in
+    constant memory. Repeated strings (workflow, level, trigger) are dictionary-encoded
+    by Parquet. Columns: ``id``, ``execution_id``, ``workflow_id``, ``workflow_name``,
+    ``workspace_id``, ``folder_id``, ``level``, ``trigger``, ``created_at`` (UTC
+    timestamp), ``duration_ms``, ``cost_total``, ``tokens_total`` and ``execution_data``
+    (JSON, with ``details='full'`` only).
+
+    Args:
+        path: Parquet file to create (overwritten if it exists)
+        compression: Parquet compression codec (default: ``'zstd'``)
+
+    Attributes:
+        rows_written: Rows written so far
+    """
+
+    def __init__(self, path: str, compression: str = 'zstd'):
+        if pa is None:
+            raise ImportError(
+                'LogWriter requires pyarrow. '
+                'Install it with: pip install "simstudio-sdk[parquet]"'
+            )
+        self.path = path
+        self.rows_written = 0
+        self._schema = _schema()
+        self._writer = pq.ParquetWriter(path, self._schema, compression=compression)
+
+    def write(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Write ``rows`` (log dicts from ``iter_logs``) as one row group."""
+        if not rows:
+            return
+        columns = _log_columns(rows)
+        arrays = []
+        for field in self._schema:
+            values = columns[field.name]
+            if field.name == 'created_at':
+                # ISO 8601 strings with a 'Z' suffix cast directly to UTC timestamps.
+                arrays.append(pa.array(values, pa.string()).cast(field.type))
+            else:
+                arrays.append(pa.array(values, field.type))
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        """Finish the file; it is not a valid Parquet file before this."""
+        self._writer.close()
+
+    def __enter__(self) -> "LogWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
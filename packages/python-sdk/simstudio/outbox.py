@@ -0,0 +1,428 @@
+"""
+Durable client-side outbox for queued workflow executions.
+"""
+
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+from . import (
+    RateLimitError,
+    SimStudioError,
+    WorkflowExecutionResult,
+    WorkflowJob,
+    _parse_execution_result,
+    _result_payload,
+)
+from .jobs import _FATAL_POLL_STATUSES
+from .retry import _is_connect_failure
+
+if TYPE_CHECKING:
+    from . import SimStudioClient
+
+# Submission answers that show the execution was not queued, so sending it again is safe.
+# A 502 or 504 comes from a gateway and says nothing about whether the upstream queued it.
+_RESEND_STATUSES = frozenset([429, 503])
+# Entries the outbox still has to act on.
+_UNSETTLED_STATES = ('pending', 'sending', 'queued')
+_INTERRUPTED = 'Interrupted while sending; the execution may or may not have been queued'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    workflow_id TEXT NOT NULL,
+    input BLOB NOT NULL,
+    state TEXT NOT NULL,
+    task_id TEXT,
+    result BLOB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_state ON outbox (state, id);
+'''
+
+
+@dataclass
+class OutboxEntry:
+    """
+    One workflow execution recorded in an Outbox.
+
+    Attributes:
+        id: Position of the entry in the outbox; entries are sent in this order
+        workflow_id: The workflow to execute
+        input_data: Input data for the workflow
+        state: ``'pending'`` (waiting to be sent), ``'sending'``, ``'queued'`` (accepted,
+            see ``task_id``), ``'completed'``, ``'failed'`` or ``'unknown'`` (the outcome
+            of sending it is not known; it is not sent again unless requeued)
+        task_id: Task ID of the queued execution
+        result: Final result, once the execution has finished
+        error: Why the entry failed, or why its outcome is unknown
+        attempts: Times the entry was sent
+    """
+
+    id: int
+    workflow_id: str
+    input_data: Optional[Dict[str, Any]]
+    state: str
+    task_id: Optional[str] = None
+    result: Optional[WorkflowExecutionResult] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+
+class Outbox:
+    """
+    Durable queue of workflow executions, sent through the async execution path.
+
+    ``submit_workflow`` appends the execution to a SQLite database (in WAL mode) and
+    returns once it is stored, so queued work survives crashes and redeployments of the
+    producing process. A background drain loop reads pending entries in batches, in the
+    order they were added, and queues them with ``X-Execution-Mode: async`` at no more
+    than ``rate`` submissions per second. Task IDs and final results, polled through the
+    client's JobTracker, are written back to the database.
+
+    Opening the same file again resumes where the last outbox stopped: pending entries
+    are sent and queued ones are polled, without sending anything twice. Each entry is
+    marked as being sent before its request goes out. An entry still marked after a
+    crash, or whose request failed in a way that leaves open whether the execution was
+    queued (a timeout, a dropped connection, a 500, 502 or 504 answer), becomes
+    ``'unknown'`` and is only sent again after ``requeue_unknown``. Answers that show it
+    was not queued (connection failures, 429 and 503) are retried with jittered backoff,
+    and a 429 pauses the drain until the rate limit resets.
+
+    One outbox at a time should use a database file.
+
+    Args:
+        client: The SimStudioClient used to send and poll executions
+        path: Path of the SQLite database
+        rate: Maximum submissions per second (default: 10.0)
+        batch_size: Pending entries read from the database at once (default: 100)
+        max_concurrency: Maximum submissions in flight (default: 4)
+        timeout: Timeout for each submission in seconds (default: 30.0)
+        max_backoff: Longest delay in seconds before resending an entry (default: 60.0)
+    """
+
+    def __init__(
+        self,
+        client: "SimStudioClient",
+        path: str,
+        rate: float = 10.0,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        timeout: float = 30.0,
+        max_backoff: float = 60.0,
+    ):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        self._client = client
+        self._codec = client._codec
+        self._interval = 1.0 / rate
+        self._batch_size = batch_size
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._max_backoff = max_backoff
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._next_slot = 0.0
+        self._closed = False
+        self._tracked: Set[Future] = set()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db_open = True
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(_SCHEMA)
+        self._db.execute(
+            "UPDATE outbox SET state = 'unknown', error = ? WHERE state = 'sending'",
+            (_INTERRUPTED,)
+        )
+        queued = self._db.execute(
+            "SELECT id, workflow_id, task_id FROM outbox WHERE state = 'queued' ORDER BY id"
+        ).fetchall()
+        self._senders = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix='simstudio-outbox-send'
+        )
+        for entry_id, workflow_id, task_id in queued:
+            self._track(entry_id, WorkflowJob(task_id, workflow_id))
+        self._thread = threading.Thread(target=self._run, name='simstudio-outbox', daemon=True)
+        self._thread.start()
+
+    def submit_workflow(self, workflow_id: str, input_data: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Durably record a workflow execution to be queued.
+
+        Args:
+            workflow_id: The ID of the workflow to execute
+            input_data: Input data to pass to the workflow
+
+        Returns:
+            ID of the outbox entry, for ``get``
+        """
+        body = self._codec.dumps(input_data)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('Outbox is closed')
+            cursor = self._db.execute(
+                'INSERT INTO outbox (workflow_id, input, state, created_at) '
+                "VALUES (?, ?, 'pending', ?)",
+                (workflow_id, body, time.time())
+            )
+            self._cond.notify_all()
+        assert cursor.lastrowid is not None
+        return cursor.lastrowid
+
+    def get(self, entry_id: int) -> Optional[OutboxEntry]:
+        """The entry with this ID, or None if there is none (or it was purged)."""
+        with self._cond:
+            row = self._query('WHERE id = ?', (entry_id,))
+        return row[0] if row else None
+
+    def entries(self, state: Optional[str] = None) -> List[OutboxEntry]:
+        """All entries in order, or only those in ``state``."""
+        with self._cond:
+            if state is None:
+                return self._query('ORDER BY id', ())
+            return self._query('WHERE state = ? ORDER BY id', (state,))
+
+    def stats(self) -> Dict[str, int]:
+        """Number of entries in each state."""
+        with self._cond:
+            return dict(self._db.execute('SELECT state, COUNT(*) FROM outbox GROUP BY state'))
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until no entry is pending, being sent or queued.
+
+        Args:
+            timeout: Maximum seconds to wait (default: no limit)
+
+        Returns:
+            True if every entry has settled, False if ``timeout`` passed first
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                if self._closed:
+                    return self._db_open and not self._unsettled()
+                if not self._unsettled():
+                    return True
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+
+    def requeue_unknown(self) -> int:
+        """
+        Send entries whose outcome is unknown again, accepting that some may run twice.
+
+        Returns:
+            Number of entries requeued
+        """
+        with self._cond:
+            count = self._db.execute(
+                "UPDATE outbox SET state = 'pending', error = NULL, not_before = 0 "
+                "WHERE state = 'unknown'"
+            ).rowcount
+            self._cond.notify_all()
+        return count
+
+    def purge(self) -> int:
+        """
+        Delete completed and failed entries.
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._cond:
+            return self._db.execute(
+                "DELETE FROM outbox WHERE state IN ('completed', 'failed')"
+            ).rowcount
+
+    def close(self) -> None:
+        """
+        Stop draining. Submissions in flight are recorded; everything else resumes when
+        the database is opened again.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            tracked = list(self._tracked)
+            self._cond.notify_all()
+        for future in tracked:
+            future.cancel()
+        self._thread.join()
+        self._senders.shutdown(wait=True)
+        with self._cond:
+            self._db_open = False
+            self._db.close()
+            self._cond.notify_all()
+
+    def __enter__(self) -> "Outbox":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def _query(self, where: str, params: tuple) -> List[OutboxEntry]:
+        rows = self._db.execute(
+            'SELECT id, workflow_id, input, state, task_id, result, error, attempts '
+            f'FROM outbox {where}',
+            params
+        )
+        return [
+            OutboxEntry(
+                id=entry_id,
+                workflow_id=workflow_id,
+                input_data=self._codec.loads(body),
+                state=state,
+                task_id=task_id,
+                result=_parse_execution_result(self._codec.loads(result)) if result else None,
+                error=error,
+                attempts=attempts,
+            )
+            for entry_id, workflow_id, body, state, task_id, result, error, attempts in rows
+        ]
+
+    def _unsettled(self) -> bool:
+        return self._db.execute(
+            'SELECT 1 FROM outbox WHERE state IN (?, ?, ?) LIMIT 1', _UNSETTLED_STATES
+        ).fetchone() is not None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                batch = self._next_batch()
+            if batch is None:
+                return
+            for entry_id, workflow_id, body in batch:
+                with self._cond:
+                    if not self._await_slot():
+                        return
+                    marked = self._db.execute(
+                        "UPDATE outbox SET state = 'sending', attempts = attempts + 1 "
+                        "WHERE id = ? AND state = 'pending'",
+                        (entry_id,)
+                    ).rowcount
+                    if not marked:
+                        continue
+                    self._in_flight += 1
+                    self._next_slot = max(time.monotonic(), self._next_slot) + self._interval
+                    self._senders.submit(self._send, entry_id, workflow_id, body)
+
+    def _next_batch(self) -> Optional[List[tuple]]:
+        """Block (holding the condition) until pending entries are due; None once closed."""
+        while not self._closed:
+            now = time.time()
+            batch = self._db.execute(
+                "SELECT id, workflow_id, input FROM outbox "
+                "WHERE state = 'pending' AND not_before <= ? ORDER BY id LIMIT ?",
+                (now, self._batch_size)
+            ).fetchall()
+            if batch:
+                return batch
+            due = self._db.execute(
+                "SELECT MIN(not_before) FROM outbox WHERE state = 'pending'"
+            ).fetchone()[0]
+            self._cond.wait(None if due is None else max(0.0, due - now))
+        return None
+
+    def _await_slot(self) -> bool:
+        """Block (holding the condition) until a submission may start; False once closed."""
+        while not self._closed:
+            if self._in_flight >= self._max_concurrency:
+                self._cond.wait()
+                continue
+            now = time.monotonic()
+            if self._next_slot > now:
+                self._cond.wait(self._next_slot - now)
+                continue
+            return True
+        return False
+
+    def _send(self, entry_id: int, workflow_id: str, body: bytes) -> None:
+        try:
+            submitted = self._client._submit(workflow_id, self._codec.loads(body), self._timeout)
+        except SimStudioError as e:
+            self._on_send_error(entry_id, e)
+        except Exception as e:
+            self._update(entry_id, 'unknown', error=str(e))
+        else:
+            if isinstance(submitted, WorkflowJob):
+                self._update(entry_id, 'queued', task_id=submitted.task_id)
+                self._track(entry_id, submitted)
+            else:  # the server ran the workflow inline
+                self._finish(entry_id, submitted)
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def _on_send_error(self, entry_id: int, error: SimStudioError) -> None:
+        if error.status in _RESEND_STATUSES or _is_connect_failure(error):
+            with self._cond:
+                attempts = self._db.execute(
+                    'SELECT attempts FROM outbox WHERE id = ?', (entry_id,)
+                ).fetchone()[0]
+                delay = random.uniform(0, min(self._max_backoff, 0.5 * 2 ** (attempts - 1)))
+                if isinstance(error, RateLimitError) and error.reset_at is not None:
+                    delay = max(delay, error.reset_at.timestamp() - time.time())
+                if isinstance(error, RateLimitError):
+                    # Every submission would be rejected until the window resets.
+                    self._next_slot = max(self._next_slot, time.monotonic() + delay)
+                self._update(entry_id, 'pending', error=str(error), not_before=time.time() + delay)
+        elif error.status is not None and 400 <= error.status < 500:
+            self._update(entry_id, 'failed', error=str(error))
+        else:
+            self._update(entry_id, 'unknown', error=str(error))
+
+    def _track(self, entry_id: int, job: WorkflowJob) -> None:
+        future = self._client.job_tracker.track(job)
+        with self._cond:
+            if self._closed:
+                future.cancel()
+                return
+            self._tracked.add(future)
+        future.add_done_callback(lambda done: self._on_job_done(entry_id, job, done))
+
+    def _on_job_done(self, entry_id: int, job: WorkflowJob, future: Future) -> None:
+        with self._cond:
+            self._tracked.discard(future)
+        if future.cancelled():
+            return  # closing; the entry stays queued and is polled again on reopening
+        error = future.exception()
+        if error is None:
+            self._finish(entry_id, future.result())
+        elif isinstance(error, SimStudioError) and error.status in _FATAL_POLL_STATUSES:
+            self._update(entry_id, 'failed', error=str(error))
+        elif not self._closed:
+            self._track(entry_id, job)
+
+    def _finish(self, entry_id: int, result: WorkflowExecutionResult) -> None:
+        self._update(
+            entry_id,
+            'completed' if result.success else 'failed',
+            result=self._codec.dumps(_result_payload(result)),
+            error=None if result.success else str(result.error),
+        )
+
+    def _update(self, entry_id: int, state: str, **columns: Any) -> None:
+        assignments = ''.join(f', {column} = ?' for column in columns)
+        with self._cond:
+            if not self._db_open:
+                return
+            self._db.execute(
+                f'UPDATE outbox SET state = ?{assignments} WHERE id = ?',
+                (state, *columns.values(), entry_id)
+            )
+            self._cond.notify_all()
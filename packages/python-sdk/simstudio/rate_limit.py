@@ -0,0 +1,207 @@
+"""
+Client-side adaptive rate limiting for workflow executions.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from . import RateLimitError
+
+T = TypeVar('T')
+
+# Upper bound on how long an async waiter sleeps before re-checking for a free slot.
+_ASYNC_RECHECK_INTERVAL = 0.05
+
+# Pause after a 429 that carries no (or an already elapsed) reset time.
+_MIN_RATE_LIMIT_PAUSE = 0.1
+
+
+class RateLimiter:
+    """
+    Token bucket plus AIMD concurrency limiter shared by every caller of one API key.
+
+    Callers queue for a token and a concurrency slot instead of failing. When the server
+    answers 429, its ``remaining``/``resetAt`` replace the local budget: all callers pause
+    until the window resets, the concurrency limit is halved (multiplicative decrease),
+    and the rejected call is retried. The limit is halved once per burst of 429s: calls
+    sent before the last decrease cannot halve it again. Each successful call then grows
+    the limit by ``1/limit`` (additive increase), so a fleet settles just below its quota.
+
+    Safe to share across threads and asyncio tasks.
+
+    Args:
+        requests_per_minute: Local budget to refill the bucket at. ``None`` (default) relies
+            only on the server's 429 responses.
+        burst: Bucket capacity (defaults to ``requests_per_minute``)
+        max_concurrency: Upper bound for the adaptive concurrency limit (default: 64)
+        min_concurrency: Lower bound for the adaptive concurrency limit (default: 1)
+        max_wait: Maximum seconds a call may spend queued or retrying after 429s before
+            the RateLimitError is raised (default: 120.0, ``None`` for no limit)
+    """
+
+    _shared: Dict[str, "RateLimiter"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_concurrency: int = 64,
+        min_concurrency: int = 1,
+        max_wait: Optional[float] = 120.0,
+    ):
+        if min_concurrency < 1 or max_concurrency < min_concurrency:
+            raise ValueError('Expected 1 <= min_concurrency <= max_concurrency')
+        self._rate = requests_per_minute / 60.0 if requests_per_minute else None
+        self._capacity = float(burst if burst is not None else (requests_per_minute or 0))
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased_at = 0.0
+        self._min_concurrency = float(min_concurrency)
+        self._max_concurrency = float(max_concurrency)
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._max_wait = max_wait
+        self._cond = threading.Condition()
+
+    @classmethod
+    def shared(cls, api_key: str) -> "RateLimiter":
+        """Return the process-wide limiter for an API key, creating it with defaults."""
+        key = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+        with cls._shared_lock:
+            limiter = cls._shared.get(key)
+            if limiter is None:
+                limiter = cls._shared[key] = cls()
+            return limiter
+
+    @property
+    def concurrency_limit(self) -> int:
+        """Current adaptive concurrency limit."""
+        with self._cond:
+            return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently holding a slot."""
+        with self._cond:
+            return self._in_flight
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """
+        Run ``fn`` under the limiter, queueing for budget and retrying it after 429s.
+
+        Raises:
+            RateLimitError: If no budget frees up within ``max_wait``
+        """
+        deadline = self._deadline()
+        while True:
+            sent_at = self._acquire(deadline)
+            try:
+                result = fn()
+            except RateLimitError as e:
+                self._release()
+                self._on_rate_limited(e, deadline, sent_at)
+                continue
+            except BaseException:
+                self._release()
+                raise
+            self._release(succeeded=True)
+            return result
+
+    async def call_async(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Asyncio version of ``call``."""
+        deadline = self._deadline()
+        while True:
+            sent_at = await self._acquire_async(deadline)
+            try:
+                result = await fn()
+            except RateLimitError as e:
+                self._release()
+                self._on_rate_limited(e, deadline, sent_at)
+                continue
+            except BaseException:
+                self._release()
+                raise
+            self._release(succeeded=True)
+            return result
+
+    def _deadline(self) -> Optional[float]:
+        return time.monotonic() + self._max_wait if self._max_wait is not None else None
+
+    def _try_acquire(self, now: float) -> Optional[float]:
+        """Take a slot and a token if both are free (returns None), else the seconds to wait."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self._limit):
+            return _ASYNC_RECHECK_INTERVAL
+        if self._rate is not None:
+            refilled = (now - self._refilled_at) * self._rate
+            self._tokens = min(self._capacity, self._tokens + refilled)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self._rate
+            self._tokens -= 1
+        self._in_flight += 1
+        return None
+
+    def _acquire(self, deadline: Optional[float]) -> float:
+        """Wait for a slot and a token, returning the time they were taken."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = self._try_acquire(now)
+                if wait is None:
+                    return now
+                if deadline is not None and now + wait > deadline:
+                    raise RateLimitError('Timed out waiting for rate limit budget')
+                self._cond.wait(wait)
+
+    async def _acquire_async(self, deadline: Optional[float]) -> float:
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                wait = self._try_acquire(now)
+            if wait is None:
+                return now
+            if deadline is not None and now + wait > deadline:
+                raise RateLimitError('Timed out waiting for rate limit budget')
+            await asyncio.sleep(min(wait, _ASYNC_RECHECK_INTERVAL))
+
+    def _release(self, succeeded: bool = False) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if succeeded:
+                self._limit = min(self._max_concurrency, self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+
+    def _on_rate_limited(
+        self, error: RateLimitError, deadline: Optional[float], sent_at: float
+    ) -> None:
+        """
+        Adopt the server's budget after a 429 for a call sent at ``sent_at``; re-raise it
+        if the reset is past the deadline.
+        """
+        now = time.monotonic()
+        pause = 1.0
+        if error.reset_at is not None:
+            pause = error.reset_at.timestamp() - time.time()
+        resume_at = now + max(_MIN_RATE_LIMIT_PAUSE, pause)
+        if deadline is not None and resume_at > deadline:
+            raise error
+
+        with self._cond:
+            # Concurrent 429s answer calls sent under the same limit: halve it once.
+            if sent_at >= self._decreased_at:
+                self._limit = max(self._min_concurrency, self._limit / 2)
+                self._decreased_at = now
+            if not error.remaining:
+                self._paused_until = max(self._paused_until, resume_at)
+                self._tokens = self._capacity
+                self._refilled_at = resume_at
+            elif self._rate is not None:
+                self._tokens = min(self._tokens, float(error.remaining))
+            self._cond.notify_all()
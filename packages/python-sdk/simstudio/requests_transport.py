@@ -0,0 +1,240 @@
+"""
+Transport built on ``requests``.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError, NewConnectionError
+
+from .instrumentation import _PhaseTimingMixin
+from .transport import (
+    PoolConfig,
+    PoolStats,
+    Response,
+    Transport,
+    TransportError,
+    TransportTimeout,
+    _PoolCounters,
+)
+
+
+class _TimedHTTPConnection(_PhaseTimingMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_PhaseTimingMixin, HTTPSConnection):
+    pass
+
+
+class _PoolStatsMixin:
+    """
+    Connection pool that feeds a transport's PoolStats, closes connections idle for
+    longer than ``_idle_timeout`` and bounds blocking checkouts by ``_block_timeout``.
+    """
+
+    _counters: _PoolCounters
+    _idle_timeout: Optional[float] = None
+    _block_timeout: Optional[float] = None
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        if self.block:  # type: ignore[attr-defined]
+            if timeout is None:
+                timeout = self._block_timeout
+            if self.pool is not None and self.pool.empty():  # type: ignore[attr-defined]
+                self._counters.waited()
+        connection = super()._get_conn(timeout)  # type: ignore[misc]
+        released_at = getattr(connection, '_released_at', None)
+        if (
+            self._idle_timeout is not None
+            and released_at is not None
+            and connection.sock is not None
+            and time.monotonic() - released_at > self._idle_timeout
+        ):
+            connection.close()
+            self._counters.expired()
+        self._counters.acquired(reused=connection.sock is not None)
+        return connection
+
+    def _put_conn(self, connection: Any) -> None:
+        # urllib3 puts back None for a connection it closed after an error.
+        if connection is not None:
+            connection._released_at = time.monotonic()
+        # A closed pool (one whose adapter was replaced) closes connections handed back.
+        pool = self.pool  # type: ignore[attr-defined]
+        self._counters.released(discarded=connection is None or pool is None or pool.full())
+        super()._put_conn(connection)  # type: ignore[misc]
+
+
+class _PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose urllib3 pools are built from ``pool_classes``, and which can be
+    retired: it then closes its pools once the requests being sent through it are done.
+    """
+
+    def __init__(self, pool_classes: Dict[str, type], **kwargs: Any):
+        self._pool_classes = pool_classes
+        self._lock = threading.Lock()
+        self._sending = 0
+        self._retired = False
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._pool_classes
+
+    def close(self) -> None:
+        # PoolManager.clear() forgets its pools without closing their idle connections.
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                pool.close()
+        super().close()
+
+    def send(self, *args: Any, **kwargs: Any) -> requests.Response:
+        with self._lock:
+            self._sending += 1
+        try:
+            return super().send(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._sending -= 1
+                drained = self._retired and self._sending == 0
+            if drained:
+                self.close()
+
+    def retire(self) -> None:
+        """
+        Close idle connections once no request is being sent. Streamed bodies still being
+        read keep their connection, which is closed instead of pooled when released.
+        """
+        with self._lock:
+            self._retired = True
+            drained = self._sending == 0
+        if drained:
+            self.close()
+
+
+def _guarded_read(response: requests.Response) -> Callable[[int], bytes]:
+    """
+    Read a streamed body through ``iter_content``, so requests returns the connection to
+    its pool once the body is consumed, with read failures surfacing as transport errors.
+    """
+    chunks: Optional[Iterator[bytes]] = None
+
+    def read(size: int) -> bytes:
+        nonlocal chunks
+        if chunks is None:
+            chunks = response.iter_content(size)
+        try:
+            return next(chunks, b'')
+        except requests.Timeout as e:
+            raise TransportTimeout(str(e)) from e
+        except requests.RequestException as e:
+            raise TransportError(str(e)) from e
+    return read
+
+
+class RequestsTransport(Transport):
+    """
+    Transport on a ``requests.Session``, so proxies, ``REQUESTS_CA_BUNDLE`` and other
+    requests settings apply. ``session`` can be adjusted directly (e.g. adapters, auth).
+
+    Args:
+        pool: Connection pool settings (default: PoolConfig())
+        instrumented: Use connections that record phase timings for client hooks
+    """
+
+    def __init__(self, pool: Optional[PoolConfig] = None, instrumented: bool = False):
+        super().__init__()
+        self.session = requests.Session()
+        self.headers = self.session.headers  # type: ignore[assignment]
+        self._connection_classes = (
+            (_TimedHTTPConnection, _TimedHTTPSConnection) if instrumented
+            else (HTTPConnection, HTTPSConnection)
+        )
+        self._counters = _PoolCounters()
+        self.configure_pool(pool or PoolConfig())
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[Union[bytes, memoryview]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        try:
+            # requests sends a memoryview as a sized stream; its stubs only list bytes.
+            response = self.session.request(
+                method, url, data=body,  # type: ignore[arg-type]
+                headers=headers, timeout=timeout, stream=stream,
+            )
+        except requests.ConnectTimeout as e:
+            raise TransportTimeout(str(e), connect=True) from e
+        except requests.Timeout as e:
+            raise TransportTimeout(str(e)) from e
+        except requests.ConnectionError as e:
+            # requests wraps urllib3's MaxRetryError, whose reason tells a refused or
+            # unresolvable connection apart from one that broke after sending.
+            reason = getattr(e.args[0], 'reason', None) if e.args else None
+            raise TransportError(str(e), connect=isinstance(reason, NewConnectionError)) from e
+        except EmptyPoolError as e:
+            # requests passes urllib3's error through when a blocking pool stays exhausted.
+            raise TransportTimeout(
+                f'Timed out after {self.pool.block_timeout}s waiting for a pooled connection'
+            ) from e
+        except requests.RequestException as e:
+            raise TransportError(str(e)) from e
+
+        if not stream:
+            return Response(
+                response.status_code, response.reason, response.headers, content=response.content
+            )
+        return Response(
+            response.status_code,
+            response.reason,
+            response.headers,
+            read=_guarded_read(response),
+            release=response.close,
+        )
+
+    def configure_pool(self, config: PoolConfig) -> None:
+        self.pool = config
+        plain_class, secure_class = self._connection_classes
+        settings = {
+            '_counters': self._counters,
+            '_idle_timeout': config.idle_timeout,
+            '_block_timeout': config.block_timeout,
+        }
+        adapter = _PooledAdapter(
+            {
+                'http': type('_HTTPConnectionPool', (_PoolStatsMixin, HTTPConnectionPool),
+                             dict(settings, ConnectionCls=plain_class)),
+                'https': type('_HTTPSConnectionPool', (_PoolStatsMixin, HTTPSConnectionPool),
+                              dict(settings, ConnectionCls=secure_class)),
+            },
+            pool_maxsize=config.max_connections,
+            pool_block=config.block,
+        )
+        # Replace the adapters in place: Session.mount reorders the adapter dict, which
+        # can break a get_adapter lookup running in another thread. In-flight requests
+        # finish on the previous adapter's connections before it is closed.
+        previous = self.session.adapters.get('http://')
+        self.session.adapters['https://'] = adapter
+        self.session.adapters['http://'] = adapter
+        if isinstance(previous, _PooledAdapter):
+            previous.retire()
+
+    def pool_stats(self) -> PoolStats:
+        return self._counters.snapshot()
+
+    def close(self) -> None:
+        self.session.close()
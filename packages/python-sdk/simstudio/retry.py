@@ -0,0 +1,245 @@
+"""
+Retries with jittered backoff and a per-workflow circuit breaker.
+"""
+
+import asyncio
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, TypeVar
+
+from . import RateLimitError, SimStudioError
+from .transport import TransportError
+
+T = TypeVar('T')
+
+# Attempts are not started with less time than this left before the deadline.
+_MIN_ATTEMPT_TIMEOUT = 0.05
+
+
+def _is_connect_failure(error: BaseException) -> bool:
+    """Whether a SimStudioError was caused by a connection that was never established."""
+    cause = error.__cause__
+    if isinstance(cause, TransportError):
+        return cause.connect
+    # The async client raises from httpx errors; only inspect them if httpx is loaded.
+    httpx = sys.modules.get('httpx')
+    return httpx is not None and isinstance(cause, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+def _counts_against_circuit(error: BaseException) -> bool:
+    """Server-side failures (timeouts, transport errors, 5xx) count; client errors do not."""
+    if not isinstance(error, SimStudioError) or isinstance(error, RateLimitError):
+        return False
+    if error.status is None:
+        return error.code in ('TIMEOUT', 'EXECUTION_ERROR')
+    return error.status >= 500
+
+
+class RetryPolicy:
+    """
+    Retries failed requests that cannot have run the workflow.
+
+    Retried are connection failures (the request was never sent), 502/503/504 answers
+    from a gateway, and 429 answers once their ``resetAt`` has passed. Delays grow
+    exponentially with full jitter, so clients that failed together do not retry
+    together. All attempts and the waits between them share one deadline: the
+    ``timeout`` of the call.
+
+    Args:
+        max_attempts: Attempts per call, including the first (default: 4)
+        base_delay: Upper bound of the first backoff delay in seconds (default: 0.25)
+        max_delay: Upper bound of any backoff delay in seconds (default: 10.0)
+        retry_statuses: HTTP statuses to retry (default: 502, 503 and 504)
+        retry_rate_limited: Retry 429 answers after their reset time (default: True)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.25,
+        max_delay: float = 10.0,
+        retry_statuses: Iterable[int] = (502, 503, 504),
+        retry_rate_limited: bool = True,
+    ):
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses: FrozenSet[int] = frozenset(retry_statuses)
+        self.retry_rate_limited = retry_rate_limited
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered delay before retry number ``attempt`` (1 for the first retry)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying after ``error``, or None if it is not retryable."""
+        if attempt >= self.max_attempts or not isinstance(error, SimStudioError):
+            return None
+        if isinstance(error, RateLimitError):
+            if not self.retry_rate_limited:
+                return None
+            if error.reset_at is None:
+                return self.backoff(attempt)
+            wait = (error.reset_at - datetime.now(timezone.utc)).total_seconds()
+            # A little jitter past the reset, so waiting clients do not return at once.
+            return max(0.0, wait) + random.uniform(0, self.base_delay)
+        if error.status in self.retry_statuses or _is_connect_failure(error):
+            return self.backoff(attempt)
+        return None
+
+    def call(self, fn: Callable[[float], T], timeout: float) -> T:
+        """
+        Run ``fn(remaining_seconds)`` until it succeeds, retrying within ``timeout``.
+
+        Raises:
+            The last error, if it is not retryable, attempts are exhausted or the next
+            attempt could not start before the deadline
+        """
+        deadline = time.monotonic() + timeout
+        attempt = 1
+        while True:
+            try:
+                return fn(round(max(deadline - time.monotonic(), _MIN_ATTEMPT_TIMEOUT), 3))
+            except SimStudioError as e:
+                wait = self._wait_before_retry(e, attempt, deadline)
+            time.sleep(wait)
+            attempt += 1
+
+    async def call_async(self, fn: Callable[[float], Awaitable[T]], timeout: float) -> T:
+        """Asyncio version of ``call``."""
+        deadline = time.monotonic() + timeout
+        attempt = 1
+        while True:
+            try:
+                return await fn(round(max(deadline - time.monotonic(), _MIN_ATTEMPT_TIMEOUT), 3))
+            except SimStudioError as e:
+                wait = self._wait_before_retry(e, attempt, deadline)
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    def _wait_before_retry(self, error: SimStudioError, attempt: int, deadline: float) -> float:
+        """The delay before the next attempt; re-raises ``error`` if there is none."""
+        wait = self.delay(error, attempt)
+        if wait is None or time.monotonic() + wait + _MIN_ATTEMPT_TIMEOUT > deadline:
+            raise error
+        return wait
+
+
+class _Circuit:
+    __slots__ = ('failures', 'opened_at', 'probing')
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast for workflows that keep failing.
+
+    After ``failure_threshold`` consecutive failures of a workflow (timeouts, transport
+    errors and 5xx answers; client errors such as 400 or 429 do not count), its circuit
+    opens: calls raise SimStudioError with code ``CIRCUIT_OPEN`` without contacting the
+    server. After ``reset_timeout`` one trial call is let through; it closes the circuit
+    if it succeeds and reopens it if it fails. Other workflows are unaffected.
+
+    Safe to share across threads, asyncio tasks and clients.
+
+    Args:
+        failure_threshold: Consecutive failures that open a circuit (default: 5)
+        reset_timeout: Seconds a circuit stays open before a trial call (default: 30.0)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be at least 1')
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits: Dict[Hashable, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def state(self, key: Hashable) -> str:
+        """``'closed'``, ``'open'`` or ``'half_open'`` (open, with a trial call due)."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.opened_at is None:
+                return 'closed'
+            if time.monotonic() - circuit.opened_at < self.reset_timeout:
+                return 'open'
+            return 'half_open'
+
+    def reset(self, key: Optional[Hashable] = None) -> None:
+        """Close the circuit for ``key``, or all circuits when ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(key, None)
+
+    def call(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run ``fn`` unless the circuit for ``key`` is open, recording its outcome.
+
+        Raises:
+            SimStudioError: With code ``CIRCUIT_OPEN`` while the circuit is open
+        """
+        self._before(key)
+        try:
+            result = fn()
+        except BaseException as e:
+            self._after(key, e)
+            raise
+        self._after(key, None)
+        return result
+
+    async def call_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Asyncio version of ``call``."""
+        self._before(key)
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._after(key, e)
+            raise
+        self._after(key, None)
+        return result
+
+    def _before(self, key: Hashable) -> None:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.opened_at is None:
+                return
+            retry_in = circuit.opened_at + self.reset_timeout - time.monotonic()
+            if retry_in <= 0 and not circuit.probing:
+                circuit.probing = True
+                return
+        raise SimStudioError(
+            f'Circuit open for {key} after {circuit.failures} consecutive failures; '
+            f'next trial in {max(retry_in, 0):.1f} seconds',
+            'CIRCUIT_OPEN'
+        )
+
+    def _after(self, key: Hashable, error: Optional[BaseException]) -> None:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if error is not None and not isinstance(error, SimStudioError):
+                # Cancelled or interrupted: the outcome is unknown, so only end the trial.
+                if circuit is not None:
+                    circuit.probing = False
+                return
+            if error is None or not _counts_against_circuit(error):
+                if circuit is not None and (error is None or circuit.probing):
+                    # A success, or a trial call that the server answered, closes it.
+                    del self._circuits[key]
+                return
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit()
+            circuit.failures += 1
+            circuit.probing = False
+            if circuit.opened_at is not None or circuit.failures >= self.failure_threshold:
+                circuit.opened_at = time.monotonic()
@@ -0,0 +1,452 @@
+"""
+Priority classes and weighted fair queuing in front of a shared client.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from . import RateLimitError, SimStudioError, WorkflowExecutionResult
+from .instrumentation import LatencyHistogram
+
+if TYPE_CHECKING:
+    from . import SimStudioClient
+
+# Shortest dispatch pause after a 429 without a usable ``resetAt``.
+_MIN_RATE_LIMIT_PAUSE = 0.05
+
+
+@dataclass
+class PriorityClass:
+    """
+    A class of executions sharing a scheduler, e.g. ``'interactive'`` or ``'bulk'``.
+
+    Attributes:
+        name: Name used to submit executions to the class
+        weight: Share of the scheduler's throughput relative to the other classes
+            while several have queued work (default: 1.0)
+        max_concurrency: Most executions of the class running at once (default: no
+            limit beyond the scheduler's). Capping bulk classes below the scheduler's
+            limit keeps slots free for latency-sensitive ones.
+        max_queue: Most executions of the class waiting at once; further submissions are
+            shed with ``QUEUE_FULL`` (default: no limit)
+        max_wait: Seconds an execution may wait in the queue before it is shed with
+            ``QUEUE_TIMEOUT`` (default: no limit, so the work is deferred instead)
+        key_weights: Weights of individual keys (workflow IDs or tenants) within the class
+            (default: 1.0 each)
+    """
+
+    name: str
+    weight: float = 1.0
+    max_concurrency: Optional[int] = None
+    max_queue: Optional[int] = None
+    max_wait: Optional[float] = None
+    key_weights: Mapping[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class PriorityClassStats:
+    """
+    Counters and queue wait times of one priority class.
+
+    Attributes:
+        name: Name of the class
+        queued: Executions waiting now
+        running: Executions running now
+        completed: Executions that finished (successfully or with an error)
+        shed: Executions rejected with ``QUEUE_FULL`` or ``QUEUE_TIMEOUT``
+        wait_p50: Median seconds spent queued before starting (None before the first)
+        wait_p99: 99th percentile of the queue wait in seconds
+        wait_mean: Mean queue wait in seconds
+    """
+
+    name: str
+    queued: int
+    running: int
+    completed: int
+    shed: int
+    wait_p50: Optional[float]
+    wait_p99: Optional[float]
+    wait_mean: Optional[float]
+
+
+class _Item:
+    """A queued execution."""
+
+    __slots__ = ('queue', 'workflow_id', 'input_data', 'timeout', 'fields', 'key', 'future',
+                 'enqueued_at', 'deadline', 'done', 'started')
+
+    def __init__(
+        self,
+        queue: "_ClassQueue",
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]],
+        timeout: float,
+        fields: Optional[Iterable[str]],
+        key: str,
+        deadline: Optional[float],
+    ):
+        self.queue = queue
+        self.workflow_id = workflow_id
+        self.input_data = input_data
+        self.timeout = timeout
+        self.fields = fields
+        self.key = key
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+        self.deadline = deadline
+        # Set once the item left the queue (dispatched, shed or cancelled).
+        self.done = False
+        # Set once its future is running; it stays so when the item is requeued after a 429.
+        self.started = False
+
+
+class _ClassQueue:
+    """Queue state of one priority class: a fair queue of per-key FIFOs."""
+
+    def __init__(self, spec: PriorityClass):
+        self.spec = spec
+        self.queues: Dict[str, Deque[_Item]] = {}
+        self.key_heap: List[Tuple[float, int, str]] = []
+        self.key_tags: Dict[str, float] = {}
+        self.key_clock = 0.0
+        self.tag = 0.0
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.shed = 0
+        self.waits = LatencyHistogram()
+
+    def eligible(self) -> bool:
+        cap = self.spec.max_concurrency
+        return self.queued > 0 and (cap is None or self.running < cap)
+
+
+class ExecutionScheduler:
+    """
+    Schedules workflow executions from several priority classes over one client.
+
+    Executions are queued per class and, within a class, per key (the workflow ID or a
+    tenant passed with ``key``). Whenever one of ``max_concurrency`` slots is free, the
+    scheduler picks the next execution by start-time fair queuing: classes with queued
+    work get slots in proportion to their ``weight``, and within a class each key gets
+    its (weighted) turn, so one busy workflow or tenant cannot starve the others. Idle
+    classes and keys do not save up credit.
+
+    Per-class ``max_concurrency`` caps keep bulk work from holding every slot, and
+    ``max_queue``/``max_wait`` shed it when the backlog grows. An execution rejected
+    with 429 (when the client has no ``rate_limit`` of its own) goes back to the front
+    of its queue and all dispatching pauses until the rate limit resets, so the budget
+    that frees up is shared by weight as well.
+
+    Args:
+        client: The SimStudioClient used to execute workflows
+        classes: The priority classes
+        max_concurrency: Executions running at once across all classes (default: 8)
+    """
+
+    def __init__(
+        self,
+        client: "SimStudioClient",
+        classes: Sequence[PriorityClass],
+        max_concurrency: int = 8,
+    ):
+        if not classes:
+            raise ValueError('At least one priority class is required')
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        for spec in classes:
+            if spec.weight <= 0:
+                raise ValueError(f'Weight of priority class {spec.name!r} must be positive')
+        self._client = client
+        self._classes = {spec.name: _ClassQueue(spec) for spec in classes}
+        if len(self._classes) != len(classes):
+            raise ValueError('Priority class names must be unique')
+        self._max_concurrency = max_concurrency
+        self._running = 0
+        self._clock = 0.0
+        self._paused_until = 0.0
+        self._deadlines: List[Tuple[float, int, _Item]] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._workers = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix='simstudio-scheduler-worker'
+        )
+        self._thread = threading.Thread(target=self._run, name='simstudio-scheduler', daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        priority: str,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        key: Optional[str] = None,
+        timeout: float = 30.0,
+        fields: Optional[Iterable[str]] = None,
+    ) -> "Future[WorkflowExecutionResult]":
+        """
+        Queue a workflow execution in a priority class.
+
+        Args:
+            priority: Name of the priority class
+            workflow_id: The ID of the workflow to execute
+            input_data: Input data to pass to the workflow
+            key: Fairness key within the class, e.g. a tenant (default: ``workflow_id``)
+            timeout: Timeout for the execution in seconds, not counting the queue wait
+                (default: 30.0)
+            fields: Result fields to decode, as for ``SimStudioClient.execute_workflow``
+
+        Returns:
+            Future resolving to the WorkflowExecutionResult. It fails with the execution's
+            SimStudioError, or with ``QUEUE_FULL``/``QUEUE_TIMEOUT`` when it is shed.
+            Cancelling it before it starts removes it from the queue.
+        """
+        queue = self._classes.get(priority)
+        if queue is None:
+            raise ValueError(f'Unknown priority class {priority!r}')
+        spec = queue.spec
+        now = time.monotonic()
+        deadline = now + spec.max_wait if spec.max_wait is not None else None
+        item = _Item(queue, workflow_id, input_data, timeout, fields, key or workflow_id, deadline)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('Scheduler is closed')
+            if spec.max_queue is not None and queue.queued >= spec.max_queue:
+                queue.shed += 1
+                item.future.set_exception(SimStudioError(
+                    f'Queue of priority class {priority!r} is full', 'QUEUE_FULL'
+                ))
+                return item.future
+            self._enqueue(item)
+            item.future.add_done_callback(lambda future: self._forget(item))
+            self._cond.notify_all()
+        return item.future
+
+    def execute_workflow(
+        self,
+        priority: str,
+        workflow_id: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        key: Optional[str] = None,
+        timeout: float = 30.0,
+        fields: Optional[Iterable[str]] = None,
+    ) -> WorkflowExecutionResult:
+        """
+        Queue a workflow execution in a priority class and wait for its result.
+
+        Takes the same arguments as ``submit``.
+
+        Raises:
+            SimStudioError: If the execution fails or is shed
+        """
+        return self.submit(priority, workflow_id, input_data, key, timeout, fields).result()
+
+    def stats(self) -> Dict[str, PriorityClassStats]:
+        """Counters and queue wait times of every class, by name."""
+        with self._cond:
+            return {
+                name: PriorityClassStats(
+                    name=name,
+                    queued=queue.queued,
+                    running=queue.running,
+                    completed=queue.completed,
+                    shed=queue.shed,
+                    wait_p50=queue.waits.percentile(50),
+                    wait_p99=queue.waits.percentile(99),
+                    wait_mean=queue.waits.sum / queue.waits.count if queue.waits.count else None,
+                )
+                for name, queue in self._classes.items()
+            }
+
+    def close(self) -> None:
+        """Cancel queued executions and wait for the running ones to finish."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            items = [
+                item
+                for queue in self._classes.values()
+                for items in queue.queues.values()
+                for item in items
+                if not item.done
+            ]
+            self._cond.notify_all()
+        for item in items:
+            if not item.future.cancel():  # requeued after a 429
+                item.future.set_exception(SimStudioError('Scheduler was closed', 'CANCELLED'))
+        self._thread.join()
+        self._workers.shutdown(wait=True)
+
+    def __enter__(self) -> "ExecutionScheduler":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def _enqueue(self, item: _Item, front: bool = False) -> None:
+        queue = item.queue
+        if not queue.queued:
+            # A class returning from idle starts at the current virtual time.
+            queue.tag = max(queue.tag, self._clock)
+        items = queue.queues.get(item.key)
+        if items is None:
+            items = queue.queues[item.key] = deque()
+            tag = max(queue.key_tags.pop(item.key, 0.0), queue.key_clock)
+            heapq.heappush(queue.key_heap, (tag, next(self._sequence), item.key))
+        if front:
+            items.appendleft(item)
+        else:
+            items.append(item)
+        item.done = False
+        queue.queued += 1
+        if item.deadline is not None:
+            heapq.heappush(self._deadlines, (item.deadline, next(self._sequence), item))
+
+    def _forget(self, item: _Item) -> None:
+        """Take a cancelled execution out of the queue counts, so it frees its place."""
+        if not item.future.cancelled():
+            return
+        with self._cond:
+            if not item.done:
+                item.done = True
+                item.queue.queued -= 1
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                item = self._next()
+                if item is None:
+                    return
+                self._workers.submit(self._execute, item)
+
+    def _next(self) -> Optional[_Item]:
+        """Block (holding the condition) until an execution may start; None once closed."""
+        while not self._closed:
+            now = time.monotonic()
+            self._shed_expired(now)
+            wait = self._deadlines[0][0] - now if self._deadlines else None
+            if now < self._paused_until:
+                pause = self._paused_until - now
+                self._cond.wait(pause if wait is None else min(pause, wait))
+                continue
+            if self._running < self._max_concurrency:
+                eligible = [queue for queue in self._classes.values() if queue.eligible()]
+                if eligible:
+                    queue = min(eligible, key=lambda q: q.tag)
+                    item = self._pop(queue)
+                    if item is None:
+                        continue
+                    self._clock = queue.tag
+                    queue.tag += 1.0 / queue.spec.weight
+                    queue.running += 1
+                    self._running += 1
+                    queue.waits.record(now - item.enqueued_at)
+                    return item
+            self._cond.wait(wait)
+        return None
+
+    def _pop(self, queue: _ClassQueue) -> Optional[_Item]:
+        """
+        Take the next item of the key with the lowest tag, skipping items that were shed.
+        Returns None if the item's future was cancelled.
+        """
+        while True:
+            tag, _, key = heapq.heappop(queue.key_heap)
+            items = queue.queues[key]
+            while items and items[0].done:
+                items.popleft()
+            if items:
+                break
+            del queue.queues[key]
+            queue.key_tags[key] = tag
+        item = items.popleft()
+        queue.key_clock = tag
+        tag += 1.0 / queue.spec.key_weights.get(key, 1.0)
+        if items:
+            heapq.heappush(queue.key_heap, (tag, next(self._sequence), key))
+        else:
+            del queue.queues[key]
+            queue.key_tags[key] = tag
+            if len(queue.key_tags) > len(queue.queues) + 1024:
+                # Tags at or below the clock carry no credit; drop them to bound memory.
+                queue.key_tags = {
+                    k: t for k, t in queue.key_tags.items() if t > queue.key_clock
+                }
+        queue.queued -= 1
+        item.done = True
+        if not item.started:
+            if not item.future.set_running_or_notify_cancel():
+                return None
+            item.started = True
+        return item
+
+    def _shed_expired(self, now: float) -> None:
+        while self._deadlines and self._deadlines[0][0] <= now:
+            item = heapq.heappop(self._deadlines)[2]
+            if item.done:
+                continue
+            item.done = True
+            queue = item.queue
+            queue.queued -= 1
+            if item.started or item.future.set_running_or_notify_cancel():
+                queue.shed += 1
+                item.future.set_exception(SimStudioError(
+                    f'Execution of workflow {item.workflow_id} waited longer than '
+                    f'{queue.spec.max_wait} seconds in the {queue.spec.name!r} queue',
+                    'QUEUE_TIMEOUT'
+                ))
+
+    def _execute(self, item: _Item) -> None:
+        try:
+            result = self._client.execute_workflow(
+                item.workflow_id, item.input_data, item.timeout, item.fields
+            )
+        except RateLimitError as e:
+            if self._client._rate_limiter is None and self._requeue(item, e):
+                return
+            item.future.set_exception(e)
+        except BaseException as e:
+            item.future.set_exception(e)
+        else:
+            item.future.set_result(result)
+        with self._cond:
+            item.queue.running -= 1
+            item.queue.completed += 1
+            self._running -= 1
+            self._cond.notify_all()
+
+    def _requeue(self, item: _Item, error: RateLimitError) -> bool:
+        """Put an execution rejected with 429 back at the front and pause dispatching."""
+        pause = _MIN_RATE_LIMIT_PAUSE
+        if error.reset_at is not None:
+            pause = max(pause, error.reset_at.timestamp() - time.time())
+        with self._cond:
+            if self._closed:
+                return False
+            item.queue.running -= 1
+            self._running -= 1
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            # Its first wait is already recorded; the next one starts now.
+            item.enqueued_at = time.monotonic()
+            self._enqueue(item, front=True)
+            self._cond.notify_all()
+        return True
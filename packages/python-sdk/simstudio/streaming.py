@@ -0,0 +1,187 @@
+"""
+Incremental output of streamed workflow executions (server-sent events).
+"""
+
+import codecs
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Deque, Iterator, List, Optional, TypeVar
+
+from . import SimStudioError, WorkflowExecutionResult, _parse_execution_result
+from .transport import Response, TransportError, TransportTimeout
+
+if TYPE_CHECKING:
+    from .codec import JSONCodec
+
+T = TypeVar('T')
+
+EVENT_STREAM = 'text/event-stream'
+
+# Bytes requested per read; reads return what has arrived so far, up to this much.
+_READ_SIZE = 16 * 1024
+
+
+@dataclass
+class StreamChunk:
+    """
+    A piece of a streaming block's output, as the server produced it.
+
+    Attributes:
+        block_id: ID of the block that produced the chunk
+        chunk: The text
+    """
+
+    block_id: Optional[str]
+    chunk: str
+
+
+def _is_event_stream(content_type: Optional[str]) -> bool:
+    if content_type is None:
+        return False
+    return content_type.split(';')[0].strip().lower() == EVENT_STREAM
+
+
+class _EventParser:
+    """
+    Splits server-sent events into the decoded JSON of their ``data`` fields.
+
+    Only the current, incomplete event is buffered. Comments and the ``event``, ``id``
+    and ``retry`` fields are ignored.
+    """
+
+    def __init__(self, codec: "JSONCodec"):
+        self._codec = codec
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._partial: List[str] = []
+        self._data: List[str] = []
+
+    def feed(self, data: bytes) -> List[Any]:
+        text = self._decoder.decode(data)
+        self._partial.append(text)
+        if '\n' not in text:
+            return []
+        *lines, rest = ''.join(self._partial).split('\n')
+        self._partial = [rest] if rest else []
+        events = []
+        for line in lines:
+            line = line.rstrip('\r')
+            if not line:
+                if self._data:
+                    events.append(self._codec.loads('\n'.join(self._data)))
+                    self._data = []
+            elif line.startswith('data:'):
+                value = line[5:]
+                self._data.append(value[1:] if value.startswith(' ') else value)
+        return events
+
+
+class _EventStream:
+    """State shared by the sync and async streams: the parser and the final result."""
+
+    def __init__(self, codec: "JSONCodec", timeout: float):
+        self.result: Optional[WorkflowExecutionResult] = None
+        self._codec = codec
+        self._timeout = timeout
+        self._parser = _EventParser(codec)
+
+    def _chunks(self, data: bytes) -> List[StreamChunk]:
+        """Parse received bytes into output chunks, recording the final result."""
+        chunks = []
+        for event in self._parser.feed(data):
+            if not isinstance(event, dict):
+                continue
+            if 'chunk' in event:
+                chunks.append(StreamChunk(event.get('blockId'), event['chunk']))
+            elif event.get('event') == 'final':
+                self.result = _parse_execution_result(event.get('data') or {})
+            elif event.get('event') == 'error':
+                raise SimStudioError(
+                    str(event.get('error') or event.get('message') or 'Workflow execution failed'),
+                    event.get('code') or 'EXECUTION_ERROR'
+                )
+        return chunks
+
+    def _buffered(self, content: bytes) -> None:
+        """Take the result of a server that answered with one JSON body instead of events."""
+        self.result = _parse_execution_result(self._codec.loads(content))
+
+    def _check_finished(self) -> None:
+        if self.result is None:
+            raise SimStudioError('Workflow stream ended without a final result', 'EXECUTION_ERROR')
+
+    def _timed_out(self) -> SimStudioError:
+        return SimStudioError(f'Workflow stream timed out after {self._timeout} seconds', 'TIMEOUT')
+
+
+class WorkflowStream(_EventStream):
+    """
+    Output of a workflow execution, yielded chunk by chunk as the server produces it.
+
+    Iterating yields a StreamChunk for every piece of output from the workflow's
+    streaming blocks. Once iteration ends, ``result`` holds the final
+    WorkflowExecutionResult. Chunks are not kept, so memory stays bounded however long
+    the output is. Leaving the loop early keeps the stream open, and iterating again
+    continues where it stopped. Close the stream (or use it as a context manager) to
+    stop reading; the execution keeps running on the server.
+
+    A server that does not stream answers with a single JSON body instead: the stream
+    then yields no chunks and ``result`` is set right away.
+
+    Attributes:
+        result: The final WorkflowExecutionResult, None until the stream has ended
+    """
+
+    def __init__(self, response: Response, codec: "JSONCodec", timeout: float):
+        super().__init__(codec, timeout)
+        self._response = response
+        self._streamed = _is_event_stream(response.headers.get('Content-Type'))
+        self._received = response.iter_content(_READ_SIZE)
+        self._pending: Deque[StreamChunk] = deque()
+        if not self._streamed:
+            self._read(lambda: self._buffered(response.content))
+
+    def __iter__(self) -> Iterator[StreamChunk]:
+        if not self._streamed:
+            return
+        try:
+            while True:
+                while self._pending:
+                    yield self._pending.popleft()
+                data = self._read(lambda: next(self._received, b''))
+                if not data:
+                    break
+                self._pending.extend(self._read(lambda: self._chunks(data)))
+        except GeneratorExit:
+            raise  # the caller stopped early; a later iteration continues from here
+        except BaseException:
+            self.close()
+            raise
+        self.close()
+        self._check_finished()
+
+    def finish(self) -> WorkflowExecutionResult:
+        """Read the rest of the stream, discarding its chunks, and return the final result."""
+        for _ in self:
+            pass
+        self._check_finished()
+        return self.result  # type: ignore[return-value]
+
+    def close(self) -> None:
+        """Stop reading and release the connection."""
+        self._response.close()
+
+    def __enter__(self) -> "WorkflowStream":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def _read(self, step: Callable[[], T]) -> T:
+        try:
+            return step()
+        except TransportTimeout as e:
+            self.close()
+            raise self._timed_out() from e
+        except (TransportError, ValueError) as e:
+            self.close()
+            raise SimStudioError(f'Workflow stream failed: {str(e)}', 'EXECUTION_ERROR') from e
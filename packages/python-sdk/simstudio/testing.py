@@ -0,0 +1,760 @@
+"""
+Local stand-in for the Sim API, for tests and benchmarks.
+
+``MockSimServer`` serves the endpoints the SDK talks to from a background thread using
+only the standard library, with configurable latency, payload size, async job duration
+and rate limiting. It can also be run on its own::
+
+    python -m simstudio.testing --port 8000 --latency 0.05
+
+``MemoryTransport`` answers a client's requests in-process instead, from a
+MockSimServer's API or any handler function, without opening sockets.
+"""
+
+import argparse
+import collections.abc
+import hashlib
+import itertools
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlsplit
+
+from .transport import Response, Transport, _Headers
+
+_EXECUTE_PATH = re.compile(r'^/api/workflows/([^/]+)/execute$')
+_STATUS_PATH = re.compile(r'^/api/workflows/([^/]+)/status$')
+_JOB_PATH = re.compile(r'^/api/jobs/([^/]+)$')
+_LOG_TRIGGERS = ('api', 'manual', 'schedule', 'webhook')
+_STORAGE_PREFIX = '/_storage/'
+
+# A handler's answer: (status_code, payload), optionally followed by response headers.
+# A payload that is an iterator of bytes is streamed as the raw body instead of JSON.
+_Answer = Union[Tuple[int, Any], Tuple[int, Any, Dict[str, str]]]
+_EVENT_STREAM_HEADERS = {'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'}
+
+
+def _iso(moment: datetime) -> str:
+    return moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _safe_file_name(name: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9.-]', '_', re.sub(r'\s+', '-', name))
+
+
+def _etag(content: bytes) -> str:
+    return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def _event(payload: Dict[str, Any]) -> bytes:
+    return f'data: {json.dumps(payload)}\n\n'.encode('utf-8')
+
+
+class MockSimServer:
+    """
+    In-process HTTP server that mimics the Sim workflow API.
+
+    Implements ``POST /api/workflows/{id}/execute`` (synchronous, a 202 job with
+    ``X-Execution-Mode: async``, or server-sent events with ``Accept: text/event-stream``,
+    streaming the output in ``stream_chunks`` pieces spread over the latency like the
+    chat route does), ``GET /api/workflows/{id}/status`` and
+    ``GET /api/jobs/{taskId}``, answering 429 like the real API once the rate limit
+    window is exhausted. ``GET /api/logs`` pages through ``log_count`` generated
+    execution logs, newest first, with the real route's filters. The file routes
+    (``/api/files/presigned``, ``/api/files/multipart`` and ``/api/files/upload``) behave
+    like a server with S3 storage, or with local storage when ``storage='local'``;
+    presigned URLs point back at this server, which keeps the size and SHA-256 of every
+    stored file (see ``stored_files``). Connections are kept alive, as with the real API.
+    The port is bound on first use of ``url``, ``start`` or ``serve_forever``, so a
+    server used only through ``MemoryTransport`` never opens one.
+
+    Args:
+        host: Interface to bind (default: 127.0.0.1)
+        port: Port to bind; 0 (default) picks a free port
+        latency: Seconds each execute request or logs page takes (default: 0.0)
+        jitter: Extra random latency, uniformly distributed up to this many seconds
+        payload_size: Size in bytes of the generated workflow output (default: 64)
+        job_duration: Seconds before a queued job reports completion (default: 0.0)
+        rate_limit: Executions allowed per ``rate_limit_window``; None (default) disables
+            rate limiting
+        rate_limit_window: Length of the rate limit window in seconds (default: 60.0)
+        deployed_at: Deployment timestamp reported by the status endpoint
+        log_count: Number of execution logs served by ``GET /api/logs`` (default: 0)
+        storage: File storage to mimic, ``'s3'`` (default) or ``'local'``
+        stream_chunks: Pieces a streamed execution's output is sent in (default: 4)
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        payload_size: int = 64,
+        job_duration: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_limit_window: float = 60.0,
+        deployed_at: str = '2024-01-01T00:00:00.000Z',
+        log_count: int = 0,
+        storage: str = 's3',
+        stream_chunks: int = 4,
+    ):
+        if storage not in ('s3', 'local'):
+            raise ValueError("storage must be 's3' or 'local'")
+        self.latency = latency
+        self.jitter = jitter
+        self.payload_size = payload_size
+        self.job_duration = job_duration
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.deployed_at = deployed_at
+        self.log_count = log_count
+        self.storage = storage
+        self.stream_chunks = stream_chunks
+        # Log i started i seconds before this moment.
+        self._logs_until = datetime.now(timezone.utc).replace(microsecond=0)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Tuple[float, str, Any]] = {}
+        self._task_ids = itertools.count(1)
+        self._window_started = time.monotonic()
+        self._window_count = 0
+        self._counts: Dict[str, int] = {}
+        self._parts: Dict[str, Dict[int, bytes]] = {}
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._address = (host, port)
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _server(self) -> ThreadingHTTPServer:
+        if self._httpd is None:
+            self._httpd = _Server(self._address, _Handler)
+            self._httpd.sim = self  # type: ignore[attr-defined]
+        return self._httpd
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to a client."""
+        host, port = self._server().socket.getsockname()[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'MockSimServer':
+        """Serve requests from a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server().serve_forever,
+                name='simstudio-mock-server',
+                daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        self._server().serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._httpd is None:
+            return
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+        self._httpd = None
+
+    def __enter__(self) -> 'MockSimServer':
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Requests served so far, by kind (execute, submit, status, job, logs, presigned,
+        multipart, upload, storage, rate_limited).
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def stored_files(self) -> Dict[str, Dict[str, Any]]:
+        """Files stored so far by key, as ``{'size': ..., 'sha256': ...}``."""
+        with self._lock:
+            return {key: dict(info) for key, info in self._files.items()}
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        headers: Mapping[str, str],
+        body: bytes,
+    ) -> _Answer:
+        """Answer one API request, returning ``(status_code, payload[, headers])``."""
+        if method == 'PUT' and path.startswith(_STORAGE_PREFIX):
+            self._count('storage')
+            return self._store(urlsplit(path), body)
+
+        if method == 'POST':
+            parts = urlsplit(path)
+            if parts.path.startswith('/api/files/'):
+                return self._files_route(parts.path, parse_qs(parts.query), headers, body)
+            match = _EXECUTE_PATH.match(path)
+            if match is None:
+                return 404, {'error': 'Not found'}
+            try:
+                input_data = json.loads(body) if body else {}
+            except ValueError:
+                input_data = {}
+            return self._execute(
+                match.group(1),
+                input_data,
+                headers.get('X-Execution-Mode') == 'async',
+                headers.get('Accept') == 'text/event-stream',
+            )
+
+        if method == 'GET':
+            parts = urlsplit(path)
+            if parts.path == '/api/logs':
+                self._count('logs')
+                self._delay()
+                return self._logs(parse_qs(parts.query))
+            if _STATUS_PATH.match(path):
+                self._count('status')
+                return 200, {
+                    'isDeployed': True,
+                    'deployedAt': self.deployed_at,
+                    'isPublished': False,
+                    'needsRedeployment': False,
+                }
+            match = _JOB_PATH.match(path)
+            if match:
+                self._count('job')
+                status = self._job_status(match.group(1))
+                if status is None:
+                    return 404, {'error': 'Task not found'}
+                return 200, status
+
+        return 404, {'error': 'Not found'}
+
+    def _log_entry(self, index: int, full: bool) -> Dict[str, Any]:
+        workflow_id = f'wf-{index % 3}'
+        duration_ms = 100 + index % 50
+        entry: Dict[str, Any] = {
+            'id': f'log-{index}',
+            'workflowId': workflow_id,
+            'level': 'error' if index % 10 == 9 else 'info',
+            'duration': f'{duration_ms}ms',
+            'trigger': _LOG_TRIGGERS[index % len(_LOG_TRIGGERS)],
+            'createdAt': _iso(self._logs_until - timedelta(seconds=index)),
+            'workflow': {
+                'id': workflow_id,
+                'name': f'Workflow {index % 3}',
+                'folderId': None,
+                'workspaceId': 'ws-1',
+            },
+            'cost': {'total': round(0.001 * (index % 7), 6)},
+        }
+        if full:
+            entry['executionId'] = f'execution-{index}'
+            entry['cost']['tokens'] = {'total': 10 * (index % 7)}
+            entry['executionData'] = {'totalDuration': duration_ms, 'traceSpans': []}
+        return entry
+
+    def _logs(self, query: Dict[str, List[str]]) -> Tuple[int, Any]:
+        def param(name: str, default: Optional[str] = None) -> Optional[str]:
+            values = query.get(name)
+            return values[0] if values else default
+
+        if param('workspaceId') is None:
+            return 400, {'error': 'Invalid request parameters'}
+        limit = int(param('limit', '100'))  # type: ignore[arg-type]
+        offset = int(param('offset', '0'))  # type: ignore[arg-type]
+        level = param('level')
+        workflow_ids = set(filter(None, (param('workflowIds') or '').split(',')))
+        end_date, start_date = param('endDate'), param('startDate')
+        # Logs started at or before endDate (and at or after startDate): a range of indexes.
+        first = 0
+        if end_date is not None:
+            until = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            first = max(0, int((self._logs_until - until).total_seconds() + 0.999))
+        last = self.log_count
+        if start_date is not None:
+            since = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+            last = min(last, int((self._logs_until - since).total_seconds()) + 1)
+        matching = [
+            index for index in range(first, last)
+            if (level in (None, 'all') or self._log_entry(index, False)['level'] == level)
+            and (not workflow_ids or f'wf-{index % 3}' in workflow_ids)
+        ]
+        full = param('details') == 'full'
+        return 200, {
+            'data': [self._log_entry(index, full) for index in matching[offset:offset + limit]],
+            'total': len(matching),
+            'page': offset // limit + 1,
+            'pageSize': limit,
+            'totalPages': -(-len(matching) // limit),
+        }
+
+    def _files_route(
+        self,
+        path: str,
+        query: Dict[str, List[str]],
+        headers: Mapping[str, str],
+        body: bytes,
+    ) -> _Answer:
+        if path == '/api/files/upload':
+            self._count('upload')
+            return self._form_upload(headers, body)
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return 400, {'error': 'Invalid JSON in request body'}
+
+        if path == '/api/files/presigned':
+            self._count('presigned')
+            if self.storage != 's3':
+                return 500, {
+                    'error': 'Direct uploads are only available when cloud storage is enabled',
+                    'code': 'STORAGE_CONFIG_ERROR',
+                    'directUploadSupported': False,
+                }
+            key = f'{uuid.uuid4()}-{_safe_file_name(data["fileName"])}'
+            url = self._storage_url(key)
+            return 200, {
+                'presignedUrl': url,
+                'uploadUrl': url,
+                'fileInfo': {
+                    'path': f'/api/files/serve/s3/{quote(key, safe="")}',
+                    'key': key,
+                    'name': data['fileName'],
+                    'size': data['fileSize'],
+                    'type': data['contentType'],
+                },
+                'directUploadSupported': True,
+            }
+
+        if path == '/api/files/multipart':
+            self._count('multipart')
+            if self.storage != 's3':
+                return 400, {'error': 'Multipart upload is only available with S3 storage'}
+            action = (query.get('action') or [''])[0]
+            if action == 'initiate':
+                upload_id = uuid.uuid4().hex
+                with self._lock:
+                    self._parts[upload_id] = {}
+                key = f'kb/{uuid.uuid4()}-{_safe_file_name(data["fileName"])}'
+                return 200, {'uploadId': upload_id, 'key': key}
+            if action == 'get-part-urls':
+                return 200, {'presignedUrls': [
+                    {
+                        'partNumber': number,
+                        'url': self._storage_url(
+                            data['key'], uploadId=data['uploadId'], partNumber=number
+                        ),
+                    }
+                    for number in data['partNumbers']
+                ]}
+            if action == 'complete':
+                return self._complete_multipart(data)
+            if action == 'abort':
+                with self._lock:
+                    self._parts.pop(data['uploadId'], None)
+                return 200, {'success': True}
+            return 400, {
+                'error': 'Invalid action. Use: initiate, get-part-urls, complete, or abort'
+            }
+
+        return 404, {'error': 'Not found'}
+
+    def _complete_multipart(self, data: Dict[str, Any]) -> _Answer:
+        with self._lock:
+            stored = self._parts.pop(data['uploadId'], None)
+        if stored is None:
+            return 500, {'error': 'The specified upload does not exist.'}
+        digest = hashlib.sha256()
+        size = 0
+        for part in sorted(data['parts'], key=lambda part: part['PartNumber']):
+            content = stored.get(part['PartNumber'])
+            if content is None or part['ETag'] != _etag(content):
+                return 500, {'error': 'One or more of the specified parts could not be found.'}
+            digest.update(content)
+            size += len(content)
+        key = data['key']
+        with self._lock:
+            self._files[key] = {'size': size, 'sha256': digest.hexdigest()}
+        return 200, {
+            'success': True,
+            'location': self._storage_url(key),
+            'path': f'/api/files/serve/s3/{quote(key, safe="")}',
+            'key': key,
+        }
+
+    def _store(self, url: Any, body: bytes) -> _Answer:
+        """Accept a PUT to a presigned URL: a whole file, or one part of a multipart upload."""
+        key = unquote(url.path[len(_STORAGE_PREFIX):])
+        query = parse_qs(url.query)
+        if 'uploadId' in query:
+            with self._lock:
+                parts = self._parts.get(query['uploadId'][0])
+                if parts is None:
+                    return 404, {'error': 'NoSuchUpload'}
+                parts[int(query['partNumber'][0])] = bytes(body)
+        else:
+            with self._lock:
+                self._files[key] = {'size': len(body), 'sha256': hashlib.sha256(body).hexdigest()}
+        return 200, {}, {'ETag': _etag(body)}
+
+    def _form_upload(self, headers: Mapping[str, str], body: bytes) -> _Answer:
+        match = re.search(r'boundary=([^;\s]+)', headers.get('Content-Type') or '')
+        start = body.find(b'\r\n\r\n') + 4
+        if match is None or start < 4:
+            return 400, {'error': 'InvalidRequestError', 'message': 'No files provided'}
+        end = body.rfind(b'\r\n--' + match.group(1).encode('ascii'))
+        part_headers = bytes(body[:start]).decode('utf-8', 'replace')
+        name_match = re.search(r'filename="([^"]*)"', part_headers)
+        type_match = re.search(r'Content-Type: ([^\r\n]+)', part_headers)
+        name = unquote(name_match.group(1)) if name_match else 'file'
+        content = body[start:end]
+        key = f'{uuid.uuid4()}-{_safe_file_name(name)}'
+        with self._lock:
+            self._files[key] = {'size': len(content), 'sha256': hashlib.sha256(content).hexdigest()}
+        now = datetime.now(timezone.utc)
+        return 200, {
+            'name': name,
+            'size': len(content),
+            'type': type_match.group(1) if type_match else 'application/octet-stream',
+            'key': key,
+            'path': f'/api/files/serve/{key}',
+            'url': f'/api/files/serve/{key}',
+            'uploadedAt': _iso(now),
+            'expiresAt': _iso(now + timedelta(hours=24)),
+        }
+
+    def _storage_url(self, key: str, **query: Any) -> str:
+        # Without a bound port (MemoryTransport), only the path of the URL matters.
+        base = self.url if self._httpd is not None else 'http://storage.invalid'
+        url = f'{base}{_STORAGE_PREFIX}{quote(key)}'
+        return f'{url}?{urlencode(query)}' if query else url
+
+    def _execute(
+        self, workflow_id: str, input_data: Any, is_async: bool, is_stream: bool = False
+    ) -> _Answer:
+        limited = self._take_rate_limit()
+        if limited is not None:
+            self._count('rate_limited')
+            remaining, reset_at = limited
+            if is_async:
+                return 429, {
+                    'error': 'Rate limit exceeded',
+                    'message': f'You have exceeded your async execution limit. {remaining} '
+                               f'requests remaining. Limit resets at {_iso(reset_at)}.',
+                    'remaining': remaining,
+                    'resetAt': _iso(reset_at),
+                }
+            return 429, {
+                'error': f'Rate limit exceeded. You have {remaining} requests remaining. '
+                         f'Resets at {_iso(reset_at)}',
+                'code': 'RATE_LIMIT_EXCEEDED',
+            }
+
+        if is_async:
+            self._count('submit')
+            return 202, self._submit(workflow_id, input_data)
+
+        if is_stream:
+            self._count('stream')
+            return 200, self._stream(workflow_id, input_data), _EVENT_STREAM_HEADERS
+
+        self._count('execute')
+        started = time.monotonic()
+        self._delay()
+        duration_ms = int((time.monotonic() - started) * 1000)
+        return 200, self._execution_result(workflow_id, input_data, duration_ms)
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self._counts[kind] = self._counts.get(kind, 0) + 1
+
+    def _take_rate_limit(self) -> Optional[Tuple[int, datetime]]:
+        """Count an execution against the window, returning (remaining, reset) if over the limit."""
+        if self.rate_limit is None:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_started >= self.rate_limit_window:
+                self._window_started = now
+                self._window_count = 0
+            reset_in = self._window_started + self.rate_limit_window - now
+            if self._window_count >= self.rate_limit:
+                return 0, datetime.now(timezone.utc) + timedelta(seconds=reset_in)
+            self._window_count += 1
+            return None
+
+    def _delay(self) -> None:
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _output(self, input_data: Any) -> Dict[str, Any]:
+        return {'content': 'x' * self.payload_size, 'input': input_data}
+
+    def _execution_result(
+        self, workflow_id: str, input_data: Any, duration_ms: int
+    ) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        return {
+            'success': True,
+            'output': self._output(input_data),
+            'logs': [],
+            'metadata': {
+                'duration': duration_ms,
+                'startTime': _iso(now - timedelta(milliseconds=duration_ms)),
+                'endTime': _iso(now),
+            },
+            'traceSpans': [],
+            'totalDuration': duration_ms,
+        }
+
+    def _stream(self, workflow_id: str, input_data: Any) -> Iterator[bytes]:
+        """Server-sent events in the chat route's format: chunks, block end, final result."""
+        started = time.monotonic()
+        content = self._output(input_data)['content']
+        size = max(1, -(-len(content) // max(1, self.stream_chunks)))
+        pieces = [content[i:i + size] for i in range(0, len(content), size)]
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        for piece in pieces:
+            if delay > 0:
+                time.sleep(delay / len(pieces))
+            yield _event({'blockId': 'agent-1', 'chunk': piece})
+        yield _event({'blockId': 'agent-1', 'event': 'end'})
+        duration_ms = int((time.monotonic() - started) * 1000)
+        result = self._execution_result(workflow_id, input_data, duration_ms)
+        yield _event({'event': 'final', 'data': result})
+
+    def _submit(self, workflow_id: str, input_data: Any) -> Dict[str, Any]:
+        task_id = f'task-{next(self._task_ids)}'
+        with self._lock:
+            self._jobs[task_id] = (time.monotonic(), workflow_id, input_data)
+        return {
+            'success': True,
+            'taskId': task_id,
+            'status': 'queued',
+            'createdAt': _iso(datetime.now(timezone.utc)),
+            'links': {'status': f'/api/jobs/{task_id}'},
+        }
+
+    def _job_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(task_id)
+        if job is None:
+            return None
+        created, workflow_id, input_data = job
+        elapsed = time.monotonic() - created
+        if elapsed < self.job_duration:
+            return {
+                'success': True,
+                'taskId': task_id,
+                'status': 'processing',
+                'metadata': {'startedAt': None},
+                'estimatedDuration': int(self.job_duration * 1000),
+            }
+        duration_ms = int(self.job_duration * 1000)
+        now = datetime.now(timezone.utc)
+        return {
+            'success': True,
+            'taskId': task_id,
+            'status': 'completed',
+            'metadata': {
+                'startedAt': _iso(now - timedelta(milliseconds=duration_ms)),
+                'completedAt': _iso(now),
+                'duration': duration_ms,
+            },
+            'output': {
+                'success': True,
+                'workflowId': workflow_id,
+                'executionId': f'execution-{task_id}',
+                'output': self._output(input_data),
+                'executedAt': _iso(now),
+                'metadata': {'duration': duration_ms},
+            },
+        }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients that time out hang up mid-response; that is expected, not an error.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MockSim/1.0'
+    disable_nagle_algorithm = True
+
+    @property
+    def sim(self) -> MockSimServer:
+        sim: MockSimServer = self.server.sim  # type: ignore[attr-defined]
+        return sim
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        if isinstance(payload, collections.abc.Iterator):
+            self._send_chunked(status, payload, headers or {})
+            return
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunked(self, status: int, pieces: Iterator[bytes], headers: Dict[str, str]) -> None:
+        self.send_response(status)
+        self.send_header('Transfer-Encoding', 'chunked')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        for piece in pieces:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(piece), piece))
+            self.wfile.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _serve(self, method: str) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        headers = _Headers(self.headers.items())
+        self._send(*self.sim.handle(method, self.path, headers, body))
+
+    def do_POST(self) -> None:
+        self._serve('POST')
+
+    def do_GET(self) -> None:
+        self._serve('GET')
+
+    def do_PUT(self) -> None:
+        self._serve('PUT')
+
+
+def _piece_reader(pieces: Iterator[bytes]) -> Callable[[int], bytes]:
+    """A ``Response`` reader returning each piece as it is produced, split to ``size``."""
+    pending = b''
+
+    def read(size: int) -> bytes:
+        nonlocal pending
+        while not pending:
+            produced = next(pieces, None)
+            if produced is None:
+                return b''
+            pending = produced
+        piece, pending = pending[:size], pending[size:]
+        return piece
+    return read
+
+
+class MemoryTransport(Transport):
+    """
+    Transport that answers requests in-process, without sockets, for tests.
+
+    Args:
+        handler: Called as ``handler(method, path, headers, body)`` for every request,
+            with the path including any query string and the raw request body; returns
+            ``(status_code, payload)`` or ``(status_code, payload, headers)``, and
+            ``payload`` is sent back as JSON, or as the raw body when it is an iterator of
+            bytes (read piece by piece when streamed). Defaults to the API of a new
+            MockSimServer.
+
+    Attributes:
+        requests: Every request sent, as ``(method, url, headers, body)`` tuples
+    """
+
+    def __init__(
+        self,
+        handler: Optional[Callable[[str, str, Mapping[str, str], bytes], _Answer]] = None,
+    ):
+        super().__init__()
+        self.handler = handler or MockSimServer().handle
+        self.requests: List[Tuple[str, str, Dict[str, str], Union[bytes, memoryview]]] = []
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[Union[bytes, memoryview]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+        parts = urlsplit(url)
+        path = f'{parts.path}?{parts.query}' if parts.query else parts.path
+        self.requests.append((method, url, request_headers, body or b''))
+        status, payload, *extra = self.handler(method, path, request_headers, bytes(body or b''))
+        response_headers = {'Content-Type': 'application/json'}
+        if extra:
+            response_headers.update(extra[0])
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ''
+        if not isinstance(payload, collections.abc.Iterator):
+            content = json.dumps(payload).encode('utf-8')
+            return Response(status, reason, response_headers, content=content)
+        if not stream:
+            return Response(status, reason, response_headers, content=b''.join(payload))
+        return Response(status, reason, response_headers, read=_piece_reader(payload))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run a local stand-in for the Sim API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--payload-size', type=int, default=64)
+    parser.add_argument('--job-duration', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=None)
+    parser.add_argument('--rate-limit-window', type=float, default=60.0)
+    parser.add_argument('--log-count', type=int, default=0)
+    parser.add_argument('--storage', choices=('s3', 'local'), default='s3')
+    args = parser.parse_args()
+
+    server = MockSimServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        payload_size=args.payload_size,
+        job_duration=args.job_duration,
+        rate_limit=args.rate_limit,
+        rate_limit_window=args.rate_limit_window,
+        log_count=args.log_count,
+        storage=args.storage,
+    )
+    print(server.url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
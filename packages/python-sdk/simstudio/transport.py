@@ -0,0 +1,298 @@
+"""
+HTTP transports for SimStudioClient.
+
+A transport sends the client's requests and hands back a ``Response``. This module
+only defines the interface and stays free of HTTP libraries; the implementations are
+imported on first use:
+
+- ``'requests'`` (default): ``RequestsTransport``, built on a ``requests.Session``
+- ``'http'``: ``HTTPTransport``, a keep-alive connection pool on the standard library's
+  ``http.client``, for short-lived processes where importing requests dominates
+- ``simstudio.testing.MemoryTransport``: answers requests in-process, for tests
+"""
+
+import importlib
+import json
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+DEFAULT_POOL_SIZE = 10
+
+# Transport name -> (module, class), imported when a client first asks for it.
+_TRANSPORTS = {
+    'requests': ('requests_transport', 'RequestsTransport'),
+    'http': ('http_transport', 'HTTPTransport'),
+}
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    Connection pool settings for a client's transport.
+
+    Attributes:
+        max_connections: Connections kept open per host (default: 10). Size it to the
+            number of threads that share the client.
+        idle_timeout: Close pooled connections that have been idle for longer than this
+            many seconds, before a server or load balancer drops them (default: keep them
+            until the server closes them)
+        block: When all ``max_connections`` are busy, wait for one to be returned instead
+            of opening an extra connection that is discarded afterwards (default: False)
+        block_timeout: With ``block``, seconds to wait for a free connection before the
+            request fails with TIMEOUT (default: wait indefinitely)
+    """
+    max_connections: int = DEFAULT_POOL_SIZE
+    idle_timeout: Optional[float] = None
+    block: bool = False
+    block_timeout: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.max_connections < 1:
+            raise ValueError('max_connections must be at least 1')
+
+
+@dataclass
+class PoolStats:
+    """
+    Connection pool counters since the transport was created.
+
+    Attributes:
+        created: Requests that had to open a new connection
+        reused: Requests sent on a kept-alive connection
+        discarded: Connections closed on return instead of being pooled, because the
+            pool was already full or the connection failed or was not read to the end
+        expired: Idle connections closed after ``idle_timeout``
+        waited: Requests that waited for a free connection (``block=True``)
+        in_use: Connections currently checked out
+        peak_in_use: Most connections checked out at once
+    """
+    created: int = 0
+    reused: int = 0
+    discarded: int = 0
+    expired: int = 0
+    waited: int = 0
+    in_use: int = 0
+    peak_in_use: int = 0
+
+
+class _PoolCounters:
+    """Thread-safe PoolStats that transports update as connections come and go."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = PoolStats()
+
+    def acquired(self, reused: bool) -> None:
+        with self._lock:
+            stats = self._stats
+            if reused:
+                stats.reused += 1
+            else:
+                stats.created += 1
+            stats.in_use += 1
+            if stats.in_use > stats.peak_in_use:
+                stats.peak_in_use = stats.in_use
+
+    def released(self, discarded: bool = False) -> None:
+        with self._lock:
+            self._stats.in_use -= 1
+            if discarded:
+                self._stats.discarded += 1
+
+    def expired(self) -> None:
+        with self._lock:
+            self._stats.expired += 1
+
+    def waited(self) -> None:
+        with self._lock:
+            self._stats.waited += 1
+
+    def snapshot(self) -> PoolStats:
+        with self._lock:
+            return replace(self._stats)
+
+
+class TransportError(Exception):
+    """
+    The request failed before a complete response arrived (connection, TLS, protocol).
+
+    ``connect`` is True when no connection could be established, so the request was
+    never sent and is safe to retry.
+    """
+
+    def __init__(self, message: str = '', connect: bool = False):
+        super().__init__(message)
+        self.connect = connect
+
+
+class TransportTimeout(TransportError):
+    """The request timed out."""
+
+
+class _Headers(Mapping[str, str]):
+    """Case-insensitive, read-only response headers; repeated headers are comma-joined."""
+
+    __slots__ = ('_items',)
+
+    def __init__(self, items: Iterable[Tuple[str, str]]):
+        self._items: Dict[str, Tuple[str, str]] = {}
+        for name, value in items:
+            key = name.lower()
+            if key in self._items:
+                name, previous = self._items[key]
+                value = f'{previous}, {value}'
+            self._items[key] = (name, value)
+
+    def __getitem__(self, name: str) -> str:
+        return self._items[name.lower()][1]
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, _ in self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class Response:
+    """
+    An HTTP response as seen by the client.
+
+    The body is either given up front (``content``) or pulled on demand through ``read``,
+    a callable returning up to ``n`` bytes and ``b''`` at the end. ``release`` is called
+    once when the response is closed, e.g. to return its connection to a pool.
+    """
+
+    __slots__ = ('status_code', 'reason', 'headers', '_content', '_read', '_release')
+
+    def __init__(
+        self,
+        status_code: int,
+        reason: str = '',
+        headers: Optional[Mapping[str, str]] = None,
+        content: bytes = b'',
+        read: Optional[Callable[[int], bytes]] = None,
+        release: Optional[Callable[[], None]] = None,
+    ):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers if headers is not None else {}
+        self._content = content
+        self._read = read
+        self._release = release
+
+    @property
+    def ok(self) -> bool:
+        """True for informational, success and redirect statuses."""
+        return self.status_code < 400
+
+    @property
+    def content(self) -> bytes:
+        """The whole body, reading the rest of a streamed response if needed."""
+        if self._read is not None:
+            self._content = b''.join(self.iter_content(64 * 1024))
+            self.close()
+        return self._content
+
+    def iter_content(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield the body in chunks of up to ``chunk_size`` bytes as it arrives."""
+        read = self._read
+        if read is None:
+            if self._content:
+                yield self._content
+            return
+        while True:
+            chunk = read(chunk_size)
+            if not chunk:
+                self._read = None
+                return
+            yield chunk
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def close(self) -> None:
+        """Release the response's connection; an unread body is discarded."""
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+
+class Transport:
+    """
+    Sends HTTP requests for a client. Subclass it to plug in another HTTP stack.
+
+    ``headers`` are sent with every request; the client keeps its API key there.
+    Implementations raise TransportTimeout or TransportError for failed requests, also
+    while a streamed body is being read. A transport is shared by all threads using its
+    client, so ``request``, ``configure_pool`` and ``pool_stats`` must be thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self.headers: Dict[str, str] = {}
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[Union[bytes, memoryview]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        """
+        Send one request.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            body: Request body; a memoryview is sent without copying it
+            headers: Headers for this request, on top of ``self.headers``
+            timeout: Seconds to wait for the connection and for each read (default: no limit)
+            stream: Return as soon as the headers arrive and read the body on demand; the
+                caller then closes the response
+
+        Returns:
+            The Response, whatever its status code
+        """
+        raise NotImplementedError
+
+    def configure_pool(self, config: PoolConfig) -> None:
+        """Apply new pool settings; requests already in flight finish on their connections."""
+
+    def pool_stats(self) -> PoolStats:
+        """Counters of the connection pool (all zero if the transport has no pool)."""
+        return PoolStats()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+
+
+def resolve_transport(
+    transport: Union[str, Transport, None],
+    instrumented: bool = False,
+    pool: Optional[PoolConfig] = None,
+) -> Transport:
+    """
+    Build the transport for a client's ``transport`` argument.
+
+    Args:
+        transport: A Transport instance, a transport name, or None for ``'requests'``
+        instrumented: Record connect/upload/server phase timings for client hooks
+        pool: Connection pool settings (default: PoolConfig())
+    """
+    if isinstance(transport, Transport):
+        if pool is not None:
+            transport.configure_pool(pool)
+        return transport
+    name = transport or 'requests'
+    if name not in _TRANSPORTS:
+        raise ValueError(f"Unknown transport {name!r}; use one of {', '.join(sorted(_TRANSPORTS))}")
+    module_name, class_name = _TRANSPORTS[name]
+    cls: Callable[..., Transport] = getattr(
+        importlib.import_module(f'.{module_name}', __package__), class_name
+    )
+    return cls(pool=pool, instrumented=instrumented)
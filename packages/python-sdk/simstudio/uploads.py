@@ -0,0 +1,481 @@
+"""
+Uploads of large workflow inputs straight from disk, referenced from ``input_data``.
+"""
+
+import hashlib
+import itertools
+import json
+import mimetypes
+import mmap
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import quote
+
+from . import SimStudioError
+from .transport import PoolConfig, Response, Transport, TransportError
+
+if TYPE_CHECKING:
+    from . import SimStudioClient
+
+# S3 accepts at most 10,000 parts, each at least 5 MiB except the last one.
+_MIN_PART_SIZE = 5 * 1024 * 1024
+_MAX_PARTS = 10_000
+# Largest file /api/files/presigned hands out a single upload URL for.
+_MAX_PRESIGNED_SIZE = 100 * 1024 * 1024
+# Largest file posted to /api/files/upload, whose form body is a full in-memory copy.
+_MAX_FORM_SIZE = 100 * 1024 * 1024
+_HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class _Unsupported(Exception):
+    """The server's storage backend does not offer this upload method."""
+
+
+@contextmanager
+def _mapped(path: str) -> Iterator[memoryview]:
+    """Map a file read-only, yielding a memoryview whose slices share the mapping."""
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            # Empty files cannot be mapped.
+            yield memoryview(b'')
+            return
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        try:
+            yield view
+        finally:
+            view.release()
+            try:
+                mapping.close()
+            except BufferError:
+                # A slice is still referenced (e.g. by a traceback); the map closes with it.
+                pass
+
+
+def _sha256(data: memoryview) -> str:
+    digest = hashlib.sha256()
+    for start in range(0, len(data), _HASH_CHUNK_SIZE):
+        with data[start:start + _HASH_CHUNK_SIZE] as chunk:
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _expired(reference: Dict[str, Any]) -> bool:
+    expires_at = reference.get('expiresAt')
+    if not expires_at:
+        return False
+    try:
+        moment = datetime.fromisoformat(expires_at.replace('Z', '+00:00'))
+    except ValueError:
+        return True
+    return moment <= datetime.now(timezone.utc)
+
+
+def _storage_transport(transport: Transport, max_connections: int) -> Optional[Transport]:
+    """
+    A transport for presigned storage URLs, which must not receive the client's API key.
+
+    Returns a fresh transport of the same kind as a built-in one, or None for a custom
+    transport (e.g. MemoryTransport in tests), which is then used as-is.
+    """
+    from .balancer import _BalancedTransport
+    if isinstance(transport, _BalancedTransport):
+        transport = transport.transport
+    pool = PoolConfig(max_connections=max_connections)
+    from .http_transport import HTTPTransport
+    if isinstance(transport, HTTPTransport):
+        return HTTPTransport(pool=pool)
+    from .requests_transport import RequestsTransport
+    if isinstance(transport, RequestsTransport):
+        return RequestsTransport(pool=pool)
+    return None
+
+
+class FileUploader:
+    """
+    Uploads local files to the Sim file store and returns references for ``input_data``.
+
+    A file is memory-mapped and sent straight from the mapping: every request body is a
+    ``memoryview`` slice of the map, so the client never copies the file and its memory
+    use does not grow with the file size. Files larger than ``part_size`` go through the
+    S3 multipart API (``/api/files/multipart``) with ``max_concurrency`` parts uploaded
+    in parallel; a failed part is retried on its own, without re-sending the rest of
+    the file. Smaller files get a single presigned upload (``/api/files/presigned``).
+    When the server stores files locally, neither is offered and the file is posted to
+    ``/api/files/upload`` instead, which needs one in-memory copy of it; files larger
+    than 100 MiB are refused there rather than copied.
+
+    Uploads are content-addressed: references are remembered by the file's SHA-256 and
+    size, so uploading the same bytes again returns the earlier reference without
+    sending anything. Pass ``cache_path`` to keep references in an SQLite file across
+    processes. References carrying an ``expiresAt`` are re-uploaded once it passes.
+
+    Args:
+        client: The SimStudioClient whose base URL and credentials are used
+        part_size: Bytes per multipart part and size above which files are sent in parts
+            (default: 8 MiB, at least 5 MiB). Raised as needed to stay within 10,000 parts.
+        max_concurrency: Parts uploaded at the same time (default: 4)
+        max_attempts: Attempts per storage upload request, retrying transport errors and
+            5xx answers (default: 3)
+        cache_path: SQLite file that persists the content-addressed references (default:
+            memory only)
+        storage_transport: Transport for the presigned storage URLs (default: a new
+            transport of the client's kind, without its API key header)
+
+    Attributes:
+        uploads: Files uploaded
+        cache_hits: Uploads skipped because the content was uploaded before
+        bytes_sent: File bytes sent to storage, counting every attempt of a retried request
+    """
+
+    def __init__(
+        self,
+        client: "SimStudioClient",
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4,
+        max_attempts: int = 3,
+        cache_path: Optional[str] = None,
+        storage_transport: Optional[Transport] = None,
+    ):
+        if part_size < _MIN_PART_SIZE:
+            raise ValueError(f'part_size must be at least {_MIN_PART_SIZE} bytes')
+        if max_concurrency < 1 or max_attempts < 1:
+            raise ValueError('max_concurrency and max_attempts must be at least 1')
+        self._client = client
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.uploads = 0
+        self.cache_hits = 0
+        self.bytes_sent = 0
+        owned = (
+            None if storage_transport else _storage_transport(client._transport, max_concurrency)
+        )
+        self._storage = storage_transport or owned or client._transport
+        self._owns_storage = owned is not None
+        self._unsupported: Set[str] = set()
+        self._references: Dict[str, Dict[str, Any]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if cache_path is not None:
+            self._db = sqlite3.connect(cache_path, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS uploads (key TEXT PRIMARY KEY, reference TEXT NOT NULL)'
+            )
+
+    def upload(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        name: Optional[str] = None,
+        content_type: Optional[str] = None,
+        timeout: float = 60.0,
+    ) -> Dict[str, Any]:
+        """
+        Upload a file, or return the reference of an earlier upload of the same content.
+
+        Args:
+            path: File to upload
+            name: File name shown in Sim (default: the file's base name)
+            content_type: MIME type (default: guessed from ``name``)
+            timeout: Timeout in seconds for each request (default: 60.0)
+
+        Returns:
+            The file reference, shaped like Sim's execution files: ``id``, ``name``,
+            ``url``, ``size``, ``type``, ``key``, ``path``, ``uploadedAt`` and ``sha256``
+            (plus ``expiresAt`` when the server gave one). Put it in ``input_data``.
+
+        Raises:
+            SimStudioError: If the upload fails (code ``UPLOAD_ERROR`` for transport and
+                storage failures)
+            OSError: If the file cannot be read
+        """
+        path = os.fspath(path)
+        name = name or os.path.basename(path)
+        content_type = content_type or mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        with _mapped(path) as data:
+            digest = _sha256(data)
+            key = '\x1f'.join((self._client.base_url, digest, str(len(data))))
+            cached = self._cached(key)
+            if cached is not None:
+                with self._lock:
+                    self.cache_hits += 1
+                return dict(cached, name=name)
+            reference = self._send(data, name, content_type, timeout)
+        reference['sha256'] = digest
+        self._remember(key, reference)
+        with self._lock:
+            self.uploads += 1
+        return dict(reference)
+
+    def _send(
+        self, data: memoryview, name: str, content_type: str, timeout: float
+    ) -> Dict[str, Any]:
+        """Upload with the first method the server's storage backend supports."""
+        size = len(data)
+        methods = []
+        if size > self.part_size:
+            methods.append(('multipart', self._upload_multipart))
+        if 0 < size <= _MAX_PRESIGNED_SIZE:
+            methods.append(('presigned', self._upload_presigned))
+        methods.append(('form', self._upload_form))
+        for method, send in methods:
+            if method in self._unsupported:
+                continue
+            try:
+                return send(data, name, content_type, timeout)
+            except _Unsupported:
+                self._unsupported.add(method)
+        raise SimStudioError('The server offers no supported upload method', 'UPLOAD_ERROR')
+
+    def _upload_multipart(
+        self, data: memoryview, name: str, content_type: str, timeout: float
+    ) -> Dict[str, Any]:
+        try:
+            session = self._api('/api/files/multipart?action=initiate', {
+                'fileName': name, 'contentType': content_type, 'fileSize': len(data),
+            }, timeout)
+        except SimStudioError as e:
+            if e.status == 400:
+                # Only offered when the server stores files on S3.
+                raise _Unsupported() from e
+            raise
+        upload_id, key = session['uploadId'], session['key']
+        part_size = max(self.part_size, -(-len(data) // _MAX_PARTS))
+        try:
+            parts = self._put_parts(data, upload_id, key, part_size, timeout)
+            result = self._api('/api/files/multipart?action=complete', {
+                'uploadId': upload_id, 'key': key, 'parts': parts,
+            }, timeout)
+        except BaseException:
+            try:
+                self._api('/api/files/multipart?action=abort',
+                          {'uploadId': upload_id, 'key': key}, timeout)
+            except SimStudioError:
+                pass
+            raise
+        return self._reference(result.get('path') or '', key, name, content_type, len(data))
+
+    def _put_parts(
+        self, data: memoryview, upload_id: str, key: str, part_size: int, timeout: float
+    ) -> List[Dict[str, Any]]:
+        """PUT every part, keeping ``max_concurrency`` in flight, and return their ETags."""
+        numbers = iter(range(1, -(-len(data) // part_size) + 1))
+        urls: Deque[Tuple[int, str]] = deque()
+        in_flight: Set[Future] = set()
+        parts: List[Dict[str, Any]] = []
+        executor = self._parts_executor()
+        try:
+            while True:
+                while len(in_flight) < self.max_concurrency:
+                    if not urls:
+                        batch = list(itertools.islice(numbers, 2 * self.max_concurrency))
+                        if not batch:
+                            break
+                        urls.extend(self._part_urls(upload_id, key, batch, timeout))
+                    number, url = urls.popleft()
+                    start = (number - 1) * part_size
+                    in_flight.add(executor.submit(
+                        self._put_part, url, data, number, start, start + part_size, timeout
+                    ))
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                parts.extend(future.result() for future in done)
+        finally:
+            for future in in_flight:
+                future.cancel()
+            # Running parts hold slices of the map, which must be released before it closes.
+            wait(in_flight)
+        return sorted(parts, key=lambda part: part['PartNumber'])
+
+    def _part_urls(
+        self, upload_id: str, key: str, numbers: List[int], timeout: float
+    ) -> List[Tuple[int, str]]:
+        result = self._api('/api/files/multipart?action=get-part-urls', {
+            'uploadId': upload_id, 'key': key, 'partNumbers': numbers,
+        }, timeout)
+        return [(entry['partNumber'], entry['url']) for entry in result['presignedUrls']]
+
+    def _put_part(
+        self, url: str, data: memoryview, number: int, start: int, end: int, timeout: float
+    ) -> Dict[str, Any]:
+        with data[start:end] as body:
+            response = self._put(url, body, {}, timeout)
+        etag = response.headers.get('ETag') or response.headers.get('etag')
+        if not etag:
+            raise SimStudioError(
+                f'Storage returned no ETag for part {number}; it must expose the ETag header',
+                'UPLOAD_ERROR'
+            )
+        return {'ETag': etag, 'PartNumber': number}
+
+    def _upload_presigned(
+        self, data: memoryview, name: str, content_type: str, timeout: float
+    ) -> Dict[str, Any]:
+        try:
+            result = self._api('/api/files/presigned', {
+                'fileName': name, 'contentType': content_type, 'fileSize': len(data),
+            }, timeout)
+        except SimStudioError as e:
+            if e.code == 'STORAGE_CONFIG_ERROR':
+                # Only offered when the server uses cloud storage.
+                raise _Unsupported() from e
+            raise
+        headers = {'Content-Type': content_type}
+        headers.update(result.get('uploadHeaders') or {})
+        self._put(result['presignedUrl'], data, headers, timeout)
+        info = result.get('fileInfo') or {}
+        return self._reference(
+            info.get('path') or '', info.get('key') or '', name, content_type, len(data)
+        )
+
+    def _upload_form(
+        self, data: memoryview, name: str, content_type: str, timeout: float
+    ) -> Dict[str, Any]:
+        if len(data) > _MAX_FORM_SIZE:
+            raise SimStudioError(
+                f'File is too large for the server\'s local storage: {len(data)} bytes '
+                f'(at most {_MAX_FORM_SIZE})',
+                'UPLOAD_ERROR',
+            )
+        boundary = uuid.uuid4().hex
+        head = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+            f'filename="{quote(name)}"\r\nContent-Type: {content_type}\r\n\r\n'
+        ).encode('utf-8')
+        body = b''.join((head, data, f'\r\n--{boundary}--\r\n'.encode('utf-8')))
+        result = self._api('/api/files/upload', body, timeout, {
+            'Content-Type': f'multipart/form-data; boundary={boundary}',
+        })
+        with self._lock:
+            self.bytes_sent += len(data)
+        reference = self._reference(
+            result.get('path') or '', result.get('key') or '', name, content_type, len(data)
+        )
+        if result.get('url'):
+            reference['url'] = self._absolute(result['url'])
+        if result.get('expiresAt'):
+            reference['expiresAt'] = result['expiresAt']
+        return reference
+
+    def _reference(
+        self, path: str, key: str, name: str, content_type: str, size: int
+    ) -> Dict[str, Any]:
+        return {
+            'id': key,
+            'name': name,
+            'url': self._absolute(path),
+            'size': size,
+            'type': content_type,
+            'key': key,
+            'path': path,
+            'uploadedAt': datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace(
+                '+00:00', 'Z'
+            ),
+        }
+
+    def _absolute(self, url: str) -> str:
+        return f'{self._client.base_url}{url}' if url.startswith('/') else url
+
+    def _api(
+        self,
+        path: str,
+        payload: Union[Dict[str, Any], bytes],
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """POST to a Sim files route and decode its JSON answer."""
+        client = self._client
+        body = payload if isinstance(payload, bytes) else client._codec.dumps(payload)
+        try:
+            response = client._transport.request(
+                'POST', f'{client.base_url}{path}', body=body, headers=headers, timeout=timeout
+            )
+            if not response.ok:
+                raise client._error_from(response)
+            result: Dict[str, Any] = client._codec.loads(response.content)
+            return result
+        except (TransportError, ValueError) as e:
+            raise SimStudioError(f'Failed to upload file: {str(e)}', 'UPLOAD_ERROR') from e
+
+    def _put(
+        self, url: str, body: memoryview, headers: Dict[str, str], timeout: float
+    ) -> Response:
+        """PUT a body to a presigned storage URL, retrying transport errors and 5xx answers."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = self._storage.request(
+                    'PUT', url, body=body, headers=headers, timeout=timeout
+                )
+            except TransportError as e:
+                error = SimStudioError(f'Failed to upload file: {str(e)}', 'UPLOAD_ERROR')
+                error.__cause__ = e
+            else:
+                with self._lock:
+                    self.bytes_sent += len(body)
+                if response.ok:
+                    return response
+                error = SimStudioError(
+                    f'Storage rejected the upload: HTTP {response.status_code}',
+                    'UPLOAD_ERROR',
+                    response.status_code
+                )
+                if response.status_code < 500:
+                    raise error
+            if attempt < self.max_attempts:
+                time.sleep(random.uniform(0, min(2.0, 0.1 * 2 ** attempt)))
+        raise error
+
+    def _parts_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix='simstudio-upload'
+                )
+            return self._executor
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            reference = self._references.get(key)
+            if reference is None and self._db is not None:
+                row = self._db.execute(
+                    'SELECT reference FROM uploads WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    reference = self._references[key] = json.loads(row[0])
+            if reference is not None and _expired(reference):
+                self._references.pop(key, None)
+                return None
+            return reference
+
+    def _remember(self, key: str, reference: Dict[str, Any]) -> None:
+        with self._lock:
+            self._references[key] = reference
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO uploads VALUES (?, ?)', (key, json.dumps(reference))
+                )
+
+    def close(self) -> None:
+        """Stop the part upload threads and close the storage transport and cache file."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            db, self._db = self._db, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if db is not None:
+            db.close()
+        if self._owns_storage:
+            self._storage.close()
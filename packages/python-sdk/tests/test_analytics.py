@@ -0,0 +1,94 @@
+"""
+Tests for columnar trace-span analytics
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from simstudio import TraceStore, WorkflowExecutionResult  # noqa: E402
+
+
+def span(name, start_ms, duration, block_id=None, span_type="agent", children=None, **extra):
+    def iso(ms):
+        return f"2024-01-01T00:00:{ms // 1000:02d}.{ms % 1000:03d}Z"
+
+    value = {
+        "name": name, "type": span_type, "duration": duration,
+        "startTime": iso(start_ms), "endTime": iso(start_ms + duration),
+        "status": "success", **extra,
+    }
+    if block_id:
+        value["blockId"] = block_id
+    if children:
+        value["children"] = children
+    return value
+
+
+def execution(slow=1.0):
+    """Start -> (agent || fetch) -> end, where the agent path is the longer one."""
+    return [
+        span("Start", 0, 10, "start"),
+        span("Agent", 10, int(300 * slow), "agent", children=[
+            span("openai", 20, int(250 * slow), span_type="model",
+                 tokens={"prompt": 10, "completion": 5}),
+        ]),
+        span("Fetch", 10, 50, "fetch", span_type="api"),
+        span("End", 10 + int(300 * slow), 5, "end"),
+    ]
+
+
+def test_flattens_spans_into_columns_with_critical_path():
+    """Test that nested spans become rows and only the longest chain is critical."""
+    store = TraceStore()
+    store.add(WorkflowExecutionResult(success=True, trace_spans=execution()), workflow_id="wf-1")
+    # A single synthetic workflow span around the blocks is looked through.
+    store.add([span("Workflow Execution", 0, 315, span_type="workflow", children=execution())])
+
+    assert len(store) == 11 and store.executions == 2
+    names = store.values("name")
+    critical = dict(zip(names[:5], store.column("critical")[:5]))
+    assert critical == {"Start": True, "Agent": True, "openai": False, "Fetch": False, "End": True}
+    assert store.column("critical")[5:].sum() == 3
+    assert store.column("tokens")[2] == 15
+    assert store.column("parent")[2] == 1
+
+    blocks = store.block_stats(top_level_only=True)
+    assert sorted(blocks["block"]) == ["agent", "end", "fetch", "start"]
+
+
+def test_block_stats_and_deployment_regressions():
+    """Test vectorized percentiles, critical-path share and regression detection."""
+    store = TraceStore(chunk_size=7)
+    for i in range(10):
+        store.add(execution(), workflow_id="wf-1", deployment="v1")
+        store.add(execution(slow=1.5 if i else 1.0), workflow_id="wf-1", deployment="v2")
+
+    stats = store.block_stats(percentiles=(50, 90), deployment="v1")
+    row = {key: values[list(stats["block"]).index("agent")] for key, values in stats.items()}
+    assert row["count"] == 10 and row["p50_ms"] == 300 and row["p90_ms"] == 300
+    assert row["critical_path_share"] == pytest.approx(300 / 315)
+    assert stats["tokens"][list(stats["block"]).index("openai")] == 150
+
+    by_type = store.block_stats(by="type")
+    assert by_type["type"][0] == "agent"
+
+    report = store.compare_deployments("v1", "v2", threshold=0.2)
+    regressed = set(report["block"][report["regressed"]])
+    assert regressed == {"agent", "openai"}
+    assert report["change"][0] == pytest.approx(0.5, abs=0.01)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """Test that a saved store loads back with identical columns and can keep growing."""
+    store = TraceStore()
+    store.extend([execution(), execution(slow=2.0)], workflow_id="wf-1", deployment="v1")
+    path = str(tmp_path / "traces.npz")
+    store.save(path)
+
+    loaded = TraceStore.load(path)
+    assert len(loaded) == len(store) and loaded.executions == 2
+    for name in ("block", "duration", "critical", "tokens"):
+        np.testing.assert_array_equal(loaded.column(name), store.column(name))
+    loaded.add(execution(), workflow_id="wf-1", deployment="v2")
+    assert loaded.block_stats(deployment="v2")["count"].sum() == 5
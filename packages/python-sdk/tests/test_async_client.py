@@ -0,0 +1,195 @@
+"""
+Tests for the asyncio Sim client
+"""
+
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from simstudio import (  # noqa: E402
+    AsyncSimStudioClient,
+    RetryPolicy,
+    SimStudioError,
+    WorkflowExecutionResult,
+    WorkflowStatus,
+)
+
+
+def make_client(handler):
+    return AsyncSimStudioClient(
+        api_key="test-api-key",
+        base_url="https://test.sim.ai/",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.mark.asyncio
+async def test_execute_workflow_returns_result():
+    """Test that execute_workflow posts the input and parses the result."""
+    seen = {}
+
+    def handler(request):
+        seen["url"] = str(request.url)
+        seen["api_key"] = request.headers["X-API-Key"]
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json={
+            "success": True,
+            "output": {"answer": 42},
+            "traceSpans": [{"id": "span-1"}],
+            "totalDuration": 12,
+        })
+
+    async with make_client(handler) as client:
+        result = await client.execute_workflow("wf-1", {"question": "?"})
+
+    assert isinstance(result, WorkflowExecutionResult)
+    assert result.success is True
+    assert result.output == {"answer": 42}
+    assert result.trace_spans == [{"id": "span-1"}]
+    assert result.total_duration == 12
+    assert seen == {
+        "url": "https://test.sim.ai/api/workflows/wf-1/execute",
+        "api_key": "test-api-key",
+        "body": {"question": "?"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_execute_workflow_raises_api_error():
+    """Test that API errors keep their code and status."""
+    def handler(request):
+        return httpx.Response(
+            429, json={"error": "Rate limit exceeded", "code": "RATE_LIMIT_EXCEEDED"}
+        )
+
+    async with make_client(handler) as client:
+        with pytest.raises(SimStudioError) as exc_info:
+            await client.execute_workflow("wf-1")
+
+    assert str(exc_info.value) == "Rate limit exceeded"
+    assert exc_info.value.code == "RATE_LIMIT_EXCEEDED"
+    assert exc_info.value.status == 429
+
+
+@pytest.mark.asyncio
+async def test_execute_workflow_timeout():
+    """Test that transport timeouts map to the TIMEOUT code."""
+    def handler(request):
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    async with make_client(handler) as client:
+        with pytest.raises(SimStudioError) as exc_info:
+            await client.execute_workflow("wf-1", timeout=1.5)
+
+    assert exc_info.value.code == "TIMEOUT"
+
+
+@pytest.mark.asyncio
+async def test_unencodable_input_raises_sdk_error():
+    """Test that input the codec cannot serialize maps to EXECUTION_ERROR and is not sent."""
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(200, json={"success": True})
+
+    async with make_client(handler) as client:
+        for call in (client.execute_workflow, client.stream_workflow, client.execute_workflow_sync):
+            with pytest.raises(SimStudioError) as exc_info:
+                await call("wf-1", {"a": {1, 2}})
+            assert exc_info.value.code == "EXECUTION_ERROR"
+
+    assert sent == []
+
+
+@pytest.mark.asyncio
+async def test_malformed_success_bodies_raise_sdk_errors():
+    """Test that an unparseable 2xx body maps to the same error codes as the sync client."""
+    def handler(request):
+        return httpx.Response(200, content=b"<html>not json</html>")
+
+    async with make_client(handler) as client:
+        with pytest.raises(SimStudioError) as execution_error:
+            await client.execute_workflow("wf-1")
+        with pytest.raises(SimStudioError) as status_error:
+            await client.get_workflow_status("wf-1", timeout=1.0)
+
+    assert execution_error.value.code == "EXECUTION_ERROR"
+    assert status_error.value.code == "STATUS_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_execute_workflow_retries_connect_errors_and_gateway_errors():
+    """Test that the retry policy covers connect failures and 503s, but not read timeouts."""
+    answers = [httpx.ConnectError("refused"), httpx.Response(503), httpx.ReadTimeout("slow")]
+
+    def handler(request):
+        answer = answers.pop(0) if answers else httpx.Response(200, json={"success": True})
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    async with AsyncSimStudioClient(
+        api_key="test-api-key",
+        transport=httpx.MockTransport(handler),
+        retry=RetryPolicy(max_attempts=5, base_delay=0.001),
+    ) as client:
+        with pytest.raises(SimStudioError) as exc_info:
+            await client.execute_workflow("wf-1")
+        result = await client.execute_workflow("wf-1")
+
+    assert exc_info.value.code == "TIMEOUT"
+    assert result.success is True
+
+
+@pytest.mark.asyncio
+async def test_get_workflow_status_and_validate():
+    """Test status parsing and validate_workflow fallbacks."""
+    def handler(request):
+        if "missing" in request.url.path:
+            return httpx.Response(404, json={"error": "Workflow not found"})
+        return httpx.Response(200, json={"isDeployed": True, "deployedAt": "2024-01-01T00:00:00Z"})
+
+    async with make_client(handler) as client:
+        status = await client.get_workflow_status("wf-1")
+        assert status == WorkflowStatus(is_deployed=True, deployed_at="2024-01-01T00:00:00Z")
+        assert await client.validate_workflow("wf-1") is True
+        assert await client.validate_workflow("missing") is False
+
+
+def test_set_api_key_updates_headers():
+    """Test that set_api_key updates the pooled client headers."""
+    client = AsyncSimStudioClient(api_key="test-api-key")
+    client.set_api_key("new-api-key")
+    assert client.api_key == "new-api-key"
+    assert client._client.headers["X-API-Key"] == "new-api-key"
+
+
+@pytest.mark.asyncio
+async def test_execute_workflow_sync_polls_job(monkeypatch):
+    """Test that the async client queues the run and polls /api/jobs."""
+    async def no_sleep(delay):
+        return None
+
+    monkeypatch.setattr("simstudio.async_client.asyncio.sleep", no_sleep)
+    polls = iter([
+        {"taskId": "task-1", "status": "processing", "estimatedDuration": 180000},
+        {"taskId": "task-1", "status": "completed", "output": {"success": True, "output": "done"}},
+    ])
+
+    def handler(request):
+        if request.method == "POST":
+            assert request.headers["X-Execution-Mode"] == "async"
+            return httpx.Response(
+                202, json={"success": True, "taskId": "task-1", "status": "queued"}
+            )
+        assert request.url.path == "/api/jobs/task-1"
+        return httpx.Response(200, json=next(polls))
+
+    async with make_client(handler) as client:
+        result = await client.execute_workflow_sync("wf-1")
+
+    assert result.success is True
+    assert result.output == "done"
@@ -0,0 +1,104 @@
+"""
+Tests for client-side load balancing
+"""
+
+import json
+import time
+from urllib.parse import urlsplit
+
+from simstudio import LoadBalancer, RetryPolicy, SimStudioClient
+from simstudio.testing import MockSimServer
+from simstudio.transport import Response, Transport, TransportError
+
+
+class Replicas(Transport):
+    """Answers each replica's requests by host: 200, or ``down[host]`` as a status or error."""
+
+    def __init__(self, latency=0.0):
+        super().__init__()
+        self.latency = latency
+        self.down = {}
+        self.requests = []
+
+    def request(self, method, url, body=None, headers=None, timeout=None, stream=False):
+        parts = urlsplit(url)
+        self.requests.append((parts.netloc, parts.path))
+        failure = self.down.get(parts.netloc)
+        if failure == "refused":
+            raise TransportError("Connection refused", connect=True)
+        time.sleep(self.latency)
+        status = failure or 200
+        ok = {"success": True, "isDeployed": True}
+        payload = ok if status == 200 else {"error": "Bad Gateway"}
+        return Response(status, "", {}, content=json.dumps(payload).encode("utf-8"))
+
+    def hosts(self, path_suffix="/execute"):
+        return [host for host, path in self.requests if path.endswith(path_suffix)]
+
+
+def test_requests_favor_idle_fast_replicas():
+    """Test least-outstanding-requests routing weighted by latency across real servers."""
+    with MockSimServer(latency=0.002) as fast, MockSimServer(latency=0.04) as slow, \
+            MockSimServer(latency=0.002) as other:
+        urls = [fast.url, slow.url, other.url]
+        with SimStudioClient(api_key="test-api-key", base_url=urls, transport="http") as client:
+            results = list(client.execute_many((("wf-1", {"n": n}) for n in range(200)),
+                                               max_concurrency=8))
+            stats = client.endpoint_stats()
+
+    assert all(result.success for _, result in results)
+    assert [s.url for s in stats] == urls
+    assert sum(s.requests for s in stats) == 200
+    assert stats[1].requests < 20
+    assert stats[0].latency < stats[1].latency
+    assert all(s.in_flight == 0 and s.state == "healthy" for s in stats)
+
+
+def test_failing_replica_is_ejected_and_ramps_back():
+    """Test passive ejection after refused connections, then a gradual return."""
+    # Slower than the latency assumed for a replica without samples, so b gets tried.
+    replicas = Replicas(latency=0.005)
+    replicas.down["b:80"] = "refused"
+    balancer = LoadBalancer(["http://a:80", "http://b:80"], failure_threshold=1,
+                            ejection_time=0.2, slow_start=0.4)
+    client = SimStudioClient(api_key="test-api-key", base_url=balancer, transport=replicas,
+                             retry=RetryPolicy(max_attempts=2, base_delay=0.001))
+
+    for n in range(20):
+        assert client.execute_workflow("wf-1", {"n": n}).success is True
+    b = client.endpoint_stats()[1]
+    assert (b.state, b.requests, b.failures, b.ejections) == ("ejected", 1, 1, 1)
+    assert replicas.hosts().count("a:80") == 20
+
+    replicas.down.clear()
+    time.sleep(0.25)
+    b = client.endpoint_stats()[1]
+    assert b.state == "warming" and 0.1 <= b.weight < 1.0
+    time.sleep(0.4)
+    assert client.endpoint_stats()[1].state == "healthy"
+    client.close()
+
+
+def test_active_health_checks_eject_and_readmit():
+    """Test that status checks eject a replica answering 503 without any traffic."""
+    replicas = Replicas()
+    replicas.down["b:80"] = 503
+    balancer = LoadBalancer(["http://a:80", "http://b:80"], failure_threshold=2,
+                            ejection_time=0.05, slow_start=0.0,
+                            health_check_workflow="wf-health", health_check_interval=0.02)
+    client = SimStudioClient(api_key="test-api-key", base_url=balancer, transport=replicas)
+
+    time.sleep(0.15)
+    assert client.endpoint_stats()[1].state == "ejected"
+    for _ in range(5):
+        client.execute_workflow("wf-1")
+    assert set(replicas.hosts()) == {"a:80"}
+    assert replicas.hosts("/wf-health/status").count("b:80") >= 2
+
+    replicas.down.clear()
+    time.sleep(0.15)
+    assert client.endpoint_stats()[1].state == "healthy"
+    client.set_base_url("http://c:80")
+    assert client.endpoint_stats() == []
+    assert client.get_workflow_status("wf-1").is_deployed is True
+    assert replicas.requests[-1] == ("c:80", "/api/workflows/wf-1/status")
@@ -0,0 +1,280 @@
+"""
+Tests for client-side caches
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from simstudio import (
+    ResultCache,
+    SimStudioClient,
+    SimStudioError,
+    StatusCache,
+    WorkflowExecutionResult,
+    WorkflowStatus,
+)
+from simstudio.cache import SingleFlight, canonical_input_hash
+
+
+def test_status_cache_ttl_and_lru_eviction():
+    """Test that entries expire after the TTL and the LRU entry is evicted when full."""
+    cache = StatusCache(maxsize=2, ttl=0.05)
+    cache.put("a", WorkflowStatus(is_deployed=True))
+    cache.put("b", WorkflowStatus(is_deployed=True))
+    cache.get("a")
+    cache.put("c", WorkflowStatus(is_deployed=False))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+
+def test_single_flight_shares_one_call():
+    """Test that concurrent callers for the same key share one call and its result."""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(1)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["value"] * 5
+
+
+def test_client_status_cache_makes_one_request_per_workflow():
+    """Test that validate_workflow hits the status endpoint once per workflow."""
+    client = SimStudioClient(api_key="test-api-key", status_cache=True)
+    response = Mock(ok=True, status_code=200, content=b'{"isDeployed": true}')
+
+    with patch.object(client._transport, "request", return_value=response) as mock_request:
+        assert all(client.validate_workflow("wf-1") for _ in range(10))
+        assert client.validate_workflow("wf-2")
+
+    assert mock_request.call_count == 2
+
+
+def test_client_invalidates_status_on_not_deployed_error():
+    """Test that a not-deployed execution error drops the cached status."""
+    client = SimStudioClient(api_key="test-api-key", status_cache=True)
+    client._status_cache.put("wf-1", WorkflowStatus(is_deployed=True))
+    client._status_cache.put("wf-2", WorkflowStatus(is_deployed=True))
+    not_deployed = Mock(ok=False, status_code=403, reason="Forbidden")
+    not_deployed.json.return_value = {
+        "error": "Workflow is not deployed", "code": "WORKFLOW_IS_NOT_DEPLOYED"
+    }
+
+    with patch.object(client._transport, "request", return_value=not_deployed):
+        try:
+            client.execute_workflow("wf-1")
+        except SimStudioError:
+            pass
+
+    assert client._status_cache.get("wf-1") is None
+    assert client._status_cache.get("wf-2") is not None
+
+    client.invalidate_workflow_status()
+    assert len(client._status_cache) == 0
+
+
+def test_canonical_input_hash_ignores_key_order():
+    """Test that equivalent inputs hash identically."""
+    same = canonical_input_hash({"b": [1, 2], "a": 1})
+    assert canonical_input_hash({"a": 1, "b": [1, 2]}) == same
+    assert canonical_input_hash(None) == canonical_input_hash({})
+    assert canonical_input_hash({"a": 1}) != canonical_input_hash({"a": 2})
+
+
+def test_result_cache_memory_and_disk_tiers(tmp_path):
+    """Test memory hits, disk hits after a restart, and that failures are not cached."""
+    path = str(tmp_path / "results.sqlite")
+    cache = ResultCache(path=path)
+    cache.put("wf", "v1", {"x": 1}, WorkflowExecutionResult(success=True, output={"y": 2}))
+    cache.put("wf", "v1", {"x": 2}, WorkflowExecutionResult(success=False, error="boom"))
+
+    assert cache.get("wf", "v1", {"x": 1}).output == {"y": 2}
+    assert cache.get("wf", "v1", {"x": 2}) is None
+    cache.close()
+
+    reopened = ResultCache(path=path)
+    assert reopened.get("wf", "v1", {"x": 1}).output == {"y": 2}
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+
+
+def test_result_cache_redeploy_invalidates_workflow(tmp_path):
+    """Test that a new deployment timestamp purges older entries for the workflow."""
+    cache = ResultCache(path=str(tmp_path / "results.sqlite"))
+    cache.put("wf", "v1", {"x": 1}, WorkflowExecutionResult(success=True, output=1))
+    cache.put("other", "v1", {"x": 1}, WorkflowExecutionResult(success=True, output=2))
+
+    assert cache.get("wf", "v2", {"x": 1}) is None
+    assert cache.get("wf", "v1", {"x": 1}) is None
+    assert cache.get("other", "v1", {"x": 1}).output == 2
+    cache.close()
+
+
+def test_result_cache_size_based_eviction(tmp_path):
+    """Test LRU eviction in both tiers."""
+    cache = ResultCache(maxsize=2, path=str(tmp_path / "results.sqlite"), max_disk_bytes=300)
+    for i in range(5):
+        cache.put("wf", "v1", {"i": i}, WorkflowExecutionResult(success=True, output="x" * 50))
+
+    stats = cache.stats()
+    assert stats["memory_entries"] == 2
+    assert stats["disk_bytes"] <= 300
+    assert stats["evictions"] > 3
+    assert cache.get("wf", "v1", {"i": 4}) is not None
+    cache.close()
+
+
+def test_client_result_cache_serves_repeat_executions():
+    """Test that repeated identical executions are served locally."""
+    client = SimStudioClient(api_key="test-api-key", result_cache=True)
+    status = Mock(
+        ok=True, status_code=200,
+        content=b'{"isDeployed": true, "deployedAt": "2024-01-01T00:00:00Z"}',
+    )
+    executed = Mock(
+        ok=True, status_code=200, content=b'{"success": true, "output": {"answer": 42}}'
+    )
+
+    responses = {"GET": status, "POST": executed}
+    with patch.object(client._transport, "request",
+                      side_effect=lambda method, url, **kwargs: responses[method]) as mock_request:
+        first = client.execute_workflow("wf-1", {"b": 1, "a": 2})
+        second = client.execute_workflow("wf-1", {"a": 2, "b": 1})
+
+    assert first.output == second.output == {"answer": 42}
+    # The hit is served after a status request confirms the deployment.
+    assert [call.args[0] for call in mock_request.call_args_list] == ["GET", "POST", "GET"]
+    assert client._result_cache.stats()["hits"] == 1
+
+
+def test_client_result_cache_notices_redeploy_within_status_ttl():
+    """Test that a redeploy hidden by the cached status is not served old results."""
+    client = SimStudioClient(api_key="test-api-key", result_cache=True)
+    deployments = iter([b"v1", b"v2"])
+
+    def respond(method, url, **kwargs):
+        if method == "GET":
+            deployed_at = next(deployments, b"v2")
+            content = b'{"isDeployed": true, "deployedAt": "' + deployed_at + b'"}'
+        else:
+            content = b'{"success": true, "output": %d}' % len(executions)
+            executions.append(url)
+        return Mock(ok=True, status_code=200, content=content)
+
+    executions = []
+    with patch.object(client._transport, "request", side_effect=respond):
+        first = client.execute_workflow("wf-1", {"a": 1})
+        second = client.execute_workflow("wf-1", {"a": 1})
+        third = client.execute_workflow("wf-1", {"a": 1})
+
+    assert (first.output, second.output, third.output) == (0, 1, 1)
+    assert len(executions) == 2
+    assert client.get_workflow_status("wf-1").deployed_at == "v2"
+
+
+def test_client_result_cache_is_scoped_to_base_url_and_api_key(tmp_path):
+    """Test that results cached for one server or API key are not served for another."""
+    cache = ResultCache(path=str(tmp_path / "results.sqlite"))
+    client = SimStudioClient(api_key="key-a", result_cache=cache)
+    status = Mock(ok=True, status_code=200, content=b'{"isDeployed": true, "deployedAt": "v1"}')
+    executed = Mock(ok=True, status_code=200, content=b'{"success": true, "output": 1}')
+
+    responses = {"GET": status, "POST": executed}
+    with patch.object(client._transport, "request",
+                      side_effect=lambda method, url, **kwargs: responses[method]) as mock_request:
+        client.execute_workflow("wf-1")
+        client.set_base_url("https://staging.sim.ai")
+        client.execute_workflow("wf-1")
+        client.set_api_key("key-b")
+        client.execute_workflow("wf-1")
+        client.set_api_key("key-a")
+        client.execute_workflow("wf-1")
+
+    assert [call.args[0] for call in mock_request.call_args_list].count("POST") == 3
+    assert cache.stats()["hits"] == 1
+    cache.invalidate("wf-1")
+    assert cache.stats()["memory_entries"] == cache.stats()["disk_bytes"] == 0
+    cache.close()
+
+
+def test_client_coalesces_identical_in_flight_executions():
+    """Test that concurrent identical executions share one request and one result."""
+    client = SimStudioClient(api_key="test-api-key", coalesce=True)
+    release = threading.Event()
+    calls = []
+
+    def slow_execute(workflow_id, input_data, timeout, fields=None):
+        calls.append(workflow_id)
+        release.wait(1)
+        return WorkflowExecutionResult(success=True, output=input_data)
+
+    results = []
+
+    def execute(input_data):
+        results.append(client.execute_workflow("wf", input_data))
+
+    with patch.object(client, "_execute", side_effect=slow_execute):
+        threads = [threading.Thread(target=execute, args=({"a": 1, "b": 2},)) for _ in range(5)]
+        other = threading.Thread(target=execute, args=({"a": 2},))
+        for thread in threads + [other]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads + [other]:
+            thread.join()
+
+    assert len(calls) == 2
+    assert len(results) == 6
+    assert client._in_flight.shared == 4
+
+
+def test_coalesced_callers_share_errors_and_time_out_independently():
+    """Test error propagation to attached callers and per-caller timeouts."""
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        release.wait(1)
+        raise SimStudioError("boom", "EXECUTION_ERROR", 500)
+
+    def attach(timeout):
+        try:
+            flight.do("k", failing, timeout=timeout)
+        except (SimStudioError, TimeoutError) as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=attach, args=(None,))
+    leader.start()
+    time.sleep(0.02)
+    impatient = threading.Thread(target=attach, args=(0.01,))
+    patient = threading.Thread(target=attach, args=(None,))
+    impatient.start()
+    patient.start()
+    impatient.join()
+    release.set()
+    leader.join()
+    patient.join()
+
+    assert isinstance(errors[0], TimeoutError)
+    assert [(e.code, e.status) for e in errors[1:]] == [("EXECUTION_ERROR", 500)] * 2
+    assert errors[1] is not errors[2]
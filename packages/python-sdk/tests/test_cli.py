@@ -0,0 +1,88 @@
+"""
+Tests for the simstudio command-line interface
+"""
+
+import json
+
+import pytest
+
+from simstudio.cli import Checkpoint, main
+from simstudio.testing import MockSimServer
+
+
+@pytest.fixture
+def server():
+    with MockSimServer(payload_size=4) as mock_server:
+        yield mock_server
+
+
+def run_cli(server, *args):
+    return main(["run", "wf-1", "--api-key", "test-api-key", "--base-url", server.url, *args])
+
+
+def read_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_run_streams_jsonl_records_to_output(server, tmp_path):
+    """Test that every record is executed once and written with its line index."""
+    source = tmp_path / "records.jsonl"
+    source.write_text("".join(json.dumps({"n": n}) + "\n" for n in range(20)) + "\n")
+    out = tmp_path / "results.jsonl"
+
+    status = run_cli(server, "--input", str(source), "--out", str(out), "--concurrency", "4",
+                     "--fields", "success,output")
+
+    assert status == 0
+    results = sorted(read_results(out), key=lambda row: row["index"])
+    assert [row["index"] for row in results] == list(range(20))
+    assert results[7] == {
+        "index": 7, "success": True, "output": {"content": "xxxx", "input": {"n": 7}}
+    }
+    checkpoint = json.loads((tmp_path / "results.jsonl.checkpoint").read_text())
+    assert checkpoint["next"] == 21 and checkpoint["done"] == []
+
+    # Rerunning a finished run executes nothing.
+    assert run_cli(server, "--input", str(source), "--out", str(out)) == 0
+    assert server.stats()["execute"] == 20
+
+
+def test_run_resumes_from_checkpoint_and_trims_partial_output(server, tmp_path):
+    """Test that a rerun skips completed CSV rows and drops a half-written result line."""
+    source = tmp_path / "records.csv"
+    source.write_text("name,city\n" + "".join(f"user{n},paris\n" for n in range(6)))
+    out = tmp_path / "results.jsonl"
+    out.write_text(
+        '{"index": 0, "success": true}\n{"index": 1, "success": true}\n{"index": 3, "succ'
+    )
+    checkpoint = Checkpoint(str(out) + ".checkpoint", "wf-1", str(source))
+    for index in (0, 1, 3):
+        checkpoint.mark(index)
+    checkpoint.save()
+
+    assert run_cli(server, "--input", str(source), "--out", str(out)) == 0
+
+    results = read_results(out)
+    assert [row["index"] for row in results[:2]] == [0, 1]
+    assert sorted(row["index"] for row in results[2:]) == [2, 4, 5]
+    resumed = {row["index"]: row for row in results[2:]}
+    assert resumed[2]["output"]["input"] == {"name": "user2", "city": "paris"}
+    assert server.stats()["execute"] == 3
+
+
+def test_run_records_failures_and_rejects_foreign_checkpoint(tmp_path):
+    """Test that failed executions are written and reflected in the exit status."""
+    source = tmp_path / "records.jsonl"
+    source.write_text('{"n": 1}\n{"n": 2}\n')
+    out = tmp_path / "results.jsonl"
+
+    with MockSimServer(rate_limit=1) as server:
+        assert run_cli(server, "--input", str(source), "--out", str(out), "--concurrency", "1") == 1
+        assert main(["run", "wf-2", "--api-key", "k", "--base-url", server.url,
+                     "--input", str(source), "--out", str(out)]) == 2
+
+    results = sorted(read_results(out), key=lambda row: row["index"])
+    assert results[0]["success"] is True
+    assert results[1]["success"] is False
+    assert results[1]["metadata"]["code"] == "RATE_LIMIT_EXCEEDED"
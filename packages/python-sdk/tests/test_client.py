@@ -2,9 +2,20 @@
 Tests for the Sim Python SDK
 """
 
+import json
+
 import pytest
 from unittest.mock import Mock, patch
-from simstudio import SimStudioClient, SimStudioError, WorkflowExecutionResult, WorkflowStatus
+from simstudio import (
+    CircuitBreaker,
+    SimStudioClient,
+    SimStudioError,
+    WorkflowExecutionResult,
+    WorkflowJob,
+    WorkflowStatus,
+    _next_poll_delay,
+)
+from simstudio.testing import MemoryTransport
 
 
 def test_simstudio_client_initialization():
@@ -42,16 +53,18 @@ def test_set_base_url_strips_trailing_slash():
     assert client.base_url == "https://test.sim.ai"
 
 
-@patch('simstudio.requests.Session.get')
-def test_validate_workflow_returns_false_on_error(mock_get):
+@patch('simstudio.requests_transport.RequestsTransport.request')
+def test_validate_workflow_returns_false_on_error(mock_request):
     """Test that validate_workflow returns False when request fails."""
-    mock_get.side_effect = SimStudioError("Network error")
+    mock_request.side_effect = SimStudioError("Network error")
     
     client = SimStudioClient(api_key="test-api-key")
     result = client.validate_workflow("test-workflow-id")
     
     assert result is False
-    mock_get.assert_called_once_with("https://sim.ai/api/workflows/test-workflow-id/status")
+    mock_request.assert_called_once_with(
+        "GET", "https://sim.ai/api/workflows/test-workflow-id/status"
+    )
 
 
 def test_simstudio_error():
@@ -88,10 +101,200 @@ def test_workflow_status():
     assert status.needs_redeployment is False
 
 
-@patch('simstudio.requests.Session.close')
+@patch('requests.Session.close')
 def test_context_manager(mock_close):
     """Test SimStudioClient as context manager."""
     with SimStudioClient(api_key="test-api-key") as client:
         assert client.api_key == "test-api-key"
     # Should close without error
-    mock_close.assert_called_once() 
\ No newline at end of file
+    mock_close.assert_called_once() 
+
+
+def test_unencodable_input_raises_sdk_error_without_sending():
+    """Test that input the codec cannot serialize maps to EXECUTION_ERROR and is not sent."""
+    breaker = CircuitBreaker(failure_threshold=1)
+    transport = MemoryTransport(lambda method, path, headers, body: (200, {"success": True}))
+    client = SimStudioClient(api_key="test-api-key", transport=transport, circuit_breaker=breaker)
+
+    for call in (client.execute_workflow, client.stream_workflow, client.execute_workflow_sync):
+        with pytest.raises(SimStudioError) as exc_info:
+            call("wf-1", {"a": {1, 2}})
+        assert exc_info.value.code == "EXECUTION_ERROR"
+        assert isinstance(exc_info.value.__cause__, TypeError)
+
+    assert transport.requests == []
+    assert breaker.state("wf-1") == "closed"
+
+
+def test_execute_many_collects_results_and_failures():
+    """Test that execute_many yields every item and turns failures into results."""
+    def fake_execute(workflow_id, input_data=None, timeout=30.0):
+        if workflow_id == "broken":
+            raise SimStudioError("Workflow is not deployed", "NOT_DEPLOYED", 403)
+        return WorkflowExecutionResult(success=True, output=input_data)
+
+    client = SimStudioClient(api_key="test-api-key")
+    items = [("wf-1", {"n": 1}), ("broken", {"n": 2}), ("wf-3", {"n": 3})]
+
+    with patch.object(client, "execute_workflow", side_effect=fake_execute):
+        results = dict(client.execute_many(items, max_concurrency=2))
+
+    assert results[0].output == {"n": 1}
+    assert results[1].success is False
+    assert results[1].error == "Workflow is not deployed"
+    assert results[1].metadata == {"code": "NOT_DEPLOYED", "status": 403}
+    assert results[2].output == {"n": 3}
+
+
+def test_execute_many_ordered_and_lazy():
+    """Test that ordered results follow input order and inputs are pulled lazily."""
+    import time
+
+    consumed = []
+
+    def generate():
+        for i in range(10):
+            consumed.append(i)
+            yield ("wf", {"n": i})
+
+    def fake_execute(workflow_id, input_data=None, timeout=30.0):
+        time.sleep(0.01 * (3 - input_data["n"] % 3))
+        return WorkflowExecutionResult(success=True, output=input_data["n"])
+
+    client = SimStudioClient(api_key="test-api-key")
+    with patch.object(client, "execute_workflow", side_effect=fake_execute):
+        results = client.execute_many(generate(), max_concurrency=3, ordered=True)
+        first_index, first = next(results)
+        assert (first_index, first.output) == (0, 0)
+        assert len(consumed) <= 4
+        rest = [result.output for _, result in results]
+
+    assert rest == list(range(1, 10))
+
+
+def test_execute_many_grows_connection_pool():
+    """Test that execute_many sizes the shared pool to its concurrency."""
+    client = SimStudioClient(api_key="test-api-key")
+    result = WorkflowExecutionResult(success=True)
+    with patch.object(client, "execute_workflow", return_value=result):
+        list(client.execute_many([("wf", None)], max_concurrency=32))
+
+    assert client._transport.session.get_adapter("https://sim.ai")._pool_maxsize == 32
+
+
+def mock_response(status_code, payload):
+    response = Mock()
+    response.status_code = status_code
+    response.ok = 200 <= status_code < 300
+    response.reason = "Mock"
+    response.json.return_value = payload
+    response.content = json.dumps(payload).encode("utf-8")
+    return response
+
+
+@patch('simstudio.time.sleep')
+def test_execute_workflow_sync_submits_and_polls_job(mock_sleep):
+    """Test that execute_workflow_sync queues the run and polls /api/jobs until it finishes."""
+    client = SimStudioClient(api_key="test-api-key")
+    submit = mock_response(202, {
+        "success": True,
+        "taskId": "task-1",
+        "status": "queued",
+        "links": {"status": "/api/jobs/task-1"},
+    })
+    polls = [
+        mock_response(200, {"taskId": "task-1", "status": "queued", "estimatedDuration": 180000}),
+        mock_response(
+            200, {"taskId": "task-1", "status": "processing", "estimatedDuration": 180000}
+        ),
+        mock_response(200, {
+            "taskId": "task-1",
+            "status": "completed",
+            "output": {"success": True, "output": {"answer": 42}, "executionId": "exec-1"},
+            "metadata": {"duration": 1234},
+        }),
+    ]
+
+    with patch.object(client._transport, "request", side_effect=[submit, *polls]) as mock_request:
+        result = client.execute_workflow_sync("wf-1", {"q": 1})
+
+    submit_call = mock_request.call_args_list[0]
+    assert submit_call.args[0] == "POST"
+    assert submit_call.kwargs["headers"] == {"X-Execution-Mode": "async"}
+    mock_request.assert_called_with("GET", "https://sim.ai/api/jobs/task-1", timeout=30.0)
+    assert mock_request.call_count == 4
+    assert result.success is True
+    assert result.output == {"answer": 42}
+    assert result.total_duration == 1234
+    assert result.metadata["executionId"] == "exec-1"
+
+
+@patch('simstudio.time.sleep')
+def test_wait_for_job_maps_failed_and_cancelled(mock_sleep):
+    """Test that failed and cancelled jobs settle into unsuccessful results."""
+    client = SimStudioClient(api_key="test-api-key")
+    failed = mock_response(200, {"taskId": "t", "status": "failed", "error": {"message": "boom"}})
+    cancelled = mock_response(200, {"taskId": "t", "status": "cancelled"})
+
+    with patch.object(client._transport, "request", side_effect=[failed, cancelled]):
+        assert client.wait_for_job(WorkflowJob(task_id="t", workflow_id="wf")).error == "boom"
+        assert client.wait_for_job(WorkflowJob(task_id="t", workflow_id="wf")).success is False
+
+
+def test_wait_for_job_respects_max_wait():
+    """Test that wait_for_job raises TIMEOUT once max_wait has elapsed."""
+    client = SimStudioClient(api_key="test-api-key")
+    job = WorkflowJob(task_id="t", workflow_id="wf", submitted_at=0.0)
+
+    with pytest.raises(SimStudioError) as exc_info:
+        client.wait_for_job(job, max_wait=1.0)
+    assert exc_info.value.code == "TIMEOUT"
+
+
+@patch('simstudio.time.sleep')
+def test_wait_for_job_gives_up_on_unknown_status_by_default(mock_sleep):
+    """Test that a job stuck in an unmapped status is not polled forever."""
+    client = SimStudioClient(api_key="test-api-key")
+    job = WorkflowJob(task_id="t", workflow_id="wf", submitted_at=0.0)
+    unknown = mock_response(200, {"taskId": "t", "status": "unknown"})
+
+    with patch('simstudio.time.monotonic', side_effect=[590.0, 700.0]):
+        with patch.object(client._transport, "request", return_value=unknown):
+            with pytest.raises(SimStudioError) as exc_info:
+                client.wait_for_job(job)
+    assert exc_info.value.code == "TIMEOUT"
+    assert job.status == "unknown"
+
+
+def test_next_poll_delay_adapts_to_elapsed_and_estimate():
+    """Test that poll spacing grows with elapsed time and is capped by the estimate."""
+    assert _next_poll_delay(0.0, None) == 0.5
+    assert _next_poll_delay(8.0, None) == 2.0
+    assert _next_poll_delay(600.0, None) == 10.0
+    assert _next_poll_delay(60.0, 20000) == 2.0
+
+
+def test_execute_workflow_sync_falls_back_when_queue_unavailable():
+    """Test the blocking fallback when the server cannot queue async executions."""
+    client = SimStudioClient(api_key="test-api-key")
+    queue_error = mock_response(500, {
+        "error": "Failed to queue workflow execution",
+        "code": "FAILED_TO_QUEUE_WORKFLOW_EXECUTION",
+    })
+    executed = mock_response(200, {"success": True, "output": "done"})
+
+    with patch.object(client._transport, "request", side_effect=[queue_error, executed]):
+        result = client.execute_workflow_sync("wf-1")
+
+    assert result.output == "done"
+
+
+def test_job_tracker_is_shared_and_closed_with_client():
+    """Test that the client owns a single lazily created job tracker."""
+    client = SimStudioClient(api_key="test-api-key")
+    tracker = client.job_tracker
+    assert client.job_tracker is tracker
+
+    with patch.object(tracker, "close") as mock_close:
+        client.close()
+    mock_close.assert_called_once()
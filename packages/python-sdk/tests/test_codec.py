@@ -0,0 +1,79 @@
+"""
+Tests for JSON codecs and slot-based result types
+"""
+
+import dataclasses
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from simstudio import JSONCodec, SimStudioClient, WorkflowExecutionResult, WorkflowStatus
+from simstudio.codec import MsgspecCodec, OrjsonCodec, default_codec
+
+DOCUMENT = {"text": "héllo", "items": [1, 2.5, None, True], "nested": {"a": {"b": []}}}
+
+
+def available_codecs():
+    codecs = [JSONCodec()]
+    for codec_class in (OrjsonCodec, MsgspecCodec):
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+    return codecs
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+def test_codecs_round_trip_and_reject_invalid_json(codec):
+    """Test that every available codec round-trips JSON and raises ValueError on bad input."""
+    encoded = codec.dumps(DOCUMENT)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == DOCUMENT
+    assert codec.loads(encoded) == DOCUMENT
+    with pytest.raises(ValueError):
+        codec.loads(b'{"unterminated": ')
+
+
+def test_default_codec_prefers_installed_fast_codec():
+    """Test that the default codec is a fast one when available, else the stdlib."""
+    names = [codec.name for codec in available_codecs()]
+    assert default_codec().name == (names[1] if len(names) > 1 else "json")
+
+
+def test_client_encodes_and_decodes_with_its_codec():
+    """Test that a custom codec handles the request and response bodies."""
+    codec = Mock(wraps=JSONCodec())
+    client = SimStudioClient(api_key="test-api-key", codec=codec)
+    response = Mock(ok=True, status_code=200, content=b'{"success": true, "output": 1}')
+
+    with patch.object(client._transport, "request", return_value=response) as mock_request:
+        result = client.execute_workflow("wf-1", {"x": 1})
+
+    assert mock_request.call_args.kwargs["body"] == b'{"x": 1}'
+    codec.loads.assert_called_once_with(response.content)
+    assert result.output == 1
+
+
+def test_result_types_use_slots():
+    """Test that result types have no per-instance __dict__ but remain dataclasses."""
+    result = WorkflowExecutionResult(success=True, output={"a": 1}, logs=[1])
+    status = WorkflowStatus(is_deployed=True, deployed_at="2024-01-01T00:00:00Z")
+
+    for instance in (result, status):
+        assert not hasattr(instance, "__dict__")
+        with pytest.raises(AttributeError):
+            instance.unknown = 1
+
+    assert result == WorkflowExecutionResult(success=True, output={"a": 1}, logs=[1])
+    assert result != WorkflowExecutionResult(success=False)
+    assert repr(status) == (
+        "WorkflowStatus(is_deployed=True, deployed_at='2024-01-01T00:00:00Z', "
+        "is_published=False, needs_redeployment=False)"
+    )
+    assert dataclasses.is_dataclass(result) and dataclasses.is_dataclass(status)
+    assert [f.name for f in dataclasses.fields(result)] == [
+        "success", "output", "error", "logs", "metadata", "trace_spans", "total_duration",
+    ]
+    assert dataclasses.asdict(result)["logs"] == [1]
+    assert dataclasses.replace(status, is_published=True).is_published is True
@@ -0,0 +1,104 @@
+"""
+Tests for streamed execute response decoding
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from simstudio import SimStudioClient, SimStudioError
+from simstudio.decoding import LAZY_FIELDS, ObjectFieldScanner, decode_execution_result
+
+BODY = {
+    "success": True,
+    "output": {"text": "a \"quoted\" \\ value, with {braces} and [brackets]", "n": [1, 2.5, None]},
+    "logs": [{"blockId": "b1", "output": {"nested": [{"deep": "}"}]}}],
+    "metadata": {"duration": 12},
+    "traceSpans": [{"id": "span-1", "children": []}],
+    "totalDuration": 12,
+    "unknownKey": {"ignored": True},
+}
+
+
+def split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10000])
+def test_scanner_splits_fields_across_chunk_boundaries(size):
+    """Test that every top-level value is recovered whatever the chunking."""
+    data = json.dumps(BODY, indent=1).encode("utf-8")
+    scanner = ObjectFieldScanner(lambda key: True)
+    fields = {}
+    for chunk in split(data, size):
+        for key, value in scanner.feed(chunk):
+            fields[key] = json.loads(value)
+    scanner.finish()
+
+    assert fields == BODY
+
+
+def test_scanner_skips_unwanted_values_and_rejects_truncation():
+    """Test that only kept keys are returned and an incomplete body is an error."""
+    data = json.dumps(BODY).encode("utf-8")
+    scanner = ObjectFieldScanner(lambda key: key == "success")
+    assert scanner.feed(data) == [("success", b"true")]
+
+    truncated = ObjectFieldScanner(lambda key: True)
+    truncated.feed(data[:-10])
+    with pytest.raises(ValueError):
+        truncated.finish()
+
+
+def test_decode_selected_fields_and_lazy_fields():
+    """Test field selection and lazy decoding of logs/trace spans."""
+    data = json.dumps(BODY).encode("utf-8")
+
+    lean = decode_execution_result(split(data, 5), fields={"output"})
+    assert lean.success is True
+    assert lean.output == BODY["output"]
+    assert lean.logs is None and lean.trace_spans is None and lean.metadata is None
+
+    lazy = decode_execution_result(split(data, 5), lazy=LAZY_FIELDS)
+    assert lazy._raw is not None and set(lazy._raw) == {"logs", "trace_spans"}
+    assert lazy.trace_spans == BODY["traceSpans"]
+    assert lazy.logs == BODY["logs"]
+    assert lazy._raw == {}
+    assert lazy == decode_execution_result([data])
+
+
+def streamed_response(payload):
+    response = Mock()
+    response.ok = True
+    response.iter_content.return_value = split(json.dumps(payload).encode("utf-8"), 16)
+    return response
+
+
+def test_client_fields_stream_the_response():
+    """Test that per-call fields stream the body and override the client default."""
+    client = SimStudioClient(api_key="test-api-key", lazy_decoding=True)
+    response = streamed_response(BODY)
+    with patch.object(client._transport, "request", return_value=response) as mock_request:
+        result = client.execute_workflow("wf-1", fields=["success", "output"])
+
+    assert mock_request.call_args.kwargs["stream"] is True
+    assert result.output == BODY["output"]
+    assert result.logs is None
+
+    with pytest.raises(ValueError):
+        client.execute_workflow("wf-1", fields=["outputs"])
+
+
+def test_client_reports_malformed_streamed_body():
+    """Test that an incomplete streamed body raises an EXECUTION_ERROR."""
+    client = SimStudioClient(api_key="test-api-key", fields={"output"})
+    response = Mock()
+    response.ok = True
+    response.iter_content.return_value = [b'{"success": true, "output": {']
+    with patch.object(client._transport, "request", return_value=response):
+        with pytest.raises(SimStudioError) as exc_info:
+            client.execute_workflow("wf-1")
+
+    assert exc_info.value.code == "EXECUTION_ERROR"
+    response.close.assert_called_once()
@@ -0,0 +1,142 @@
+"""
+Tests for hedged requests
+"""
+
+import threading
+import time
+
+from simstudio import HedgePolicy, SimStudioClient
+from simstudio.testing import MemoryTransport, MockSimServer
+
+
+def warm_up(policy, route, count, latency=0.002):
+    for _ in range(count):
+        policy.call(route, lambda: time.sleep(latency))
+
+
+def test_slow_call_is_hedged_and_first_answer_wins():
+    """Test that a call slower than the percentile gets a hedge whose answer is returned."""
+    policy = HedgePolicy(min_samples=10, max_hedge_ratio=1.0)
+    warm_up(policy, "status", 10)
+    calls = []
+    lock = threading.Lock()
+
+    def stalls_first():
+        with lock:
+            calls.append(None)
+            first = len(calls) == 1
+        time.sleep(1.0 if first else 0.002)
+        return "first" if first else "hedge"
+
+    started = time.monotonic()
+    assert policy.call("status", stalls_first) == "hedge"
+    assert time.monotonic() - started < 0.5
+    assert (policy.hedged, policy.hedge_wins) == (1, 1)
+    assert policy.delay("other-route") is None
+    policy.close()
+
+
+def test_calls_that_cannot_be_hedged_run_on_the_calling_thread():
+    """Test that warming up and an empty budget skip the hedge thread pool."""
+    policy = HedgePolicy(min_samples=3, max_hedge_ratio=0.1)
+    threads = set()
+
+    def record():
+        threads.add(threading.current_thread())
+
+    for _ in range(5):
+        policy.call("logs", record)
+
+    assert threads == {threading.current_thread()}
+    assert policy._executor is None
+    policy.close()
+
+
+def test_concurrency_beyond_max_workers_neither_queues_nor_hedges():
+    """Test that calls exceeding the pool run inline instead of waiting and being hedged."""
+    policy = HedgePolicy(min_samples=5, max_hedge_ratio=1.0, max_workers=4)
+    warm_up(policy, "status", 5, latency=0.1)
+    barrier = threading.Barrier(12)
+
+    def call():
+        barrier.wait()
+        policy.call("status", lambda: time.sleep(0.05))
+
+    threads = [threading.Thread(target=call) for _ in range(12)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - started < 0.14
+    assert policy.hedged == 0 and policy._busy == 0
+    policy.close()
+
+
+def test_hedge_budget_caps_extra_load_when_everything_is_slow():
+    """Test that max_hedge_ratio bounds hedges during an outage."""
+    policy = HedgePolicy(min_samples=5, max_hedge_ratio=0.1, max_burst=1.0)
+    warm_up(policy, "job", 200, latency=0.0005)
+
+    # Too few to move the 95th percentile, so every one of them is a hedging candidate.
+    for _ in range(10):
+        policy.call("job", lambda: time.sleep(0.02))
+
+    assert policy.requests == 210
+    assert 1 <= policy.hedged <= 2
+    policy.close()
+
+
+def test_hedge_prefers_success_over_a_failed_copy():
+    """Test that an error from the first copy to finish yields to the other copy's answer."""
+    policy = HedgePolicy(min_samples=3, max_hedge_ratio=1.0)
+    warm_up(policy, "job", 3)
+    calls = []
+    lock = threading.Lock()
+
+    def primary_slow_then_hedge_fails():
+        with lock:
+            calls.append(None)
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.1)
+            return "primary"
+        raise ConnectionError("replica down")
+
+    assert policy.call("job", primary_slow_then_hedge_fails) == "primary"
+    assert policy.hedged == 1 and policy.hedge_wins == 0
+    policy.close()
+
+
+def test_client_hedges_status_and_job_polls():
+    """Test that the client routes idempotent GETs through its HedgePolicy."""
+    server = MockSimServer()
+    slow = {"remaining": 0}
+    lock = threading.Lock()
+
+    def handler(method, path, headers, body):
+        with lock:
+            stall = slow["remaining"] > 0
+            slow["remaining"] -= 1
+        if stall:
+            time.sleep(1.0)
+        return server.handle(method, path, headers, body)
+
+    transport = MemoryTransport(handler)
+    policy = HedgePolicy(min_samples=5, max_hedge_ratio=1.0)
+    with SimStudioClient(api_key="test-api-key", transport=transport, hedging=policy) as client:
+        for _ in range(5):
+            assert client.get_workflow_status("wf-1").is_deployed is True
+        slow["remaining"] = 1
+        started = time.monotonic()
+        assert client.get_workflow_status("wf-1").is_deployed is True
+        elapsed = time.monotonic() - started
+
+        job = client.submit_workflow("wf-1", {"n": 1})
+        assert client.get_job_status(job.task_id).status == "completed"
+
+    assert elapsed < 0.5
+    assert policy.hedge_wins == 1
+    assert policy.requests == 7
+    policy.close()
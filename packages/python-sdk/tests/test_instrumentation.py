@@ -0,0 +1,118 @@
+"""
+Tests for request hooks, phase timings, latency histograms and trace export
+"""
+
+import pytest
+
+from simstudio import ClientHooks, LatencyHistograms, SimStudioClient, SimStudioError
+from simstudio.instrumentation import LatencyHistogram
+from simstudio.testing import MockSimServer
+
+
+class RecordingHooks(ClientHooks):
+    def __init__(self):
+        self.events = []
+
+    def on_request_start(self, info):
+        self.events.append(("start", info.workflow_id))
+
+    def on_response(self, info, status_code, timings, result):
+        self.events.append(("response", status_code, timings, result))
+
+    def on_error(self, info, error, timings, status_code=None):
+        self.events.append(("error", status_code, timings, error))
+
+
+class FailingHooks(ClientHooks):
+    def on_request_start(self, info):
+        raise RuntimeError("hook failure")
+
+
+def test_hooks_receive_phase_timings():
+    """Test that hooks see every phase, with connect time only on a new connection."""
+    hooks = RecordingHooks()
+    with MockSimServer(latency=0.02) as server, \
+            SimStudioClient(api_key="test-api-key", base_url=server.url,
+                            hooks=[FailingHooks(), hooks]) as client:
+        client.execute_workflow("wf-1")
+        client.execute_workflow("wf-1")
+
+    assert [event[0] for event in hooks.events] == ["start", "response", "start", "response"]
+    first, second = hooks.events[1][2], hooks.events[3][2]
+    assert hooks.events[1][1] == 200
+    assert first.connect > 0 and second.connect == 0
+    for timings in (first, second):
+        assert timings.server >= 0.02
+        assert timings.server_reported is not None and timings.server_reported >= 0.02
+        assert timings.download >= 0 and timings.decode > 0
+        assert timings.total >= timings.connect + timings.upload + timings.server
+
+
+def test_hooks_receive_errors_and_histograms_record_them():
+    """Test that failed requests reach on_error and land in the histogram by status."""
+    hooks = RecordingHooks()
+    histograms = LatencyHistograms()
+    with MockSimServer(rate_limit=1) as server, \
+            SimStudioClient(api_key="test-api-key", base_url=server.url,
+                            hooks=[hooks, histograms]) as client:
+        client.execute_workflow("wf-1")
+        with pytest.raises(SimStudioError):
+            client.execute_workflow("wf-1")
+
+    assert hooks.events[-1][0] == "error"
+    assert hooks.events[-1][1] == 429
+    series = {(row["workflow_id"], row["status"]): row["count"] for row in histograms.snapshot()}
+    assert series == {("wf-1", 200): 1, ("wf-1", 429): 1}
+    exposition = histograms.to_prometheus()
+    count = 'simstudio_request_duration_seconds_count{workflow_id="wf-1",status="429"} 1'
+    assert count in exposition
+
+
+def test_latency_histogram_percentiles_are_within_bucket_error():
+    """Test that log buckets keep percentiles within the growth factor."""
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000.0)
+
+    for q, exact in ((50, 0.5), (95, 0.95), (99, 0.99)):
+        assert exact <= histogram.percentile(q) <= exact * histogram.growth
+    assert histogram.count == 1000
+
+
+def test_tracing_hooks_nest_server_spans_under_client_span():
+    """Test that server trace spans are exported as children of the request span."""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    from simstudio import TracingHooks, WorkflowExecutionResult
+    from simstudio.instrumentation import RequestInfo, RequestTimings
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    hooks = TracingHooks(provider.get_tracer("test"))
+
+    info = RequestInfo("wf-1", "POST", "https://sim.ai/api/workflows/wf-1/execute")
+    hooks.on_request_start(info)
+    hooks.on_response(info, 200, RequestTimings(total=0.5), WorkflowExecutionResult(
+        success=True,
+        trace_spans=[{
+            "name": "Agent 1", "type": "agent", "blockId": "block-1", "duration": 300,
+            "startTime": "2024-01-01T00:00:00.000Z", "endTime": "2024-01-01T00:00:00.300Z",
+            "children": [{
+                "name": "openai", "type": "model", "duration": 250,
+                "startTime": "2024-01-01T00:00:00.010Z", "endTime": "2024-01-01T00:00:00.260Z",
+            }],
+        }],
+    ))
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    client_span = spans["simstudio.execute_workflow"]
+    block, model = spans["Agent 1"], spans["openai"]
+    assert block.parent.span_id == client_span.context.span_id
+    assert model.parent.span_id == block.context.span_id
+    assert block.end_time - block.start_time == 300_000_000
+    assert block.attributes["simstudio.block_id"] == "block-1"
+    assert client_span.attributes["http.response.status_code"] == 200
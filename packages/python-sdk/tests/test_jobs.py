@@ -0,0 +1,110 @@
+"""
+Tests for the multiplexed job tracker
+"""
+
+import threading
+from concurrent.futures import CancelledError
+from unittest.mock import patch
+
+import pytest
+
+from simstudio import JobStatus, SimStudioError, WorkflowJob
+from simstudio.jobs import JobTracker
+
+
+class FakeJobsClient:
+    """Minimal client that reports scripted statuses per task and counts polls."""
+
+    def __init__(self, statuses):
+        self.statuses = {task_id: list(seq) for task_id, seq in statuses.items()}
+        self.polls = 0
+        self.lock = threading.Lock()
+
+    def get_job_status(self, task_id, timeout=30.0):
+        with self.lock:
+            self.polls += 1
+            sequence = self.statuses[task_id]
+            status = sequence.pop(0) if len(sequence) > 1 else sequence[0]
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+
+@pytest.fixture(autouse=True)
+def fast_polls():
+    with patch("simstudio.jobs._next_poll_delay", return_value=0.001):
+        yield
+
+
+def test_tracker_settles_many_jobs():
+    """Test that every tracked job resolves into its result."""
+    statuses = {}
+    for i in range(50):
+        statuses[f"task-{i}"] = [
+            JobStatus(task_id=f"task-{i}", status="processing"),
+            JobStatus(
+                task_id=f"task-{i}", status="completed", output={"success": True, "output": i}
+            ),
+        ]
+    client = FakeJobsClient(statuses)
+    tracker = JobTracker(client, max_polls_per_second=10000, max_concurrent_polls=4)
+
+    futures = [tracker.track(WorkflowJob(task_id=f"task-{i}", workflow_id="wf")) for i in range(50)]
+    outputs = [future.result(timeout=5).output for future in futures]
+
+    assert outputs == list(range(50))
+    assert client.polls == 100
+    assert tracker.pending == 0
+    tracker.close()
+
+
+def test_tracker_maps_failed_and_fatal_errors():
+    """Test that failed jobs resolve as unsuccessful results and 404s fail the future."""
+    client = FakeJobsClient({
+        "failed": [JobStatus(task_id="failed", status="failed", error={"message": "boom"})],
+        "missing": [SimStudioError("Task not found", "TASK_NOT_FOUND", 404)],
+    })
+    tracker = JobTracker(client, max_polls_per_second=10000)
+
+    failed = tracker.track(WorkflowJob(task_id="failed", workflow_id="wf"))
+    missing = tracker.track(WorkflowJob(task_id="missing", workflow_id="wf"))
+
+    assert failed.result(timeout=5).error == "boom"
+    with pytest.raises(SimStudioError) as exc_info:
+        missing.result(timeout=5)
+    assert exc_info.value.status == 404
+    tracker.close()
+
+
+def test_tracker_times_out_and_cancels_on_close():
+    """Test max_wait deadlines and that close cancels outstanding jobs."""
+    client = FakeJobsClient({"slow": [JobStatus(task_id="slow", status="processing")]})
+    tracker = JobTracker(client, max_polls_per_second=10000)
+
+    timed_out = tracker.track(WorkflowJob(task_id="slow", workflow_id="wf"), max_wait=0.05)
+    with pytest.raises(SimStudioError) as exc_info:
+        timed_out.result(timeout=5)
+    assert exc_info.value.code == "TIMEOUT"
+
+    outstanding = tracker.track(WorkflowJob(task_id="slow", workflow_id="wf"))
+    tracker.close()
+    with pytest.raises(CancelledError):
+        outstanding.result(timeout=5)
+
+
+def test_tracker_respects_global_poll_budget():
+    """Test that polls are paced to max_polls_per_second across all jobs."""
+    import time
+
+    client = FakeJobsClient({
+        f"t{i}": [JobStatus(task_id=f"t{i}", status="completed", output=None)] for i in range(5)
+    })
+    tracker = JobTracker(client, max_polls_per_second=50)
+
+    started = time.monotonic()
+    futures = [tracker.track(WorkflowJob(task_id=f"t{i}", workflow_id="wf")) for i in range(5)]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert time.monotonic() - started >= 4 / 50
+    tracker.close()
@@ -0,0 +1,86 @@
+"""
+Tests for execution log iteration and Parquet export
+"""
+
+import time
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from simstudio import SimStudioClient, SimStudioError
+from simstudio.testing import MemoryTransport, MockSimServer
+
+
+def test_iter_logs_prefetches_pages_in_order():
+    """Test that pages are fetched concurrently but yielded newest first, without gaps."""
+    with MockSimServer(latency=0.05, log_count=1000) as server, \
+            SimStudioClient(api_key="test-api-key", base_url=server.url) as client:
+        started = time.monotonic()
+        ids = [log["id"] for log in client.iter_logs("ws-1", page_size=50, prefetch=8)]
+        elapsed = time.monotonic() - started
+        stats = server.stats()
+
+    assert ids == [f"log-{i}" for i in range(1000)]
+    assert stats["logs"] == 20
+    # Twenty pages one after another would take at least a second.
+    assert elapsed < 0.6
+
+
+def test_iter_logs_sends_filters_and_pins_end_date():
+    """Test the query parameters of every page request."""
+    transport = MemoryTransport(MockSimServer(log_count=30).handle)
+    client = SimStudioClient(api_key="test-api-key", transport=transport)
+
+    logs = list(client.iter_logs(
+        "ws-1", workflow_ids=["wf-0", "wf-1"], level="info",
+        start_date=datetime(2024, 5, 1, 12, 30), details="full", page_size=4, prefetch=2,
+    ))
+    queries = [parse_qs(urlsplit(url).query) for _, url, _, _ in transport.requests]
+
+    expected = [i for i in range(30) if i % 3 != 2 and i % 10 != 9]
+    assert [log["id"] for log in logs] == [f"log-{i}" for i in expected]
+    assert logs[0]["executionId"] == "execution-0"
+    assert len(queries) == -(-len(expected) // 4)
+    assert [q["offset"] for q in queries] == [[str(o)] for o in range(0, len(expected), 4)]
+    assert len({q["endDate"][0] for q in queries}) == 1
+    assert queries[0]["workspaceId"] == ["ws-1"]
+    assert queries[0]["workflowIds"] == ["wf-0,wf-1"]
+    assert queries[0]["startDate"] == ["2024-05-01T12:30:00.000Z"]
+    assert queries[0]["details"] == ["full"]
+    assert queries[0]["limit"] == ["4"]
+
+
+def test_iter_logs_raises_api_errors():
+    """Test that a failing page surfaces as SimStudioError."""
+    def unauthorized(method, path, headers, body):
+        return 401, {"error": "Unauthorized"}
+
+    client = SimStudioClient(api_key="test-api-key", transport=MemoryTransport(unauthorized))
+    with pytest.raises(SimStudioError) as exc_info:
+        next(client.iter_logs("ws-1"))
+    assert exc_info.value.status == 401
+
+    with pytest.raises(ValueError):
+        next(client.iter_logs("ws-1", details="everything"))
+
+
+def test_export_logs_writes_parquet_row_groups(tmp_path):
+    """Test that logs stream into a Parquet file in batches with typed columns."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    transport = MemoryTransport(MockSimServer(log_count=250).handle)
+    client = SimStudioClient(api_key="test-api-key", transport=transport)
+    path = tmp_path / "logs.parquet"
+
+    written = client.export_logs(str(path), "ws-1", batch_rows=100, details="full", page_size=30)
+
+    parquet = pq.ParquetFile(str(path))
+    table = parquet.read()
+    assert written == table.num_rows == 250
+    assert parquet.metadata.num_row_groups == 3
+    row = table.slice(9, 1).to_pylist()[0]
+    assert row["id"] == "log-9" and row["level"] == "error" and row["trigger"] == "manual"
+    assert row["duration_ms"] == 109 and row["tokens_total"] == 20
+    assert row["workflow_name"] == "Workflow 0" and row["execution_id"] == "execution-9"
+    assert row["created_at"].tzinfo is not None
+    assert row["execution_data"] == '{"totalDuration":109,"traceSpans":[]}'
@@ -0,0 +1,118 @@
+"""
+Tests for the durable submission outbox
+"""
+
+import json
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from simstudio import Outbox, SimStudioClient
+from simstudio.testing import MemoryTransport, MockSimServer
+from simstudio.transport import TransportError, TransportTimeout
+
+
+@pytest.fixture(autouse=True)
+def fast_polls():
+    with patch("simstudio.jobs._next_poll_delay", return_value=0.001):
+        yield
+
+
+def new_client(handler):
+    return SimStudioClient(api_key="test-api-key", transport=MemoryTransport(handler))
+
+
+def test_outbox_drains_in_order_and_waits_out_rate_limits(tmp_path):
+    """Test that every entry is queued once, in order, and its result is recorded."""
+    server = MockSimServer(rate_limit=5, rate_limit_window=0.3)
+    client = new_client(server.handle)
+    with Outbox(client, str(tmp_path / "outbox.db"), rate=200, batch_size=4) as outbox:
+        ids = [outbox.submit_workflow("wf-1", {"n": n}) for n in range(12)]
+        assert outbox.wait(timeout=10) is True
+        entries = outbox.entries()
+        assert outbox.stats() == {"completed": 12}
+    client.close()
+
+    assert [entry.id for entry in entries] == ids
+    assert [entry.result.output["input"]["n"] for entry in entries] == list(range(12))
+    assert len({entry.task_id for entry in entries}) == 12
+    assert sum(entry.attempts for entry in entries) == 12 + server.stats()["rate_limited"]
+    assert server.stats()["submit"] == 12 and server.stats()["rate_limited"] >= 1
+    sent = [json.loads(body)["n"] for _, url, _, body in client._transport.requests
+            if url.endswith("/execute")]
+    assert sorted(sent[:4]) == [0, 1, 2, 3]
+
+
+def test_reopened_outbox_resumes_without_duplicates(tmp_path):
+    """Test a restart mid-drain, including an entry interrupted while being sent."""
+    server = MockSimServer(job_duration=0.3)
+    path = str(tmp_path / "outbox.db")
+    first_client = new_client(server.handle)
+    outbox = Outbox(first_client, path, rate=10)
+    for n in range(6):
+        outbox.submit_workflow("wf-1", {"n": n})
+    time.sleep(0.15)
+    outbox.close()
+    first_client.close()
+
+    db = sqlite3.connect(path)
+    states = [state for state, in db.execute("SELECT state FROM outbox ORDER BY id")]
+    assert states[:2] == ["queued", "queued"] and "pending" in states
+    interrupted = states.index("pending") + 1
+    db.execute("UPDATE outbox SET state = 'sending' WHERE id = ?", (interrupted,))
+    db.commit()
+    db.close()
+
+    client = new_client(server.handle)
+    with Outbox(client, path, rate=100) as outbox:
+        assert outbox.wait(timeout=10) is True
+        unknown = outbox.get(interrupted)
+        assert unknown.state == "unknown" and "may or may not" in unknown.error
+        assert outbox.stats() == {"completed": 5, "unknown": 1}
+        assert server.stats()["submit"] == 5
+
+        assert outbox.requeue_unknown() == 1
+        assert outbox.wait(timeout=10) is True
+        assert outbox.get(interrupted).result.output["input"] == {"n": interrupted - 1}
+        assert outbox.purge() == 6 and outbox.entries() == []
+    client.close()
+    assert server.stats()["submit"] == 6
+
+
+def test_send_errors_are_retried_failed_or_left_unknown(tmp_path):
+    """Test that only answers proving the execution was not queued are resent."""
+    server = MockSimServer()
+    answers = {
+        "flaky": [503], "refused": ["refused"], "lost": ["timeout"], "gateway": [502],
+        "missing": [404],
+    }
+
+    def handler(method, path, headers, body):
+        for workflow_id, pending in answers.items():
+            if f"/workflows/{workflow_id}/" in path and pending:
+                answer = pending.pop(0)
+                if answer == "refused":
+                    raise TransportError("Connection refused", connect=True)
+                if answer == "timeout":
+                    raise TransportTimeout("Read timed out")
+                return answer, {"error": "Workflow not found" if answer == 404 else "Unavailable"}
+        return server.handle(method, path, headers, body)
+
+    client = new_client(handler)
+    with patch("simstudio.outbox.random.uniform", return_value=0.01):
+        with Outbox(client, str(tmp_path / "outbox.db"), rate=100) as outbox:
+            ids = {name: outbox.submit_workflow(name) for name in answers}
+            assert outbox.wait(timeout=10) is True
+            entries = {name: outbox.get(entry_id) for name, entry_id in ids.items()}
+    client.close()
+
+    assert {name: entry.state for name, entry in entries.items()} == {
+        "flaky": "completed", "refused": "completed", "lost": "unknown", "gateway": "unknown",
+        "missing": "failed",
+    }
+    assert entries["flaky"].attempts == 2 and entries["refused"].attempts == 2
+    assert entries["lost"].attempts == 1 and "timed out" in entries["lost"].error
+    assert entries["gateway"].attempts == 1
+    assert entries["missing"].result is None and "not found" in entries["missing"].error
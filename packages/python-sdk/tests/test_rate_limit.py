@@ -0,0 +1,140 @@
+"""
+Tests for client-side rate limiting
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+
+from simstudio import RateLimiter, RateLimitError, SimStudioClient, _error_from_response
+
+
+def test_429_error_parses_async_body_fields():
+    """Test remaining/resetAt parsing from the async execution 429 body."""
+    error = _error_from_response(429, "Too Many Requests", {
+        "error": "Rate limit exceeded",
+        "remaining": 0,
+        "resetAt": "2030-01-01T00:01:00.000Z",
+    })
+    assert isinstance(error, RateLimitError)
+    assert error.code == "RATE_LIMIT_EXCEEDED"
+    assert error.status == 429
+    assert error.remaining == 0
+    assert error.reset_at == datetime(2030, 1, 1, 0, 1, tzinfo=timezone.utc)
+
+
+def test_429_error_parses_sync_error_message():
+    """Test remaining/resetAt parsing from the sync execution error message."""
+    error = _error_from_response(429, "Too Many Requests", {
+        "error": (
+            "Rate limit exceeded. You have 3 requests remaining. "
+            "Resets at 2030-01-01T00:01:00.000Z"
+        ),
+        "code": "RATE_LIMIT_EXCEEDED",
+    })
+    assert error.remaining == 3
+    assert error.reset_at == datetime(2030, 1, 1, 0, 1, tzinfo=timezone.utc)
+
+
+def test_limiter_waits_for_reset_and_retries():
+    """Test that a 429 pauses until resetAt, halves concurrency and retries the call."""
+    limiter = RateLimiter(max_concurrency=8)
+    reset_at = datetime.now(timezone.utc) + timedelta(seconds=0.2)
+    limited = RateLimitError("Rate limit exceeded", remaining=0, reset_at=reset_at)
+    calls = Mock(side_effect=[limited, "ok"])
+
+    started = time.monotonic()
+    assert limiter.call(calls) == "ok"
+
+    assert calls.call_count == 2
+    assert time.monotonic() - started >= 0.15
+    assert limiter.concurrency_limit == 4
+
+
+def test_limiter_halves_once_for_concurrent_429s():
+    """Test that a burst of 429s for calls sent together halves the limit only once."""
+    limiter = RateLimiter(max_concurrency=16)
+    reset_at = datetime.now(timezone.utc) + timedelta(seconds=0.1)
+    barrier = threading.Barrier(8)
+    attempts = threading.local()
+
+    def work():
+        attempts.count = getattr(attempts, "count", 0) + 1
+        if attempts.count == 1:
+            barrier.wait()
+            raise RateLimitError("Rate limit exceeded", remaining=0, reset_at=reset_at)
+        return "ok"
+
+    threads = [threading.Thread(target=limiter.call, args=(work,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert limiter.concurrency_limit == 8
+
+
+def test_limiter_raises_when_reset_is_beyond_max_wait():
+    """Test that callers are not queued past max_wait."""
+    limiter = RateLimiter(max_wait=0.5)
+    reset_at = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    with pytest.raises(RateLimitError):
+        limited = RateLimitError("Rate limit exceeded", remaining=0, reset_at=reset_at)
+        limiter.call(Mock(side_effect=limited))
+
+
+def test_limiter_bounds_concurrency():
+    """Test that callers beyond the concurrency limit queue instead of running."""
+    limiter = RateLimiter(max_concurrency=2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+
+    threads = [threading.Thread(target=limiter.call, args=(work,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+
+
+def test_limiter_paces_to_requests_per_minute():
+    """Test the token bucket refill rate."""
+    limiter = RateLimiter(requests_per_minute=600, burst=1)
+
+    started = time.monotonic()
+    for _ in range(4):
+        limiter.call(lambda: None)
+
+    assert time.monotonic() - started >= 0.25
+
+
+def test_client_rate_limit_shares_limiter_and_retries():
+    """Test that rate_limit=True shares one limiter per API key and hides 429s."""
+    client = SimStudioClient(api_key="shared-key", rate_limit=True)
+    other = SimStudioClient(api_key="shared-key", rate_limit=True)
+    assert client._rate_limiter is other._rate_limiter is RateLimiter.shared("shared-key")
+
+    limited = Mock(status_code=429, ok=False, reason="Too Many Requests")
+    limited.json.return_value = {"error": "Rate limit exceeded", "remaining": 0, "resetAt": None}
+    succeeded = Mock(status_code=200, ok=True, content=b'{"success": true, "output": "done"}')
+
+    with patch.object(client._transport, "request", side_effect=[limited, succeeded]), \
+            patch("simstudio.rate_limit.RateLimiter._on_rate_limited", autospec=True,
+                  side_effect=lambda self, error, deadline, sent_at: None):
+        result = client.execute_workflow("wf-1")
+
+    assert result.output == "done"
@@ -0,0 +1,120 @@
+"""
+Tests for retries and the circuit breaker
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from simstudio import CircuitBreaker, RetryPolicy, SimStudioClient, SimStudioError
+from simstudio.testing import MemoryTransport, MockSimServer
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay=0.001)
+
+
+def scripted(*statuses):
+    """A MemoryTransport handler answering executions with ``statuses``, then 200."""
+    remaining = list(statuses)
+
+    def handler(method, path, headers, body):
+        status = remaining.pop(0) if remaining else 200
+        if status == 200:
+            return 200, {"success": True, "output": {"path": path}}
+        if status == 429:
+            reset_at = datetime.now(timezone.utc) + timedelta(seconds=0.2)
+            return 429, {"error": "Rate limit exceeded", "remaining": 0,
+                         "resetAt": reset_at.isoformat().replace("+00:00", "Z")}
+        return status, {"error": f"HTTP {status}"}
+    return handler
+
+
+def test_retries_gateway_errors_but_not_server_errors():
+    """Test that 502/503 are retried up to max_attempts while 500 and 400 are not."""
+    transport = MemoryTransport(scripted(503, 502))
+    client = SimStudioClient(api_key="test-api-key", transport=transport, retry=FAST_RETRY)
+    assert client.execute_workflow("wf-1").success is True
+    assert len(transport.requests) == 3
+
+    for statuses, attempts in (((503, 503, 503), 3), ((500,), 1), ((400,), 1)):
+        transport = MemoryTransport(scripted(*statuses))
+        client = SimStudioClient(api_key="test-api-key", transport=transport, retry=FAST_RETRY)
+        with pytest.raises(SimStudioError) as exc_info:
+            client.execute_workflow("wf-1")
+        assert exc_info.value.status == statuses[0]
+        assert len(transport.requests) == attempts
+
+
+def test_retries_rate_limit_after_reset_within_deadline():
+    """Test that a 429 is retried after resetAt, unless the reset is past the deadline."""
+    transport = MemoryTransport(scripted(429))
+    client = SimStudioClient(api_key="test-api-key", transport=transport, retry=FAST_RETRY)
+    started = time.monotonic()
+    assert client.execute_workflow("wf-1", timeout=5.0).success is True
+    assert time.monotonic() - started >= 0.15
+    assert len(transport.requests) == 2
+
+    transport = MemoryTransport(scripted(429))
+    client = SimStudioClient(api_key="test-api-key", transport=transport, retry=FAST_RETRY)
+    with pytest.raises(SimStudioError) as exc_info:
+        client.execute_workflow("wf-1", timeout=0.1)
+    assert exc_info.value.status == 429
+    assert len(transport.requests) == 1
+
+
+def test_retries_connect_failures_but_not_timeouts():
+    """Test that refused connections are retried and a request that timed out is not."""
+    with MockSimServer(latency=0.3) as server, \
+            SimStudioClient(api_key="test-api-key", base_url=server.url, transport="http",
+                            retry=FAST_RETRY) as client:
+        with pytest.raises(SimStudioError) as timeout:
+            client.execute_workflow("wf-1", timeout=0.1)
+        url = server.url
+        time.sleep(0.3)
+        assert server.stats()["execute"] == 1
+
+    with SimStudioClient(api_key="test-api-key", base_url=url, transport="http",
+                         retry=FAST_RETRY) as client:
+        with pytest.raises(SimStudioError) as refused:
+            client.execute_workflow("wf-1", timeout=2.0)
+        attempts = client.pool_stats().created
+
+    assert timeout.value.code == "TIMEOUT"
+    assert refused.value.code == "EXECUTION_ERROR"
+    assert attempts == 3
+
+
+def test_circuit_breaker_fails_fast_per_workflow_and_recovers():
+    """Test that a failing workflow's circuit opens, spares others, and closes after a trial."""
+    failing = {"wf-bad"}
+
+    def handler(method, path, headers, body):
+        if any(workflow_id in path for workflow_id in failing):
+            return 500, {"error": "Workflow failed"}
+        return 200, {"success": True}
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+    transport = MemoryTransport(handler)
+    client = SimStudioClient(api_key="test-api-key", transport=transport, circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(SimStudioError):
+            client.execute_workflow("wf-bad")
+    with pytest.raises(SimStudioError) as exc_info:
+        client.execute_workflow("wf-bad")
+    assert exc_info.value.code == "CIRCUIT_OPEN"
+    assert len(transport.requests) == 2
+    assert breaker.state("wf-bad") == "open"
+    assert client.execute_workflow("wf-good").success is True
+
+    time.sleep(0.25)
+    assert breaker.state("wf-bad") == "half_open"
+    with pytest.raises(SimStudioError) as exc_info:
+        client.execute_workflow("wf-bad")
+    assert exc_info.value.status == 500
+    assert breaker.state("wf-bad") == "open"
+
+    time.sleep(0.25)
+    failing.clear()
+    assert client.execute_workflow("wf-bad").success is True
+    assert breaker.state("wf-bad") == "closed"
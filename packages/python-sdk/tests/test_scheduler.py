@@ -0,0 +1,144 @@
+"""
+Tests for the priority and fair-queuing execution scheduler
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from simstudio import (
+    ExecutionScheduler,
+    PriorityClass,
+    RateLimitError,
+    SimStudioError,
+    WorkflowExecutionResult,
+)
+
+
+class FakeClient:
+    """Records executions in start order; ``gate`` holds the ``"blocker"`` workflow."""
+
+    _rate_limiter = None
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = []
+        self.failures = {}
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def execute_workflow(self, workflow_id, input_data=None, timeout=30.0, fields=None):
+        with self.lock:
+            self.started.append((workflow_id, (input_data or {}).get("key")))
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            failure = self.failures.pop(workflow_id, None)
+        try:
+            if workflow_id == "blocker":
+                self.gate.wait(5)
+            if failure is not None:
+                raise failure
+            return WorkflowExecutionResult(success=True, output=input_data)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    def wait_for_blocker(self):
+        deadline = time.monotonic() + 5
+        while not self.started and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+
+def test_classes_share_slots_by_weight_without_starving():
+    """Test that a heavier class gets most slots while the other still progresses."""
+    client = FakeClient()
+    classes = [PriorityClass("interactive", weight=3), PriorityClass("bulk", weight=1)]
+    with ExecutionScheduler(client, classes, max_concurrency=1) as scheduler:
+        blocker = scheduler.submit("bulk", "blocker")
+        client.wait_for_blocker()
+        futures = [scheduler.submit("bulk", "backfill") for _ in range(8)]
+        futures += [scheduler.submit("interactive", "chat") for _ in range(8)]
+        client.gate.set()
+        assert all(future.result(5).success for future in [blocker] + futures)
+        stats = scheduler.stats()
+
+    order = [workflow_id for workflow_id, _ in client.started[1:]]
+    assert order[:8].count("chat") >= 6 and "backfill" in order[:8]
+    assert stats["interactive"].completed == 8 and stats["bulk"].completed == 9
+    assert stats["bulk"].wait_p99 >= stats["interactive"].wait_p50
+    assert stats["interactive"].queued == stats["interactive"].running == 0
+
+
+def test_keys_take_weighted_turns_under_a_class_cap():
+    """Test fair queuing across tenants and the per-class concurrency cap."""
+    client = FakeClient()
+    classes = [PriorityClass("bulk", max_concurrency=1, key_weights={"big": 2.0})]
+    with ExecutionScheduler(client, classes, max_concurrency=4) as scheduler:
+        futures = [scheduler.submit("bulk", "blocker")]
+        client.wait_for_blocker()
+        for tenant, count in (("big", 6), ("small", 3)):
+            futures += [scheduler.submit("bulk", "wf-1", {"key": tenant}, key=tenant)
+                        for _ in range(count)]
+        client.gate.set()
+        for future in futures:
+            future.result(5)
+
+    tenants = [key for _, key in client.started[1:]]
+    assert tenants == ["big", "small", "big", "small", "big", "big", "small", "big", "big"]
+    assert client.peak == 1
+
+
+def test_overload_is_shed_and_rate_limits_defer_work():
+    """Test QUEUE_FULL and QUEUE_TIMEOUT shedding, and requeueing after a 429."""
+    client = FakeClient()
+    classes = [
+        PriorityClass("interactive", max_wait=0.05),
+        PriorityClass("bulk", max_queue=2),
+    ]
+    scheduler = ExecutionScheduler(client, classes, max_concurrency=1)
+    blocker = scheduler.submit("bulk", "blocker")
+    client.wait_for_blocker()
+    queued = [scheduler.submit("bulk", "backfill") for _ in range(2)]
+    with pytest.raises(SimStudioError) as full:
+        scheduler.submit("bulk", "backfill").result(1)
+    with pytest.raises(SimStudioError) as late:
+        scheduler.submit("interactive", "chat").result(1)
+    assert (full.value.code, late.value.code) == ("QUEUE_FULL", "QUEUE_TIMEOUT")
+
+    client.gate.set()
+    assert all(future.result(5).success for future in [blocker] + queued)
+    reset_at = datetime.now(timezone.utc) + timedelta(seconds=0.2)
+    client.failures["limited"] = RateLimitError("Rate limit exceeded", remaining=0,
+                                                reset_at=reset_at)
+    started = time.monotonic()
+    limited = scheduler.submit("bulk", "limited")
+    assert limited.result(5).success is True
+    assert time.monotonic() - started >= 0.15
+    assert [workflow_id for workflow_id, _ in client.started].count("limited") == 2
+
+    stats = scheduler.stats()
+    assert (stats["bulk"].shed, stats["interactive"].shed) == (1, 1)
+    assert stats["bulk"].completed == 4 and stats["interactive"].completed == 0
+    scheduler.close()
+
+
+def test_cancelled_executions_free_their_queue_place():
+    """Test that cancelling a queued execution removes it from the max_queue count."""
+    client = FakeClient()
+    classes = [PriorityClass("bulk", max_queue=1)]
+    with ExecutionScheduler(client, classes, max_concurrency=1) as scheduler:
+        blocker = scheduler.submit("bulk", "blocker")
+        client.wait_for_blocker()
+        cancelled = scheduler.submit("bulk", "backfill")
+        assert cancelled.cancel()
+        assert scheduler.stats()["bulk"].queued == 0
+        queued = scheduler.submit("bulk", "backfill")
+        client.gate.set()
+        assert blocker.result(5).success and queued.result(5).success
+        stats = scheduler.stats()
+
+    assert [workflow_id for workflow_id, _ in client.started] == ["blocker", "backfill"]
+    assert (stats["bulk"].shed, stats["bulk"].completed) == (0, 2)
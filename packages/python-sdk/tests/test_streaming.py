@@ -0,0 +1,107 @@
+"""
+Tests for streamed workflow executions
+"""
+
+import time
+
+import pytest
+
+from simstudio import SimStudioClient, SimStudioError, StreamChunk
+from simstudio.testing import MemoryTransport, MockSimServer
+
+
+def test_chunks_arrive_before_the_execution_finishes():
+    """Test that the first chunk is yielded long before the final result over HTTP."""
+    with MockSimServer(latency=0.4, payload_size=40, stream_chunks=4) as server:
+        client = SimStudioClient(api_key="test-api-key", base_url=server.url, transport="http")
+        started = time.monotonic()
+        with client.stream_workflow("wf-1", {"q": "?"}) as stream:
+            chunks = []
+            for chunk in stream:
+                if not chunks:
+                    first_chunk = time.monotonic() - started
+                chunks.append(chunk)
+        total = time.monotonic() - started
+        # The connection is reusable once the stream has been read to the end.
+        assert client.execute_workflow("wf-1").success is True
+        client.close()
+        assert server.stats()["stream"] == 1
+
+    assert first_chunk < total / 2
+    assert len(chunks) == 4 and all(isinstance(chunk, StreamChunk) for chunk in chunks)
+    assert {chunk.block_id for chunk in chunks} == {"agent-1"}
+    assert "".join(chunk.chunk for chunk in chunks) == "x" * 40
+    assert stream.result.success is True
+    assert stream.result.output == {"content": "x" * 40, "input": {"q": "?"}}
+
+
+def test_stream_resumes_falls_back_to_json_and_reports_errors():
+    """Test early exit and resume, a non-streaming server and a stream error event."""
+    server = MockSimServer(payload_size=8, stream_chunks=4)
+    client = SimStudioClient(api_key="test-api-key", transport=MemoryTransport(server.handle))
+    stream = client.stream_workflow("wf-1")
+    assert next(iter(stream)).chunk == "xx"
+    assert [chunk.chunk for chunk in stream] == ["xx", "xx", "xx"]
+    assert stream.finish().output["content"] == "x" * 8
+
+    buffered = SimStudioClient(
+        api_key="test-api-key",
+        transport=MemoryTransport(lambda method, path, headers, body: (200, {"success": True})),
+    ).stream_workflow("wf-1")
+    assert list(buffered) == [] and buffered.result.success is True
+
+    def failing(method, path, headers, body):
+        events = [b'data: {"blockId": "a", "chunk": "hi"}\n\n',
+                  b'data: {"event": "error", "error": "Agent failed"}\n\n']
+        return 200, iter(events), {"Content-Type": "text/event-stream"}
+
+    failed = SimStudioClient(api_key="k", transport=MemoryTransport(failing)).stream_workflow("x")
+    with pytest.raises(SimStudioError) as error:
+        list(failed)
+    assert error.value.code == "EXECUTION_ERROR" and "Agent failed" in str(error.value)
+
+    def over_limit(method, path, headers, body):
+        event = b'data: {"event": "error", "error": "Over", "code": "USAGE_LIMIT_EXCEEDED"}\n\n'
+        return 200, iter([event]), {"Content-Type": "text/event-stream"}
+
+    limited_client = SimStudioClient(api_key="k", transport=MemoryTransport(over_limit))
+    limited = limited_client.stream_workflow("x")
+    with pytest.raises(SimStudioError) as limit_error:
+        list(limited)
+    assert limit_error.value.code == "USAGE_LIMIT_EXCEEDED"
+
+    missing = SimStudioClient(
+        api_key="k",
+        transport=MemoryTransport(lambda method, path, headers, body: (404, {"error": "Nope"})),
+    )
+    with pytest.raises(SimStudioError) as not_found:
+        missing.stream_workflow("wf-2")
+    assert not_found.value.status == 404
+
+
+@pytest.mark.asyncio
+async def test_async_stream_yields_chunks_and_result():
+    """Test that the asyncio client parses events split across reads."""
+    httpx = pytest.importorskip("httpx")
+    from simstudio import AsyncSimStudioClient
+
+    body = (b'data: {"blockId": "a", "chunk": "Hel"}\n\ndata: {"blockId": "a", "chunk": "lo \xc3'
+            b'\xa9"}\n\ndata: {"blockId": "a", "event": "end"}\n\n'
+            b'data: {"event": "final", "data": {"success": true, "output": {"n": 1}}}\n\n')
+
+    class Pieces(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for i in range(0, len(body), 7):
+                yield body[i:i + 7]
+
+    def handler(request):
+        assert request.headers["Accept"] == "text/event-stream"
+        return httpx.Response(200, headers={"Content-Type": "text/event-stream"},
+                              stream=Pieces())
+
+    async with AsyncSimStudioClient(api_key="k", transport=httpx.MockTransport(handler)) as client:
+        async with await client.stream_workflow("wf-1") as stream:
+            chunks = [chunk.chunk async for chunk in stream]
+
+    assert chunks == ["Hel", "lo é"]
+    assert stream.result.output == {"n": 1}
@@ -0,0 +1,60 @@
+"""
+Tests for the local mock Sim server, driven through the real client
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from simstudio import RateLimitError, SimStudioClient, SimStudioError
+from simstudio.testing import MockSimServer
+
+
+@pytest.fixture
+def server():
+    with MockSimServer(payload_size=16) as mock_server:
+        yield mock_server
+
+
+def test_execute_and_status_round_trip(server):
+    """Test synchronous execution and status against the mock server."""
+    with SimStudioClient(api_key="test-api-key", base_url=server.url) as client:
+        result = client.execute_workflow("wf-1", {"message": "hi"})
+        status = client.get_workflow_status("wf-1")
+
+    assert result.success is True
+    assert result.output == {"content": "x" * 16, "input": {"message": "hi"}}
+    assert status.is_deployed is True
+    assert server.stats() == {"execute": 1, "status": 1}
+
+
+@patch("simstudio.time.sleep")
+def test_async_execution_is_queued_and_polled(mock_sleep, server):
+    """Test that async submissions return a job the client can poll to completion."""
+    with SimStudioClient(api_key="test-api-key", base_url=server.url) as client:
+        job = client.submit_workflow("wf-1", {"n": 1})
+        result = client.wait_for_job(job)
+        with pytest.raises(SimStudioError) as exc_info:
+            client.get_job_status("task-unknown")
+
+    assert job.task_id == "task-1"
+    assert result.success is True
+    assert result.output == {"content": "x" * 16, "input": {"n": 1}}
+    assert result.metadata["executionId"] == "execution-task-1"
+    assert exc_info.value.status == 404
+
+
+def test_rate_limit_answers_429_like_the_api():
+    """Test that executions beyond the window limit get a parseable 429."""
+    with MockSimServer(rate_limit=1) as server, \
+            SimStudioClient(api_key="test-api-key", base_url=server.url) as client:
+        client.execute_workflow("wf-1")
+        with pytest.raises(RateLimitError) as sync_error:
+            client.execute_workflow("wf-1")
+        with pytest.raises(RateLimitError) as async_error:
+            client.submit_workflow("wf-1")
+
+    for error in (sync_error.value, async_error.value):
+        assert error.remaining == 0
+        assert error.reset_at is not None
+    assert server.stats()["rate_limited"] == 2
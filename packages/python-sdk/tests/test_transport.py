@@ -0,0 +1,193 @@
+"""
+Tests for the pluggable HTTP transports
+"""
+
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from simstudio import ClientHooks, PoolConfig, SimStudioClient, SimStudioError
+from simstudio.testing import MemoryTransport, MockSimServer
+
+HEAVY_MODULES = ("requests", "urllib3", "httpx", "numpy", "opentelemetry")
+
+
+def test_import_stays_light():
+    """Test that importing simstudio, and using the http transport, never loads requests."""
+    script = (
+        "import sys, simstudio\n"
+        "client = simstudio.SimStudioClient(api_key='k', transport='http')\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert loaded.stdout.strip() == ""
+
+
+class TimingHooks(ClientHooks):
+    def __init__(self):
+        self.timings = []
+
+    def on_response(self, info, status_code, timings, result):
+        self.timings.append(timings)
+
+
+def test_http_transport_reuses_connections_and_streams():
+    """Test the standard-library transport end to end, including keep-alive and streaming."""
+    hooks = TimingHooks()
+    with MockSimServer(payload_size=8) as server, \
+            SimStudioClient(api_key="test-api-key", base_url=server.url, transport="http",
+                            hooks=[hooks]) as client:
+        first = client.execute_workflow("wf-1", {"n": 1})
+        lean = client.execute_workflow("wf-1", {"n": 2}, fields=["output"])
+        status = client.get_workflow_status("wf-1")
+        with pytest.raises(SimStudioError) as exc_info:
+            client.get_job_status("task-unknown")
+
+        idle = [conn for connections in client._transport._idle.values() for conn in connections]
+
+    assert first.output == {"content": "x" * 8, "input": {"n": 1}}
+    assert lean.output == {"content": "x" * 8, "input": {"n": 2}} and lean.logs is None
+    assert status.is_deployed is True
+    assert exc_info.value.status == 404
+    assert len(idle) == 1
+    assert hooks.timings[0].connect > 0 and hooks.timings[1].connect == 0
+    assert server.stats() == {"execute": 2, "status": 1, "job": 1}
+
+
+def test_http_transport_maps_timeouts_and_connection_errors():
+    """Test that socket failures surface as TIMEOUT and EXECUTION_ERROR."""
+    with MockSimServer(latency=0.5) as server, \
+            SimStudioClient(api_key="k", base_url=server.url, transport="http") as client:
+        with pytest.raises(SimStudioError) as timeout:
+            client.execute_workflow("wf-1", timeout=0.05)
+        url = server.url
+
+    with SimStudioClient(api_key="test-api-key", base_url=url, transport="http") as client:
+        with pytest.raises(SimStudioError) as refused:
+            client.execute_workflow("wf-1", timeout=1.0)
+
+    assert timeout.value.code == "TIMEOUT"
+    assert refused.value.code == "EXECUTION_ERROR"
+
+
+@pytest.mark.parametrize("transport", ["requests", "http"])
+def test_shared_client_bounds_blocking_pool_across_threads(transport):
+    """Test that 64 threads share a blocking pool of 4 connections without errors."""
+    pool = PoolConfig(max_connections=4, block=True)
+    with MockSimServer(latency=0.005) as server, \
+            SimStudioClient(api_key="test-api-key", base_url=server.url, transport=transport,
+                            pool=pool) as client:
+        with ThreadPoolExecutor(max_workers=64) as executor:
+            results = list(executor.map(
+                lambda n: client.execute_workflow("wf-1", {"n": n}), range(256)
+            ))
+        stats = client.pool_stats()
+
+    assert [r.output["input"]["n"] for r in results] == list(range(256))
+    assert stats.created + stats.reused == 256
+    assert stats.created <= 4 and stats.peak_in_use <= 4
+    assert stats.waited > 0 and stats.in_use == 0 and stats.discarded == 0
+
+
+@pytest.mark.parametrize("transport", ["requests", "http"])
+def test_pool_expires_idle_connections_and_discards_overflow(transport):
+    """Test idle_timeout, non-blocking overflow and block_timeout."""
+    pool = PoolConfig(max_connections=1, idle_timeout=0.05)
+    with MockSimServer(latency=0.05) as server, \
+            SimStudioClient(api_key="test-api-key", base_url=server.url, transport=transport,
+                            pool=pool) as client:
+        client.execute_workflow("wf-1")
+        time.sleep(0.1)
+        client.execute_workflow("wf-1")
+        expired = client.pool_stats()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda n: client.execute_workflow("wf-1"), range(4)))
+        overflow = client.pool_stats()
+
+    assert (expired.created, expired.reused, expired.expired) == (2, 0, 1)
+    assert overflow.peak_in_use == 4 and overflow.discarded == 3 and overflow.in_use == 0
+
+    pool = PoolConfig(max_connections=1, block=True, block_timeout=0.05)
+    with MockSimServer(latency=0.3) as server, \
+            SimStudioClient(api_key="test-api-key", base_url=server.url, transport=transport,
+                            pool=pool) as client:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(client.execute_workflow, "wf-1") for _ in range(2)]
+        errors = [f.exception() for f in futures if f.exception() is not None]
+
+    assert len(errors) == 1 and errors[0].code == "TIMEOUT"
+
+
+def test_requests_transport_closes_replaced_adapter_once_drained():
+    """Test that growing the pool closes the old adapter's idle sockets, not live streams."""
+    with MockSimServer(payload_size=64, stream_chunks=4) as server, \
+            SimStudioClient(api_key="k", base_url=server.url, transport="requests") as client:
+        transport = client._transport
+        stream = client.stream_workflow("wf-1")
+        chunks = iter(stream)
+        next(chunks)
+        client.execute_workflow("wf-1")
+        replaced = transport.session.adapters["http://"]
+        pools = [replaced.poolmanager.pools.get(key) for key in replaced.poolmanager.pools.keys()]
+        client._ensure_pool_size(32)
+
+        assert transport.session.adapters["http://"] is not replaced
+        assert pools and all(pool.pool is None for pool in pools)
+        list(chunks)
+        assert stream.result.success is True
+        client.execute_workflow("wf-1")
+        stats = client.pool_stats()
+
+    # The idle connection was closed, the streaming one closed on release: a third is opened.
+    assert (stats.created, stats.reused, stats.in_use) == (3, 0, 0)
+    assert stats.discarded == 1
+
+
+def test_memory_transport_answers_in_process():
+    """Test the in-memory transport with the mock API and with a custom handler."""
+    transport = MemoryTransport()
+    client = SimStudioClient(api_key="test-api-key", transport=transport)
+    result = client.execute_workflow("wf-1", {"q": 1})
+    method, url, headers, body = transport.requests[0]
+
+    assert result.output["input"] == {"q": 1}
+    assert (method, url) == ("POST", "https://sim.ai/api/workflows/wf-1/execute")
+    assert json.loads(body) == {"q": 1}
+    assert headers["X-API-Key"] == "test-api-key"
+
+    def not_deployed(method, path, headers, body):
+        return 403, {"error": "Workflow is not deployed", "code": "WORKFLOW_IS_NOT_DEPLOYED"}
+
+    client = SimStudioClient(api_key="test-api-key", transport=MemoryTransport(not_deployed))
+    with pytest.raises(SimStudioError) as exc_info:
+        client.execute_workflow("wf-1")
+    assert exc_info.value.status == 403
+    assert exc_info.value.code == "WORKFLOW_IS_NOT_DEPLOYED"
+
+
+def test_unknown_transport_name_is_rejected():
+    """Test that a misspelled transport name fails at construction."""
+    with pytest.raises(ValueError):
+        SimStudioClient(api_key="test-api-key", transport="urllib")
+
+
+def test_http_transport_headers_and_discarded_connections():
+    """Test case-insensitive headers and that unreusable connections count as discarded."""
+    with MockSimServer(payload_size=64, stream_chunks=4) as server, \
+            SimStudioClient(api_key="k", base_url=server.url, transport="http") as client:
+        stream = client.stream_workflow("wf-1")
+        next(iter(stream))
+        stream.close()
+        response = client._transport.request("GET", f"{server.url}/api/workflows/wf-1/status")
+        stats = client.pool_stats()
+
+    assert response.headers["content-type"] == response.headers["Content-Type"]
+    assert "Content-Type" in response.headers and dict(response.headers)
+    assert stats.discarded == 1 and stats.created == 2 and stats.in_use == 0
@@ -0,0 +1,138 @@
+"""
+Tests for file uploads
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from simstudio import FileUploader, SimStudioClient, SimStudioError
+from simstudio.testing import MemoryTransport, MockSimServer
+
+MIB = 1024 * 1024
+
+
+@pytest.fixture
+def big_file(tmp_path):
+    path = tmp_path / "document.pdf"
+    path.write_bytes(os.urandom(17 * MIB))
+    return path
+
+
+def test_large_file_is_sent_in_parallel_parts_without_the_api_key(big_file):
+    """Test a multipart upload over HTTP, and that repeating it sends nothing."""
+    server = MockSimServer()
+    storage_headers = []
+    handle = server.handle
+
+    def recording(method, path, headers, body):
+        if method == "PUT":
+            storage_headers.append(dict(headers))
+        return handle(method, path, headers, body)
+
+    server.handle = recording
+    with server, SimStudioClient(api_key="test-api-key", base_url=server.url,
+                                 transport="http") as client:
+        base_url = server.url
+        uploader = FileUploader(client, part_size=5 * MIB, max_concurrency=4)
+        reference = uploader.upload(big_file)
+        stats = server.stats()
+        again = uploader.upload(str(big_file), name="copy.pdf")
+        assert server.stats() == stats
+        uploader.close()
+
+    digest = hashlib.sha256(big_file.read_bytes()).hexdigest()
+    assert server.stored_files()[reference["key"]] == {"size": 17 * MIB, "sha256": digest}
+    assert reference["sha256"] == digest
+    assert reference["name"] == "document.pdf" and reference["type"] == "application/pdf"
+    assert reference["url"] == f"{base_url}{reference['path']}"
+    assert stats == {"multipart": 3, "storage": 4}
+    assert len(storage_headers) == 4
+    assert not any("X-API-Key" in headers for headers in storage_headers)
+    assert again["name"] == "copy.pdf" and again["key"] == reference["key"]
+    assert (uploader.uploads, uploader.cache_hits, uploader.bytes_sent) == (1, 1, 17 * MIB)
+
+
+def test_failed_part_is_retried_alone_from_the_memory_map(big_file):
+    """Test that part bodies are zero-copy views and a 503 only re-sends that part."""
+    server = MockSimServer()
+    failures = {"remaining": 1}
+
+    def storage(method, path, headers, body):
+        if "partNumber=2" in path and failures["remaining"]:
+            failures["remaining"] -= 1
+            return 503, {"error": "SlowDown"}
+        return server.handle(method, path, headers, body)
+
+    storage_transport = MemoryTransport(storage)
+    client = SimStudioClient(api_key="test-api-key", transport=MemoryTransport(server.handle))
+    uploader = FileUploader(client, part_size=5 * MIB, storage_transport=storage_transport)
+    reference = uploader.upload(big_file)
+    uploader.close()
+
+    bodies = [body for _, _, _, body in storage_transport.requests]
+    assert len(bodies) == 5
+    assert all(isinstance(body, memoryview) for body in bodies)
+    assert uploader.bytes_sent == 22 * MIB
+    assert server.stored_files()[reference["key"]]["size"] == 17 * MIB
+
+
+def test_local_storage_falls_back_to_form_upload(tmp_path):
+    """Test the fallback to /api/files/upload, probing unsupported methods only once."""
+    server = MockSimServer(storage="local")
+    client = SimStudioClient(api_key="test-api-key", transport=MemoryTransport(server.handle))
+    references = []
+    for index in range(2):
+        path = tmp_path / f"notes-{index}.txt"
+        path.write_bytes(b"line\n" * (index + 1))
+        references.append(client.upload_file(str(path)))
+    client.close()
+
+    assert server.stats() == {"presigned": 1, "upload": 2}
+    assert references[1]["size"] == 10 and references[1]["type"] == "text/plain"
+    assert references[1]["name"] == "notes-1.txt" and "expiresAt" in references[1]
+    assert server.stored_files()[references[1]["key"]]["size"] == 10
+
+
+def test_form_upload_refuses_files_over_the_size_limit(tmp_path, monkeypatch):
+    """Test that the local-storage fallback refuses a file instead of copying it."""
+    monkeypatch.setattr("simstudio.uploads._MAX_FORM_SIZE", 8)
+    server = MockSimServer(storage="local")
+    client = SimStudioClient(api_key="test-api-key", transport=MemoryTransport(server.handle))
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"line\n" * 2)
+    with pytest.raises(SimStudioError) as exc_info:
+        client.upload_file(str(path))
+    client.close()
+
+    assert exc_info.value.code == "UPLOAD_ERROR"
+    assert server.stats().get("upload", 0) == 0
+
+
+def test_cache_file_skips_uploads_across_processes_and_errors_abort(tmp_path, big_file):
+    """Test the persistent cache, and that a rejected part aborts the multipart upload."""
+    server = MockSimServer()
+    client = SimStudioClient(api_key="test-api-key", transport=MemoryTransport(server.handle))
+    cache_path = str(tmp_path / "uploads.sqlite")
+    small = tmp_path / "small.json"
+    small.write_bytes(b'{"rows": []}')
+
+    first = FileUploader(client, cache_path=cache_path)
+    reference = first.upload(small)
+    first.close()
+    second = FileUploader(client, cache_path=cache_path)
+    assert second.upload(small) == reference
+    assert (second.uploads, second.cache_hits) == (0, 1)
+    second.close()
+
+    def forbidden(method, path, headers, body):
+        return 403, {"error": "AccessDenied"}
+
+    uploader = FileUploader(client, part_size=5 * MIB, storage_transport=MemoryTransport(forbidden))
+    with pytest.raises(SimStudioError) as exc_info:
+        uploader.upload(big_file)
+    uploader.close()
+    assert exc_info.value.code == "UPLOAD_ERROR" and exc_info.value.status == 403
+    abort = [url for _, url, _, _ in client._transport.requests if url.endswith("action=abort")]
+    assert len(abort) == 1